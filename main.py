@@ -14,6 +14,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.agent import ComplianceAgent
+from src.tools.logprob_cache import LogprobCache
+from src.utils.config import settings
 from src.states.idle import IdleState
 
 
@@ -41,8 +43,21 @@ def main():
         print(f"ERROR: Failed to initialize OpenAI client: {e}")
         sys.exit(1)
     
+    # Optional persistent cache: repeated audits reuse stored logprobs
+    logprob_cache = None
+    if settings.ISR_LOGPROB_CACHE:
+        logprob_cache = LogprobCache(
+            settings.ISR_LOGPROB_CACHE_DIR,
+            max_entries=settings.ISR_LOGPROB_CACHE_MAX_ENTRIES
+        )
+
     # Initialize Agent with IdleState
-    agent = ComplianceAgent(client=client, initial_state=IdleState())
+    agent = ComplianceAgent(
+        client=client,
+        initial_state=IdleState(),
+        logprob_cache=logprob_cache,
+        probability_log=settings.ISR_PROBABILITY_LOG
+    )
     
     print("\n" + "="*70)
     print(">>> Semantic ISR Auditor Agent Initialized <<<")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput do SemanticISRAuditorTool (auditorias/s)
+Usa o SyntheticBackend (probabilidades determinísticas e latência simulada,
+sem chamadas à API) e mede auditorias por segundo para cada nível de
+concorrência.
+
+Uso:
+    python scripts/benchmark_isr_auditor.py --audits 200 --latency 0.05 --concurrency 1 4 16
+    python scripts/benchmark_isr_auditor.py --profile veto --adaptive
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.isr_backends import SyntheticBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Auditorias ISR por segundo com backend sintético")
+    parser.add_argument("--audits", type=int, default=200)
+    parser.add_argument("--permutations", type=int, default=6)
+    parser.add_argument("--profile", choices=sorted(SyntheticBackend.PROFILES), default="unstable")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latência simulada por chamada (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Jitter uniforme extra por chamada (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--scoring-mode", choices=SemanticISRAuditorTool.SCORING_MODES, default="single")
+    parser.add_argument("--adaptive", action="store_true", help="Amostragem adaptativa de permutações")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    itens = [(f"Cliente {i}\n\nCaso {i}\n\nPolítica {i % 7}", "APROVADA") for i in range(args.audits)]
+
+    print(
+        f"\n🔬 {args.audits} auditorias × {args.permutations} permutações, perfil '{args.profile}', "
+        f"latência {args.latency:.3f}s (+{args.jitter:.3f}s)\n"
+    )
+    print(f"{'concorrência':>12} {'auditorias/s':>13} {'chamadas':>9} {'tempo (s)':>10}  decisões")
+
+    for concorrencia in args.concurrency:
+        backend = SyntheticBackend(
+            args.profile, seed=args.seed, latency=args.latency, latency_jitter=args.jitter
+        )
+        tool = SemanticISRAuditorTool(
+            client=None,
+            num_permutations=args.permutations,
+            max_concurrency=concorrencia,
+            adaptive=args.adaptive,
+            scoring_mode=args.scoring_mode,
+            backend=backend
+        )
+        inicio = time.perf_counter()
+        auditorias = asyncio.run(tool.audit_many_async(itens))
+        duracao = time.perf_counter() - inicio
+
+        decisoes = Counter(a["decision"] for a in auditorias)
+        print(
+            f"{concorrencia:>12} {args.audits / duracao:>13.1f} {backend.calls:>9} {duracao:>10.2f}  "
+            + ", ".join(f"{k}={v}" for k, v in sorted(decisoes.items()))
+        )
+
+
+if __name__ == "__main__":
+    main()
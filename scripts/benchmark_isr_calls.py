@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark de requisições por auditoria ISR: modo single vs packed
+Usa um cliente local com latência simulada (sem chamadas à API) e compara
+requisições HTTP por auditoria e tempo total de audit_many. O modo packed
+pontua uma vez os prompts repetidos do lote (mesmo contexto e decisão) e
+deve produzir exatamente o mesmo ISR do single; o script confere isso.
+
+Uso:
+    python scripts/benchmark_isr_calls.py --audits 50 --distinct 20 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.isr_auditor import SemanticISRAuditorTool
+
+
+class ClienteSimulado:
+    """Responde chat.completions com uma probabilidade fixa por prompt"""
+
+    def __init__(self, latencia: float):
+        self.latencia = latencia
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+
+    @staticmethod
+    def _prob(prompt: str) -> float:
+        return 0.6 + 0.35 * (hash(prompt) % 100) / 100
+
+    async def _chat(self, **kwargs):
+        await asyncio.sleep(self.latencia)
+        top = [SimpleNamespace(token="Yes", logprob=math.log(self._prob(kwargs["messages"][1]["content"])))]
+        return SimpleNamespace(choices=[SimpleNamespace(
+            logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+        )])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requisições por auditoria ISR (single vs packed)")
+    parser.add_argument("--audits", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=20, help="Pares (contexto, decisão) distintos no lote")
+    parser.add_argument("--permutations", type=int, default=6)
+    parser.add_argument("--latency", type=float, default=0.2, help="Latência simulada por requisição (s)")
+    parser.add_argument("--concurrency", type=int, default=6)
+    args = parser.parse_args()
+
+    itens = [
+        (f"Cliente {i % args.distinct}\n\nCaso {i % args.distinct}\n\nPolítica {i % args.distinct % 7}", "APROVADA")
+        for i in range(args.audits)
+    ]
+
+    print(
+        f"\n🔬 {args.audits} auditorias ({args.distinct} distintas) × {args.permutations} permutações, "
+        f"latência {args.latency:.2f}s\n"
+    )
+    print(f"{'modo':<8} {'req/auditoria':>14} {'tempo (s)':>10}")
+
+    resultados = {}
+    for modo in ("single", "packed"):
+        tool = SemanticISRAuditorTool(
+            client=None,
+            async_client=ClienteSimulado(args.latency),
+            num_permutations=args.permutations,
+            max_concurrency=args.concurrency,
+            scoring_mode=modo
+        )
+        inicio = time.perf_counter()
+        resultados[modo] = asyncio.run(tool.audit_many_async(itens))
+        duracao = time.perf_counter() - inicio
+
+        print(f"{modo:<8} {tool.request_stats['api_requests'] / args.audits:>14.2f} {duracao:>10.2f}")
+
+    iguais = resultados["single"] == resultados["packed"]
+    print(f"\nISR idêntico entre os modos: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark de legibilidade: textstat vs contador nativo em português
+Gera explicações no estilo dos templates/mock (com muita repetição), mede o
+throughput de cada motor com e sem o LRU do AccessibilityService e reporta
+as diferenças de Flesch-Kincaid Grade entre os motores.
+
+Uso:
+    python scripts/benchmark_readability.py --explicacoes 100000
+    python scripts/benchmark_readability.py --textstat-lang pt_BR
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.accessibility import AccessibilityService, _legibilidade
+from src.utils.config import settings
+from src.utils.readability import legibilidade
+
+TEMPLATES = [
+    "Seu pedido de crédito foi aprovado. Seu score é {score}, acima do mínimo de {minimo}.",
+    "Infelizmente seu pedido foi negado. Você tem uma dívida em atraso de R$ {valor}.",
+    "Seu pedido foi negado porque a parcela de R$ {valor} passa de 30% da sua renda.",
+    "Precisamos analisar seu caso com mais cuidado. Um gerente vai entrar em contato em até {dias} dias.",
+    "Você foi aprovado! O banco liberou R$ {valor} na sua conta. A primeira parcela vence em {dias} dias.",
+    "Não conseguimos confirmar seus dados. Por favor, envie um documento com foto e comprovante de renda.",
+    "Seu score de {score} está abaixo do mínimo exigido de {minimo}, por isso o crédito não foi aprovado.",
+    "O valor pedido é maior que o limite para sua renda. Você pode pedir até R$ {valor} com parcelas menores.",
+]
+
+
+def gerar_explicacoes(n: int, seed: int, variacoes: int):
+    rng = random.Random(seed)
+    valores = [
+        {
+            "score": rng.randint(300, 900),
+            "minimo": rng.choice([500, 600, 700]),
+            "valor": rng.choice([150, 300, 1200, 5000, 25000]),
+            "dias": rng.choice([2, 5, 30]),
+        }
+        for _ in range(variacoes)
+    ]
+    return [rng.choice(TEMPLATES).format(**rng.choice(valores)) for _ in range(n)]
+
+
+def medir(rotulo: str, funcao, textos):
+    inicio = time.perf_counter()
+    resultado = [funcao(t) for t in textos]
+    duracao = time.perf_counter() - inicio
+    print(f"{rotulo:<38} {duracao:>8.2f}s {len(textos) / duracao:>12,.0f} textos/s")
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="textstat vs legibilidade nativa")
+    parser.add_argument("--explicacoes", type=int, default=100_000)
+    parser.add_argument("--variacoes", type=int, default=2000, help="Combinações de valores por template")
+    parser.add_argument("--textstat-lang", default=None, help="Idioma do textstat (padrão: o da biblioteca)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    textos = gerar_explicacoes(args.explicacoes, args.seed, args.variacoes)
+    unicos = sorted(set(textos))
+    print(f"\n🔬 {len(textos):,} explicações ({len(unicos):,} distintas)\n")
+    print(f"{'motor':<38} {'tempo':>9} {'throughput':>20}")
+
+    # Custo por texto sem repetição (o cache interno do textstat não ajuda)
+    nativo = dict(zip(unicos, medir(
+        f"nativo, {len(unicos):,} distintos", lambda t: legibilidade(t)["nivel_leitura"], unicos
+    )))
+
+    try:
+        import textstat
+        if args.textstat_lang:
+            textstat.set_lang(args.textstat_lang)
+        referencia = dict(zip(unicos, medir(
+            f"textstat, {len(unicos):,} distintos", textstat.flesch_kincaid_grade, unicos
+        )))
+    except Exception as e:
+        # Ex: en_US sem o cmudict do NLTK baixado
+        print(f"\n⚠️  textstat indisponível ({type(e).__name__}); sem comparação de grade. "
+              "Tente --textstat-lang pt_BR\n")
+        referencia = None
+
+    # Fluxo real: todas as explicações pelo serviço, com o LRU por texto normalizado
+    for motor in ("nativo", "textstat") if referencia is not None else ("nativo",):
+        _legibilidade.cache_clear()
+        medir(f"AccessibilityService({motor!r}) + LRU", AccessibilityService(motor).avaliar_explicacao, textos)
+        info = AccessibilityService.estatisticas_cache()
+        print(f"{'':<38} hit rate {info['hits'] / len(textos):.1%}")
+
+    if referencia is None:
+        return
+
+    diferenca = np.array([nativo[t] - referencia[t] for t in textos])
+    limite = settings.FLESCH_KINCAID_MAX_GRADE
+    mudou_acessivel = np.mean([(nativo[t] <= limite) != (referencia[t] <= limite) for t in textos])
+    print(f"\n📊 Diferença de grade (nativo - textstat), {len(textos):,} explicações:")
+    print(f"   média {diferenca.mean():+.2f} | |média| {np.abs(diferenca).mean():.2f} | "
+          f"p95 |dif| {np.percentile(np.abs(diferenca), 95):.2f} | máx |dif| {np.abs(diferenca).max():.2f}")
+    print(f"   eh_acessivel diferente (limite {limite}): {mudou_acessivel:.1%}")
+
+if __name__ == "__main__":
+    main()
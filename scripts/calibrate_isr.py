@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Calibração offline dos parâmetros do ISR
+Reavalia probabilidades já registradas (ISR_PROBABILITY_LOG) numa grade de
+target_confidence × hard_veto_threshold × clipping_b, sem chamadas ao modelo.
+
+Uso:
+    python scripts/calibrate_isr.py outputs/isr/probabilidades.jsonl --labels rotulos.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+import pandas as pd
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.tools.isr_calibration import (
+    DEFAULT_CLIPPINGS,
+    DEFAULT_TARGETS,
+    DEFAULT_VETOS,
+    calibration_sweep,
+    load_probability_log,
+)
+
+
+def _grade(valor: str):
+    return [float(v) for v in valor.split(",") if v.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura offline de limiares do ISR")
+    parser.add_argument("log", type=Path, help="JSONL de probabilidades por permutação")
+    parser.add_argument("--labels", type=Path, help="CSV com colunas id,label (1 = decisão correta)")
+    parser.add_argument("--targets", type=_grade, default=list(DEFAULT_TARGETS))
+    parser.add_argument("--vetos", type=_grade, default=list(DEFAULT_VETOS))
+    parser.add_argument("--clippings", type=_grade, default=list(DEFAULT_CLIPPINGS))
+    parser.add_argument("--output", type=Path, help="CSV de saída com a superfície completa")
+    parser.add_argument("--top", type=int, default=10, help="Combinações exibidas (ordenadas por F1)")
+    args = parser.parse_args()
+
+    rotulos = None
+    if args.labels:
+        df_rotulos = pd.read_csv(args.labels, dtype={"id": str})
+        rotulos = dict(zip(df_rotulos["id"], df_rotulos["label"].astype(int)))
+
+    probs, labels, ids = load_probability_log(args.log, rotulos)
+    if not ids:
+        print("❌ Nenhuma auditoria rotulada encontrada!")
+        sys.exit(1)
+
+    print(f"\n📂 {len(ids)} auditorias rotuladas ({int((labels == 0).sum())} decisões incorretas)")
+
+    superficie = calibration_sweep(probs, labels, args.targets, args.vetos, args.clippings)
+    print(f"🔬 {len(superficie)} combinações avaliadas\n")
+
+    melhores = superficie.sort_values(["f1", "precision"], ascending=False).head(args.top)
+    print(melhores.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        superficie.to_csv(args.output, index=False)
+        print(f"\n💾 Superfície salva em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
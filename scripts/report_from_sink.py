@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Gera o relatório de auditoria a partir do sink JSONL de uma execução
+Útil quando a execução foi interrompida (ou para regerar o relatório sem
+chamar o modelo): aponta o GenerateReportState para <output-dir>/runs/<run_id>.jsonl,
+que carrega os resultados e recalcula as métricas com o MetricsAccumulator.
+
+Uso:
+    python scripts/report_from_sink.py 20260101_120000
+    python scripts/report_from_sink.py 20260101_120000 --output-dir outputs
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Adicionar raiz do projeto ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.fsm import SextantFSM  # noqa: F401 - carrega a cadeia de estados na ordem do FSM
+from src.services.result_sink import ResultSink
+from src.states.generate_report import GenerateReportState
+from src.utils.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório a partir do sink de resultados")
+    parser.add_argument("run_id", help="Execução (nome do arquivo em <output-dir>/runs, sem .jsonl)")
+    parser.add_argument("--output-dir", default=None, help=f"Diretório de saída (default: {settings.OUTPUT_DIR})")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output_dir) if args.output_dir else settings.OUTPUT_DIR
+    sink_dir = settings.RESULTS_SINK_DIR
+    if args.output_dir and not sink_dir.is_absolute():
+        sink_dir = output_dir / "runs"
+
+    sink = ResultSink(sink_dir, args.run_id)
+    if not sink.existe:
+        print(f"\n❌ Sink não encontrado: {sink.path}")
+        return 1
+
+    context = {"output_dir": output_dir, "results_sink": sink.path}
+    asyncio.run(GenerateReportState().execute(context))
+
+    metricas = context["metricas"]
+    print(f"\n📂 {len(context['resultados'])} resultados em {sink.path}")
+
+    print(f"📊 Taxa de acerto: {metricas.taxa_acerto:.1%} | Acessibilidade: {metricas.taxa_acessibilidade:.1%}")
+    print(f"📝 Relatório: {context['report_path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,12 @@ Exemplos:
   python sextant_main.py --real             # Modo API real (requer API key)
   python sextant_main.py --num-cases 10     # Limita a 10 casos
   python sextant_main.py --mock --num-cases 25 --verbose
+  python sextant_main.py --real --concurrency 8
+  python sextant_main.py --real --cache readwrite  # Reexecuções sem custo de API
+  python sextant_main.py --real --stream           # Encerra ao fechar o JSON
+  python sextant_main.py --real --batch            # Suíte noturna via API de lote
+  python sextant_main.py --real --isr              # Auditoria ISR Semântica das decisões
+  python sextant_main.py --real --resume 20260101_120000  # Retoma execução interrompida
         """
     )
 
@@ -74,10 +80,57 @@ Exemplos:
         default=None,
         help='Arquivo JSON com clientes de teste (ex: clientes_teste_mock.json)'
     )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=None,
+        help=f'Número de casos executados em paralelo (default: {settings.CASE_CONCURRENCY}, 1 = sequencial)'
+    )
+    parser.add_argument(
+        '--cache',
+        choices=['off', 'read', 'write', 'readwrite'],
+        default=None,
+        help=f'Cache em disco das respostas do modelo (default: {settings.RESPONSE_CACHE_MODE})'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Consome a resposta em streaming e encerra quando o JSON fecha (requer --real)'
+    )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Submete todos os casos via API de lote do provider (requer --real)'
+    )
+    parser.add_argument(
+        '--isr',
+        action='store_true',
+        help='Audita as decisões com o ISR Semântico após os casos (requer --real e OPENAI_API_KEY)'
+    )
+    parser.add_argument(
+        '--batch-id',
+        type=str,
+        default=None,
+        help='Retoma o polling de um lote já submetido (implica --batch)'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default=None,
+        metavar='RUN_ID',
+        help='Retoma uma execução interrompida: pula os casos já gravados em <output-dir>/runs/<RUN_ID>.jsonl'
+    )
 
     return parser.parse_args()
 
 
+def _log_retomada(logger, context):
+    """Indica como retomar uma execução interrompida a partir do sink"""
+    if context.get("results_sink"):
+        logger.info(f"Resultados parciais em: {context['results_sink']}")
+        logger.info(f"Para retomar: repita o comando com --resume {context['run_id']}")
+
+
 def main():
     """
     Executa Sextant Banking Edition - Framework de Auditoria de IA.
@@ -134,6 +187,31 @@ def main():
         fsm.context["test_clients_file"] = args.test_clients
         logger.info(f"Usando clientes de teste: {args.test_clients}")
 
+    if args.concurrency:
+        fsm.context["concurrency"] = args.concurrency
+        logger.info(f"Executando até {args.concurrency} casos em paralelo")
+
+    if args.cache:
+        fsm.context["cache_mode"] = args.cache
+        logger.info(f"Cache de respostas: {args.cache}")
+
+    if args.stream:
+        fsm.context["streaming"] = True
+        logger.info("Streaming: respostas encerradas ao fechar o objeto JSON")
+
+    if args.isr:
+        fsm.context["semantic_audit"] = True
+        logger.info("ISR Semântico: decisões auditadas após a execução dos casos")
+
+    if args.batch or args.batch_id:
+        fsm.context["batch_mode"] = True
+        fsm.context["batch_id"] = args.batch_id
+        logger.info("Modo lote: casos serão submetidos via API de lote do provider")
+
+    if args.resume:
+        fsm.context["resume_run_id"] = args.resume
+        logger.info(f"Retomando execução {args.resume}")
+
     try:
         asyncio.run(fsm.run())
         logger.info("Sextant completed successfully")
@@ -142,6 +220,8 @@ def main():
         report_path = fsm.context.get("report_path")
         if report_path:
             logger.info(f"Report available at: {report_path}")
+        if fsm.context.get("run_id"):
+            logger.info(f"Run ID: {fsm.context['run_id']}")
 
         # Mostra métricas resumidas
         metricas = fsm.context.get("metricas")
@@ -151,6 +231,8 @@ def main():
             logger.info(f"  Taxa de Acerto: {metricas.taxa_acerto:.1%}")
             logger.info(f"  Taxa de Acessibilidade: {metricas.taxa_acessibilidade:.1%}")
             logger.info(f"  ISR Médio: {metricas.isr_medio:.2f}")
+            if metricas.isr_semantico_medio is not None:
+                logger.info(f"  ISR Semântico Médio: {metricas.isr_semantico_medio:.2f}")
             logger.info(f"  Casos PASS: {metricas.casos_pass}")
             logger.info(f"  Casos PARTIAL: {metricas.casos_partial}")
             logger.info(f"  Casos FAIL: {metricas.casos_fail}")
@@ -159,9 +241,11 @@ def main():
         return 0
     except KeyboardInterrupt:
         logger.info("\nInterrupted by user")
+        _log_retomada(logger, fsm.context)
         return 1
     except Exception as e:
         logger.error(f"Sextant failed: {e}", exc_info=True)
+        _log_retomada(logger, fsm.context)
         return 1
 
 
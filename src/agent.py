@@ -6,9 +6,11 @@ It acts as the Context in the State Design Pattern, delegating
 behavior to the current state.
 """
 
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from openai import OpenAI
 from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.logprob_cache import LogprobCache
 from src.states.base import AgentState
 
 
@@ -27,17 +29,27 @@ class ComplianceAgent:
     IdleState -> AnalysisState -> AuditState -> FinalResponseState -> IdleState
     """
     
-    def __init__(self, client: OpenAI, initial_state: AgentState):
+    def __init__(
+        self,
+        client: OpenAI,
+        initial_state: AgentState,
+        logprob_cache: Optional[LogprobCache] = None,
+        probability_log: Optional[Path] = None
+    ):
         """
         Initializes the Compliance Agent.
         
         Args:
             client: OpenAI client instance
             initial_state: Initial state for the agent (typically IdleState)
+            logprob_cache: Optional persistent cache for ISR verification calls
+            probability_log: Optional JSONL receiving per-permutation audit probabilities
         """
         self.client = client
         self.history: List[Dict[str, Any]] = []
-        self.tool = SemanticISRAuditorTool(client)
+        self.tool = SemanticISRAuditorTool(
+            client, logprob_cache=logprob_cache, probability_log=probability_log
+        )
         self._state = initial_state
         
         # Shared data between states
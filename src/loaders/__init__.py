@@ -1,5 +1,6 @@
 """Loaders module for Sextant"""
 from src.loaders.artifacts import ArtifactLoader
+from src.loaders.policy_index import PolicyIndex
 from src.loaders.validators import JSONValidator, MarkdownValidator
 
-__all__ = ["ArtifactLoader", "JSONValidator", "MarkdownValidator"]
+__all__ = ["ArtifactLoader", "PolicyIndex", "JSONValidator", "MarkdownValidator"]
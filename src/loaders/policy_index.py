@@ -0,0 +1,189 @@
+"""
+Índice de seções do manual de políticas para recuperação por caso.
+
+O markdown é dividido na árvore de headings (cada heading vira uma seção
+com o caminho completo, ex: "PARTE 2 > 2.2 Scoring de Crédito") e indexado
+com BM25 em numpy. Para cada caso, as seções mais relevantes são
+selecionadas dentro de um orçamento de tokens, em vez de enviar só o
+início do arquivo.
+"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, Field
+from src.utils.rate_limiter import estimar_tokens
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Palavras muito frequentes que só adicionam ruído ao BM25
+STOPWORDS = frozenset(
+    "a o as os de da do das dos e em no na nos nas um uma uns umas para por com sem "
+    "que se ao aos ou the of and to is are ser sao sera deve devem pelo pela pelos pelas "
+    "como mais menos sobre entre".split()
+)
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Minúsculas, sem acentos, alfanumérico, sem stopwords"""
+    normalizado = unicodedata.normalize("NFKD", texto.lower())
+    sem_acentos = "".join(c for c in normalizado if not unicodedata.combining(c))
+    return [t for t in TOKEN_RE.findall(sem_acentos) if len(t) > 1 and t not in STOPWORDS]
+
+
+class SecaoPolitica(BaseModel):
+    """Seção do manual delimitada por um heading"""
+    ordem: int
+    caminho: List[str] = Field(default_factory=list, description="Headings ancestrais + o próprio")
+    texto: str
+    tokens: int = 0
+
+    @property
+    def titulo(self) -> str:
+        """Heading pai + heading da seção (ex: "PARTE 2: ... > 2.2 Scoring de Crédito")"""
+        return " > ".join(self.caminho[-2:])
+
+
+class PolicyIndex:
+    """Índice BM25 das seções do manual de políticas"""
+
+    def __init__(self, markdown: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            markdown: Conteúdo de banco_politicas_diretrizes.md
+            k1: Saturação da frequência de termos (BM25)
+            b: Normalização pelo tamanho da seção (BM25)
+        """
+        self.secoes = self._dividir(markdown)
+        self.tokens_documento = estimar_tokens(markdown)
+
+        # Estatísticas de uso para telemetria
+        self.selecoes = 0
+        self.tokens_selecionados = 0
+
+        documentos = [tokenizar(f"{s.titulo}\n{s.texto}") for s in self.secoes]
+        self.vocabulario = {
+            termo: i for i, termo in enumerate(sorted({t for doc in documentos for t in doc}))
+        }
+
+        tf = np.zeros((len(documentos), len(self.vocabulario)), dtype=np.float32)
+        for d, doc in enumerate(documentos):
+            for termo in doc:
+                tf[d, self.vocabulario[termo]] += 1
+
+        tamanhos = tf.sum(axis=1, keepdims=True)
+        media = float(tamanhos.mean()) if len(documentos) else 1.0
+        df = (tf > 0).sum(axis=0)
+        n = len(documentos)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+
+        # Pesos BM25 pré-computados: score(consulta) = soma das colunas dos termos
+        self._pesos = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * tamanhos / max(media, 1.0)))
+
+    @staticmethod
+    def _dividir(markdown: str) -> List[SecaoPolitica]:
+        """Divide o markdown em seções pela árvore de headings"""
+        secoes: List[SecaoPolitica] = []
+        pilha: List[Tuple[int, str]] = []
+        linhas: List[str] = []
+        em_codigo = False
+
+        def fechar():
+            texto = "\n".join(linhas).strip()
+            if texto:
+                secoes.append(SecaoPolitica(
+                    ordem=len(secoes),
+                    caminho=[titulo for _, titulo in pilha],
+                    texto=texto,
+                    tokens=estimar_tokens(texto)
+                ))
+            linhas.clear()
+
+        for linha in markdown.splitlines():
+            if linha.lstrip().startswith("```"):
+                em_codigo = not em_codigo
+            m = None if em_codigo else HEADING_RE.match(linha)
+            if m:
+                fechar()
+                nivel = len(m.group(1))
+                while pilha and pilha[-1][0] >= nivel:
+                    pilha.pop()
+                pilha.append((nivel, m.group(2)))
+                continue
+            linhas.append(linha)
+        fechar()
+
+        return secoes
+
+    def buscar(self, consulta: str, top_k: int = 5) -> List[Tuple[SecaoPolitica, float]]:
+        """Retorna as top_k seções com score BM25 > 0, do mais ao menos relevante"""
+        indices = sorted({self.vocabulario[t] for t in tokenizar(consulta) if t in self.vocabulario})
+        if not indices or not self.secoes:
+            return []
+
+        scores = self._pesos[:, indices].sum(axis=1)
+        ordem = np.argsort(-scores, kind="stable")[:top_k]
+        return [(self.secoes[i], float(scores[i])) for i in ordem if scores[i] > 0]
+
+    def selecionar_secoes(
+        self,
+        consulta: str,
+        top_k: int = 5,
+        token_budget: Optional[int] = None
+    ) -> List[SecaoPolitica]:
+        """
+        Seções mais relevantes para a consulta dentro do orçamento de tokens,
+        na ordem original do documento.
+
+        Sem nenhum termo em comum, usa as primeiras seções do documento. A
+        seção mais relevante sempre entra (truncada ao orçamento se sozinha
+        já não couber), para o modelo nunca ficar sem nenhuma política.
+        """
+        candidatas = [s for s, _ in self.buscar(consulta, top_k)] or self.secoes[:top_k]
+
+        escolhidas: List[SecaoPolitica] = []
+        usados = 0
+        for secao in candidatas:
+            if token_budget is not None and usados + secao.tokens > token_budget:
+                continue
+            escolhidas.append(secao)
+            usados += secao.tokens
+
+        if not escolhidas and candidatas:
+            melhor = self._truncar(candidatas[0], token_budget)
+            escolhidas.append(melhor)
+            usados += melhor.tokens
+
+        self.selecoes += 1
+        self.tokens_selecionados += usados
+
+        return sorted(escolhidas, key=lambda s: s.ordem)
+
+    @staticmethod
+    def _truncar(secao: SecaoPolitica, token_budget: Optional[int]) -> SecaoPolitica:
+        """Corta o texto da seção para caber em token_budget (~4 caracteres por token)"""
+        if token_budget is None or secao.tokens <= token_budget:
+            return secao
+        marcador = "\n[...]"
+        texto = secao.texto[:max(0, (token_budget - 1) * 4 - len(marcador))].rstrip() + marcador
+        return secao.model_copy(update={"texto": texto, "tokens": estimar_tokens(texto)})
+
+    @staticmethod
+    def renderizar(secao: SecaoPolitica) -> str:
+        return f"## {secao.titulo}\n\n{secao.texto}"
+
+    def selecionar(self, consulta: str, top_k: int = 5, token_budget: Optional[int] = None) -> str:
+        """Renderiza selecionar_secoes como um único bloco de markdown"""
+        return "\n\n".join(
+            self.renderizar(secao) for secao in self.selecionar_secoes(consulta, top_k, token_budget)
+        )
+
+    def stats(self) -> dict:
+        """Tamanho do índice e tokens de política enviados por prompt"""
+        return {
+            "secoes": len(self.secoes),
+            "tokens_documento": self.tokens_documento,
+            "selecoes": self.selecoes,
+            "tokens_medios_por_prompt": self.tokens_selecionados / self.selecoes if self.selecoes else 0.0,
+        }
@@ -168,6 +168,42 @@ class ResultadoAvaliacao(BaseModel):
         False,
         description="Resposta inclui rastreamento dos passos?"
     )
+    ttft_s: Optional[float] = Field(
+        None,
+        description="Tempo até o primeiro token (s), apenas em modo streaming"
+    )
+    tempo_decisao_s: Optional[float] = Field(
+        None,
+        description="Tempo até a decisão completa (s); None para respostas em cache/mock"
+    )
+    prob_decisao: Optional[float] = Field(
+        None,
+        ge=0,
+        le=1,
+        description="Probabilidade do valor de 'decisao' (logprobs da chamada de decisão, só OpenAI)"
+    )
+    isr_semantico: Optional[float] = Field(
+        None,
+        ge=0,
+        description="ISR Semântico da decisão (Delta/B2T; 999 = atalho de sucesso); None sem auditoria"
+    )
+    isr_bloqueado: Optional[bool] = Field(
+        None,
+        description="Auditoria ISR bloqueou a decisão (ISR < 1.0 ou veto)"
+    )
+    nivel_leitura: Optional[float] = Field(
+        None,
+        description="Flesch-Kincaid Grade da explicação (AccessibilityService); None sem explicação"
+    )
+    facilidade_leitura: Optional[float] = Field(
+        None,
+        description="Flesch Reading Ease da explicação (0-100, maior = mais fácil)"
+    )
+    palavras_explicacao: Optional[int] = Field(
+        None,
+        ge=0,
+        description="Número de palavras da explicação acessível"
+    )
 
     class Config:
         json_schema_extra = {
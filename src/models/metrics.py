@@ -50,7 +50,7 @@ class MetricasGlobais(BaseModel):
     )
     isr_semantico_medio: Optional[float] = Field(
         None,
-        description="ISR Semântico médio (Information Sufficiency Ratio) - métrica de teoria da informação para detecção de alucinações"
+        description="ISR Semântico médio (Information Sufficiency Ratio, truncado em 1.0 por caso) - métrica de teoria da informação para detecção de alucinações"
     )
     taxa_acessibilidade: float = Field(
         0.0,
@@ -2,11 +2,15 @@
 from src.services.model_executor import ModelExecutor
 from src.services.evaluator import CaseEvaluator
 from src.services.metrics_calculator import MetricsCalculator
+from src.services.metrics_accumulator import MetricsAccumulator
 from src.services.accessibility import AccessibilityService
+from src.services.result_sink import ResultSink
 
 __all__ = [
     "ModelExecutor",
     "CaseEvaluator",
     "MetricsCalculator",
+    "MetricsAccumulator",
     "AccessibilityService",
+    "ResultSink",
 ]
@@ -1,11 +1,15 @@
 """
 Serviço de avaliação de acessibilidade (Design for All).
-Usa Flesch-Kincaid para medir nível de leitura.
+Usa Flesch-Kincaid para medir nível de leitura, via textstat ou pelo
+contador nativo em português (src/utils/readability.py), com LRU por texto
+normalizado: explicações de mock e templates se repetem muito entre casos.
 """
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 from src.models.domain import RespostaModelo
 from src.utils.logger import setup_logger
 from src.utils.config import settings
+from src.utils.readability import legibilidade
 
 try:
     import textstat
@@ -17,12 +21,38 @@ except ImportError:
     )
 
 
+MOTORES_LEGIBILIDADE = ("textstat", "nativo")
+
+
+@lru_cache(maxsize=settings.ACCESSIBILITY_CACHE_SIZE)
+def _legibilidade(texto: str, motor: str) -> Tuple[float, float]:
+    """(Flesch-Kincaid Grade, Flesch Reading Ease) de um texto já normalizado"""
+    if motor == "nativo":
+        resultado = legibilidade(texto)
+        return resultado["nivel_leitura"], resultado["facilidade_leitura"]
+    return textstat.flesch_kincaid_grade(texto), textstat.flesch_reading_ease(texto)
+
+
 class AccessibilityService:
     """Avalia acessibilidade de explicações (Design for All)"""
     
-    def __init__(self):
+    def __init__(self, motor: Optional[str] = None):
+        """
+        Args:
+            motor: "textstat" ou "nativo" (padrão: ACCESSIBILITY_READABILITY_ENGINE)
+        """
         self.logger = setup_logger("AccessibilityService")
         self.textstat_available = TEXTSTAT_AVAILABLE
+        self.motor = motor or settings.ACCESSIBILITY_READABILITY_ENGINE
+        if self.motor not in MOTORES_LEGIBILIDADE:
+            raise ValueError(
+                f"Motor de legibilidade inválido: {self.motor} (use {MOTORES_LEGIBILIDADE})"
+            )
+
+    @staticmethod
+    def estatisticas_cache() -> Dict[str, Any]:
+        """Acertos, faltas e tamanho do LRU de legibilidade (compartilhado)"""
+        return _legibilidade.cache_info()._asdict()
     
     def avaliar_explicacao(
         self,
@@ -48,32 +78,15 @@ class AccessibilityService:
         explicacao = explicacao.strip()
         tamanho = len(explicacao)
         
-        if not self.textstat_available:
-            # Fallback: avaliação simples baseada em tamanho e palavras
-            palavras = explicacao.split()
-            palavras_medias = sum(len(p) for p in palavras) / len(palavras) if palavras else 0
-            
-            # Heurística simples
-            eh_acessivel = tamanho >= 20 and tamanho <= 500 and palavras_medias < 8
-            
-            return {
-                "tem_explicacao": True,
-                "nivel_leitura": None,
-                "eh_acessivel": eh_acessivel,
-                "tamanho": tamanho,
-                "palavras": len(palavras),
-                "palavras_medias": palavras_medias,
-                "metodo": "heuristica"
-            }
+        if self.motor == "textstat" and not self.textstat_available:
+            return self._avaliar_heuristica(explicacao)
         
-        # Usa Flesch-Kincaid Grade Level
+        # Usa Flesch-Kincaid Grade Level e Flesch Reading Ease (0-100, maior =
+        # mais fácil); cache por texto com espaços normalizados
         try:
-            nivel = textstat.flesch_kincaid_grade(explicacao)
+            nivel, facilidade = _legibilidade(" ".join(explicacao.split()), self.motor)
             eh_acessivel = nivel <= settings.FLESCH_KINCAID_MAX_GRADE
             
-            # Flesch Reading Ease (0-100, maior = mais fácil)
-            facilidade = textstat.flesch_reading_ease(explicacao)
-            
             return {
                 "tem_explicacao": True,
                 "nivel_leitura": nivel,
@@ -81,8 +94,17 @@ class AccessibilityService:
                 "facilidade_leitura": facilidade,
                 "tamanho": tamanho,
                 "palavras": len(explicacao.split()),
-                "metodo": "flesch_kincaid"
+                "metodo": "flesch_kincaid" if self.motor == "textstat" else "flesch_kincaid_pt"
             }
+        except LookupError:
+            # Dados do NLTK ausentes (ex: cmudict para en_US sem rede): falha em
+            # todo texto, então esta instância passa à heurística (avisa uma vez)
+            self.textstat_available = False
+            self.logger.warning(
+                "textstat sem dados do NLTK (cmudict); usando heurística. "
+                "Use ACCESSIBILITY_READABILITY_ENGINE=nativo para Flesch-Kincaid sem textstat"
+            )
+            return self._avaliar_heuristica(explicacao)
         except Exception as e:
             self.logger.warning(f"Erro ao calcular Flesch-Kincaid: {e}")
             return {
@@ -90,9 +112,30 @@ class AccessibilityService:
                 "nivel_leitura": None,
                 "eh_acessivel": False,
                 "tamanho": tamanho,
+                "palavras": len(explicacao.split()),
                 "erro": str(e)
             }
     
+    @staticmethod
+    def _avaliar_heuristica(explicacao: str) -> dict:
+        """Fallback sem textstat: avaliação simples baseada em tamanho e palavras"""
+        tamanho = len(explicacao)
+        palavras = explicacao.split()
+        palavras_medias = sum(len(p) for p in palavras) / len(palavras) if palavras else 0
+        
+        # Heurística simples
+        eh_acessivel = tamanho >= 20 and tamanho <= 500 and palavras_medias < 8
+        
+        return {
+            "tem_explicacao": True,
+            "nivel_leitura": None,
+            "eh_acessivel": eh_acessivel,
+            "tamanho": tamanho,
+            "palavras": len(palavras),
+            "palavras_medias": palavras_medias,
+            "metodo": "heuristica"
+        }
+    
     def avaliar_resposta(self, resposta: RespostaModelo) -> dict:
         """
         Avalia acessibilidade de uma resposta completa.
@@ -0,0 +1,356 @@
+"""
+Execução offline de casos via APIs de lote dos providers.
+
+Renderiza todos os prompts, submete um único job (Anthropic Message Batches
+ou OpenAI Batch API), aguarda a conclusão e devolve as respostas no mesmo
+formato de ModelExecutor.executar_caso. O id do lote é persistido em disco
+assim que submetido, para que uma execução interrompida retome o polling do
+mesmo lote em vez de pagar por um novo.
+
+O custom_id de cada requisição vem do caso_id (não da posição na lista), de
+modo que um lote retomado com a lista de casos alterada (dataset editado,
+--resume filtrando casos concluídos) nunca associa respostas ao caso errado.
+"""
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple, Union
+from src.models.domain import CasoTeste, Cliente
+from src.services.model_executor import ModelExecutor
+from src.utils.disk_cache import hash_conteudo
+from src.utils.logger import setup_logger
+
+
+_CUSTOM_ID_INVALIDO = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def custom_id_do_caso(caso_id: str) -> str:
+    """
+    custom_id estável para um caso (formato aceito pelos dois providers:
+    [A-Za-z0-9_-], até 64 caracteres). caso_ids fora do formato recebem um
+    sufixo de hash para continuarem distintos após a normalização.
+    """
+    custom_id = _CUSTOM_ID_INVALIDO.sub("-", caso_id)
+    if custom_id != caso_id or len(custom_id) > 64:
+        custom_id = f"{custom_id[:47]}-{hash_conteudo(caso_id)[:16]}"
+    return custom_id
+
+
+def _para_namespace(valor: Any) -> Any:
+    """Converte dicts (ex: usage de JSONL) em objetos com acesso por atributo"""
+    if isinstance(valor, dict):
+        return SimpleNamespace(**{k: _para_namespace(v) for k, v in valor.items()})
+    return valor
+
+
+class BatchExecutor:
+    """Executa casos em lote via Message Batches (Anthropic) / Batch API (OpenAI)"""
+
+    OPENAI_ENDPOINT = "/v1/chat/completions"
+    STATUS_FINAIS_OPENAI = {"completed", "failed", "expired", "cancelled"}
+
+    def __init__(
+        self,
+        executor: ModelExecutor,
+        estado_dir: Path,
+        poll_interval: float = 30.0,
+        max_espera: Optional[float] = None
+    ):
+        """
+        Args:
+            executor: ModelExecutor usado para renderizar prompts e parsear respostas
+            estado_dir: Diretório onde o id do lote submetido é persistido
+            poll_interval: Intervalo entre consultas de status (segundos)
+            max_espera: Tempo máximo de polling antes de desistir (None = sem limite)
+        """
+        if executor.provider not in ("anthropic", "openai"):
+            raise ValueError(f"Provider desconhecido: {executor.provider}")
+
+        self.executor = executor
+        self.client = executor.client
+        self.provider = executor.provider
+        self.estado_dir = Path(estado_dir)
+        self.poll_interval = poll_interval
+        self.max_espera = max_espera
+        self.logger = setup_logger("BatchExecutor")
+        self.stats: Dict[str, Any] = {}
+
+    async def executar(
+        self,
+        itens: List[Tuple[Cliente, CasoTeste]],
+        politicas: str = "",
+        batch_id: Optional[str] = None
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Executa todos os itens em um único lote.
+
+        Args:
+            itens: Pares (cliente, caso) a executar
+            politicas: Texto das políticas bancárias
+            batch_id: Id de um lote já submetido para retomar (opcional)
+
+        Returns:
+            Lista alinhada com `itens`: dict de resposta (como executar_caso)
+            ou a exceção que impediu aquele item específico
+        """
+        inicio = time.monotonic()
+        cache = self.executor.cache
+
+        saidas: List[Union[Dict[str, Any], Exception, None]] = [None] * len(itens)
+        pendentes: Dict[str, Tuple[int, Dict[str, Any], Optional[str]]] = {}
+
+        caso_ids = [caso.caso_id for _, caso in itens]
+        if len(set(caso_ids)) != len(caso_ids):
+            raise ValueError("caso_id duplicado no lote: os resultados não seriam atribuíveis")
+
+        for i, (cliente, caso) in enumerate(itens):
+            contexto_politicas = self.executor._preparar_contexto_politicas(politicas, cliente, caso)
+            prompt_usuario = self.executor._preparar_prompt(cliente, caso)
+            chave = None
+            if cache is not None:
+                chave = self.executor.chave_cache(prompt_usuario, contexto_politicas)
+                texto = cache.obter(chave)
+                if texto is not None:
+                    saidas[i] = self._processar(texto, "cache")
+                    continue
+
+            custom_id = custom_id_do_caso(caso.caso_id)
+            params = self.executor._montar_requisicao(prompt_usuario, contexto_politicas)
+            pendentes[custom_id] = (i, params, chave)
+
+        self.stats = {
+            "requisicoes": len(itens),
+            "do_cache": len(itens) - len(pendentes),
+            "submetidas": len(pendentes),
+            "retomado": False,
+        }
+
+        if pendentes:
+            estado_path = self._estado_path(pendentes)
+            batch_id, retomado, estado_path = await self._obter_ou_submeter(pendentes, estado_path, batch_id)
+            self.stats["batch_id"] = batch_id
+            self.stats["retomado"] = retomado
+
+            await self._aguardar(batch_id)
+            textos = await asyncio.to_thread(self._coletar, batch_id)
+
+            for custom_id, (i, _, chave) in pendentes.items():
+                texto = textos.get(custom_id)
+                if texto is None:
+                    saidas[i] = RuntimeError(f"Lote {batch_id} sem resultado para {custom_id}")
+                elif isinstance(texto, Exception):
+                    saidas[i] = texto
+                else:
+                    saidas[i] = self._processar(texto, "batch")
+                    if chave is not None and not isinstance(saidas[i], Exception):
+                        cache.salvar(chave, texto)
+
+            # Lote consumido: não há mais o que retomar
+            estado_path.unlink(missing_ok=True)
+
+        self.stats["duracao_s"] = time.monotonic() - inicio
+        return saidas
+
+    # ========== ESTADO (RETOMADA) ==========
+
+    def _estado_path(self, pendentes: Dict[str, Tuple[int, Dict[str, Any], Optional[str]]]) -> Path:
+        """Arquivo de estado identificado pelo conteúdo exato do lote"""
+        assinatura = hash_conteudo(
+            self.provider,
+            [(cid, params) for cid, (_, params, _) in sorted(pendentes.items())]
+        )
+        return self.estado_dir / f"batch_{self.provider}_{assinatura[:16]}.json"
+
+    async def _obter_ou_submeter(
+        self,
+        pendentes: Dict[str, Tuple[int, Dict[str, Any], Optional[str]]],
+        estado_path: Path,
+        batch_id: Optional[str]
+    ) -> Tuple[str, bool, Path]:
+        """
+        Retoma o lote informado/persistido ou submete um novo.
+
+        Returns:
+            (batch_id, retomado, arquivo de estado a remover após o consumo)
+
+        Raises:
+            ValueError: Se o lote informado não contém as mesmas requisições
+                dos casos pendentes
+        """
+        if batch_id:
+            estado_informado = self._estado_do_lote(batch_id)
+            if estado_informado is None:
+                self.logger.warning(
+                    f"Resuming batch {batch_id} (informado) without a persisted state: "
+                    f"custom_ids not verified"
+                )
+                return batch_id, True, estado_path
+            path_informado, estado = estado_informado
+            self._validar_estado(estado, pendentes)
+            self.logger.info(f"Resuming batch {batch_id} (informado, {path_informado.name})")
+            return batch_id, True, path_informado
+
+        if estado_path.exists():
+            with open(estado_path, "r", encoding="utf-8") as f:
+                estado = json.load(f)
+            self.logger.info(f"Resuming batch {estado['batch_id']} from {estado_path.name}")
+            return estado["batch_id"], True, estado_path
+
+        requisicoes = [(cid, params) for cid, (_, params, _) in pendentes.items()]
+        batch_id = await asyncio.to_thread(self._submeter, requisicoes)
+
+        # Persiste imediatamente: um crash a partir daqui retoma este lote
+        estado_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(estado_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "batch_id": batch_id,
+                "provider": self.provider,
+                "custom_ids": [cid for cid, _ in requisicoes],
+                "assinaturas": {cid: hash_conteudo(params) for cid, params in requisicoes},
+                "submetido_em": time.time(),
+            }, f, indent=2)
+
+        self.logger.info(f"Submitted batch {batch_id} with {len(requisicoes)} requests")
+        return batch_id, False, estado_path
+
+    def _estado_do_lote(self, batch_id: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """Arquivo de estado persistido para um batch_id (se existir)"""
+        for path in sorted(self.estado_dir.glob(f"batch_{self.provider}_*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    estado = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if estado.get("batch_id") == batch_id:
+                return path, estado
+        return None
+
+    @staticmethod
+    def _validar_estado(
+        estado: Dict[str, Any],
+        pendentes: Dict[str, Tuple[int, Dict[str, Any], Optional[str]]]
+    ) -> None:
+        """
+        Garante que cada caso pendente foi submetido no lote com a mesma
+        requisição. Casos do lote que não estão mais pendentes (ex: já
+        concluídos em um --resume) são apenas ignorados.
+        """
+        submetidos = set(estado.get("custom_ids", []))
+        assinaturas = estado.get("assinaturas") or {}
+        ausentes = sorted(cid for cid in pendentes if cid not in submetidos)
+        alterados = sorted(
+            cid for cid, (_, params, _) in pendentes.items()
+            if cid in assinaturas and assinaturas[cid] != hash_conteudo(params)
+        )
+        if ausentes or alterados:
+            raise ValueError(
+                f"Lote {estado.get('batch_id')} não corresponde aos casos atuais "
+                f"(fora do lote: {ausentes[:5]}, requisição alterada: {alterados[:5]})"
+            )
+
+    # ========== OPERAÇÕES POR PROVIDER ==========
+
+    def _submeter(self, requisicoes: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """Submete o lote e retorna o id"""
+        if self.provider == "anthropic":
+            batch = self.client.messages.batches.create(requests=[
+                {"custom_id": cid, "params": params} for cid, params in requisicoes
+            ])
+            return batch.id
+
+        linhas = "\n".join(
+            json.dumps({
+                "custom_id": cid,
+                "method": "POST",
+                "url": self.OPENAI_ENDPOINT,
+                "body": params,
+            }, ensure_ascii=False)
+            for cid, params in requisicoes
+        )
+        arquivo = self.client.files.create(
+            file=("sextant_batch.jsonl", linhas.encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=arquivo.id,
+            endpoint=self.OPENAI_ENDPOINT,
+            completion_window="24h"
+        )
+        return batch.id
+
+    def _status(self, batch_id: str) -> Tuple[bool, str]:
+        """Retorna (terminou, status) do lote"""
+        if self.provider == "anthropic":
+            batch = self.client.messages.batches.retrieve(batch_id)
+            return batch.processing_status == "ended", batch.processing_status
+
+        batch = self.client.batches.retrieve(batch_id)
+        return batch.status in self.STATUS_FINAIS_OPENAI, batch.status
+
+    async def _aguardar(self, batch_id: str) -> None:
+        """Faz polling até o lote terminar"""
+        inicio = time.monotonic()
+        while True:
+            terminou, status = await asyncio.to_thread(self._status, batch_id)
+            if terminou:
+                self.logger.info(f"Batch {batch_id} finished with status {status}")
+                return
+
+            if self.max_espera is not None and time.monotonic() - inicio > self.max_espera:
+                raise TimeoutError(
+                    f"Lote {batch_id} ainda em '{status}' após {self.max_espera}s; "
+                    f"execute novamente para retomar"
+                )
+
+            self.logger.info(f"Batch {batch_id} status: {status}, aguardando...")
+            await asyncio.sleep(self.poll_interval)
+
+    def _coletar(self, batch_id: str) -> Dict[str, Union[str, Exception]]:
+        """Baixa resultados do lote: custom_id -> texto ou exceção"""
+        textos: Dict[str, Union[str, Exception]] = {}
+
+        if self.provider == "anthropic":
+            for item in self.client.messages.batches.results(batch_id):
+                resultado = item.result
+                if resultado.type == "succeeded":
+                    self.executor._registrar_uso(getattr(resultado.message, "usage", None))
+                    textos[item.custom_id] = resultado.message.content[0].text
+                else:
+                    erro = getattr(resultado, "error", None)
+                    textos[item.custom_id] = RuntimeError(f"Lote: {resultado.type} {erro or ''}".strip())
+            return textos
+
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Lote {batch_id} terminou com status {batch.status}")
+
+        for file_id in (batch.output_file_id, getattr(batch, "error_file_id", None)):
+            if not file_id:
+                continue
+            conteudo = self.client.files.content(file_id).text
+            for linha in conteudo.splitlines():
+                if not linha.strip():
+                    continue
+                registro = json.loads(linha)
+                custom_id = registro.get("custom_id")
+                resposta = registro.get("response") or {}
+                if registro.get("error") or resposta.get("status_code") != 200:
+                    erro = registro.get("error") or resposta.get("body", {}).get("error")
+                    textos[custom_id] = RuntimeError(f"Lote: {erro}")
+                    continue
+                corpo = resposta["body"]
+                self.executor._registrar_uso(_para_namespace(corpo.get("usage")))
+                textos[custom_id] = corpo["choices"][0]["message"]["content"]
+
+        return textos
+
+    def _processar(self, texto: str, modo: str) -> Union[Dict[str, Any], Exception]:
+        """Parseia uma resposta isolando erros no item"""
+        try:
+            return self.executor._processar_resposta(texto, modo)
+        except Exception as e:
+            self.logger.error(f"Failed to parse batch response: {e}")
+            return e
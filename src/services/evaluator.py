@@ -2,8 +2,12 @@
 Avaliador de casos contra matriz de validação.
 Versão 2.0 - Design for All + Validação Estruturada
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
 from src.models.domain import ResultadoAvaliacao, RespostaModelo, CasoTeste, Decisao
+from src.services.accessibility import AccessibilityService
+from src.utils.lexical_matcher import LexicalMatcher
 from src.utils.logger import setup_logger
 
 
@@ -60,9 +64,54 @@ class CaseEvaluator:
         'máximo'
     ]
 
-    def __init__(self, matriz: Dict):
+    # Tratamento direto ao cliente (Design for All)
+    TRATAMENTO_DIRETO = [
+        'você',
+        'vocês',
+        'seu',
+        'seus',
+        'sua',
+        'suas'
+    ]
+
+    # Pesos dos campos no CSR (Content Sufficiency Rating)
+    PESOS_CSR = {
+        'decisao': 0.20,
+        'score': 0.15,
+        'explicacao_acessivel': 0.20,
+        'rastreamento': 0.20,
+        'confianca_decisao': 0.10,
+        'campos_faltantes': 0.05,
+        'confianca_isr': 0.10
+    }
+
+    # Decisões obtidas aceitas para cada decisão esperada (mapeamento flexível)
+    DECISOES_EQUIVALENTES = {
+        "RECUSADA": ["NEGADA", "RECUSADA"],
+        "NEGADA": ["NEGADA", "RECUSADA"],
+        "APROVADA": ["APROVADA"],
+        "ANALISE_GERENCIAL": ["ANALISE_GERENCIAL", "ANALISE_ESPECIALIZADA"]
+    }
+
+    # Vieses detectados pelo avaliador (ordem fixa usada no modo em lote)
+    VIES_CONFIANCA_SEM_RASTREAMENTO = "Alta confiança sem rastreamento"
+    VIES_SEM_EXPLICACAO = "Falta de explicação acessível"
+    VIES_EXPLICACAO_CURTA = "Explicação muito curta"
+    VIES_NEGATIVA_SEM_MOTIVO = "Decisão negativa sem justificativa"
+    VIES_ALUCINACAO = "ALUCINACAO: Aprovou cliente fictício"
+
+    def __init__(self, matriz: Dict, accessibility_service: Optional[AccessibilityService] = None):
         self.matriz = matriz
         self.logger = setup_logger("CaseEvaluator")
+        # Legibilidade calculada uma vez por caso e levada no resultado
+        # (MetricsCalculator só agrega, sem reprocessar texto)
+        self.accessibility_service = accessibility_service or AccessibilityService()
+        # Listas compiladas uma vez: uma passada por explicação, por palavra inteira
+        self.matcher_lexico = LexicalMatcher({
+            'jargao': self.JARGOES_TECNICOS,
+            'simples': self.PALAVRAS_SIMPLES,
+            'tratamento': self.TRATAMENTO_DIRETO
+        })
 
     def avaliar(
         self,
@@ -96,6 +145,8 @@ class CaseEvaluator:
         tem_explicacao, eh_acessivel, score_acessibilidade = self._validar_acessibilidade(
             resposta_modelo.explicacao_acessivel
         )
+        # Legibilidade (Flesch-Kincaid) vai no resultado para as métricas agregarem
+        legibilidade = self.accessibility_service.avaliar_explicacao(resposta_modelo.explicacao_acessivel)
 
         # 3. VALIDAR RASTREAMENTO
         tem_rastreamento, rastreamento_completo, score_rastreamento = self._validar_rastreamento(
@@ -161,9 +212,280 @@ class CaseEvaluator:
             resposta_modelo=resposta_modelo,
             discrepancia=discrepancia,
             isr_score=csr,  # NOTA: Este campo mantém nome por compatibilidade, mas é CSR
-            tem_rastreamento=tem_rastreamento
+            tem_rastreamento=tem_rastreamento,
+            nivel_leitura=legibilidade.get("nivel_leitura"),
+            facilidade_leitura=legibilidade.get("facilidade_leitura"),
+            palavras_explicacao=legibilidade.get("palavras")
+        )
+
+    # ========== AVALIAÇÃO EM LOTE (colunar) ==========
+
+    def colunas_lote(
+        self,
+        itens: Iterable[Tuple[str, Optional[str], RespostaModelo, CasoTeste, Optional[Dict]]]
+    ) -> pd.DataFrame:
+        """
+        Converte respostas em colunas para avaliar_lote.
+
+        Args:
+            itens: tuplas (caso_id, cliente_id, resposta_modelo, caso_esperado,
+                resposta_json), os mesmos argumentos de avaliar
+
+        Returns:
+            DataFrame com uma linha por resposta e as colunas documentadas
+            em avaliar_lote
+        """
+        linhas = []
+        for caso_id, cliente_id, resposta, caso, resposta_json in itens:
+            json_data = resposta_json or resposta.model_dump()
+            explicacao_json = json_data.get('explicacao_acessivel')
+            rastreamento_json = json_data.get('rastreamento')
+            confianca_isr = json_data.get('confianca_isr')
+
+            linha = {
+                'caso_id': caso_id,
+                'cliente_id': cliente_id,
+                'decisao': resposta.decisao.value,
+                'decisao_esperada': caso.output_esperado.get('decisao'),
+                'tipo_cenario': caso.tipo_cenario.value if caso.tipo_cenario else "",
+                'explicacao': resposta.explicacao_acessivel,
+                'explicacao_len': len(resposta.explicacao_acessivel or ""),
+                'rastreamento_passos': len(resposta.rastreamento or []),
+                'rastreamento_passos_validos': self._contar_passos_validos(resposta.rastreamento or []),
+                'confianca': resposta.confianca,
+                'tem_motivo': bool(resposta.motivo),
+                'json_explicacao_len': len(explicacao_json) if isinstance(explicacao_json, str) else -1,
+                'json_rastreamento_len': len(rastreamento_json) if isinstance(rastreamento_json, list) else -1,
+                'confianca_isr': float(confianca_isr) if isinstance(confianca_isr, (int, float)) else np.nan,
+            }
+            for campo in self.CAMPOS_OBRIGATORIOS:
+                linha[f'presente_{campo}'] = json_data.get(campo) is not None
+            linhas.append(linha)
+
+        return pd.DataFrame(linhas)
+
+    def avaliar_lote(self, colunas: pd.DataFrame) -> pd.DataFrame:
+        """
+        Avalia um lote de respostas em forma colunar (ex: re-pontuar arquivos
+        com 100k+ respostas), com o mesmo resultado de avaliar caso a caso.
+
+        Colunas de entrada (ver colunas_lote):
+            caso_id, cliente_id: identificação (cliente_id opcional)
+            decisao, decisao_esperada: decisão obtida e esperada (valor do enum)
+            tipo_cenario: tipo do caso (ex: "alucinacao")
+            explicacao: explicação acessível; dispensável se vierem
+                tem_explicacao, eh_acessivel, score_acessibilidade e
+                explicacao_len (tamanho bruto, 0 se ausente) prontos (e,
+                opcionalmente, nivel_leitura, facilidade_leitura e
+                palavras_explicacao)
+            rastreamento_passos, rastreamento_passos_validos: nº de passos
+                e de passos com 3+ campos esperados
+            confianca, tem_motivo: confiança e presença de motivo
+            presente_<campo>: campo obrigatório presente no JSON (não nulo)
+            json_explicacao_len, json_rastreamento_len: tamanhos no JSON
+                (-1 quando o tipo não é texto/lista)
+            confianca_isr: confiança numérica do JSON (NaN se ausente)
+
+        Returns:
+            DataFrame com caso_id, cliente_id, status, pontos, eh_acessivel,
+            tem_explicacao, score_acessibilidade, tem_rastreamento,
+            rastreamento_completo, csr, decisao_correta, vieses, feedback,
+            discrepancia, nivel_leitura, facilidade_leitura e
+            palavras_explicacao
+        """
+        n = len(colunas)
+        if n == 0:
+            return pd.DataFrame(columns=[
+                'caso_id', 'cliente_id', 'status', 'pontos', 'eh_acessivel', 'tem_explicacao',
+                'score_acessibilidade', 'tem_rastreamento', 'rastreamento_completo', 'csr',
+                'decisao_correta', 'vieses', 'feedback', 'discrepancia',
+                'nivel_leitura', 'facilidade_leitura', 'palavras_explicacao'
+            ])
+
+        def coluna(nome: str, padrao: Any) -> pd.Series:
+            if nome in colunas:
+                return colunas[nome].reset_index(drop=True)
+            return pd.Series([padrao] * n)
+
+        # 1. ESTRUTURA JSON
+        presentes = np.column_stack([
+            coluna(f'presente_{campo}', False).to_numpy(dtype=bool) for campo in self.CAMPOS_OBRIGATORIOS
+        ])
+        estrutura_ok = presentes.all(axis=1)
+
+        # 2. ACESSIBILIDADE E LEGIBILIDADE (texto: uma avaliação por explicação distinta)
+        campos_texto = ['tem_explicacao', 'eh_acessivel', 'score_acessibilidade',
+                        'nivel_leitura', 'facilidade_leitura', 'palavras_explicacao']
+        if set(campos_texto[:3]) <= set(colunas.columns):
+            tem_explicacao = coluna('tem_explicacao', False).to_numpy(dtype=bool)
+            eh_acessivel = coluna('eh_acessivel', False).to_numpy(dtype=bool)
+            score_acessibilidade = coluna('score_acessibilidade', 0.0).to_numpy(dtype=float)
+            legibilidade = {campo: coluna(campo, None) for campo in campos_texto[3:]}
+        else:
+            explicacoes = coluna('explicacao', None)
+            codigos, unicas = pd.factorize(explicacoes, use_na_sentinel=False)
+            avaliadas = []
+            for e in unicas:
+                texto = e if isinstance(e, str) else None
+                leitura = self.accessibility_service.avaliar_explicacao(texto)
+                avaliadas.append(self._validar_acessibilidade(texto) + (
+                    leitura.get("nivel_leitura"), leitura.get("facilidade_leitura"), leitura.get("palavras")
+                ))
+            avaliadas = np.array(avaliadas, dtype=object).reshape(-1, len(campos_texto))[codigos]
+            tem_explicacao = avaliadas[:, 0].astype(bool)
+            eh_acessivel = avaliadas[:, 1].astype(bool)
+            score_acessibilidade = avaliadas[:, 2].astype(float)
+            legibilidade = {
+                campo: pd.Series(avaliadas[:, i], dtype=object)
+                for i, campo in enumerate(campos_texto) if i >= 3
+            }
+
+        # 3. RASTREAMENTO
+        passos = coluna('rastreamento_passos', 0).to_numpy(dtype=int)
+        passos_validos = coluna('rastreamento_passos_validos', 0).to_numpy(dtype=int)
+        tem_rastreamento = passos > 0
+        rastreamento_completo = passos >= 5
+        score_rastreamento = np.where(tem_rastreamento, passos_validos / np.maximum(5, passos), 0.0)
+
+        # 4. CSR (mesma ordem de soma do caso a caso)
+        pesos = self.PESOS_CSR
+        presente = {campo: presentes[:, i] for i, campo in enumerate(self.CAMPOS_OBRIGATORIOS)}
+        len_explicacao = coluna('json_explicacao_len', -1).to_numpy(dtype=int)
+        len_rastreamento = coluna('json_rastreamento_len', -1).to_numpy(dtype=int)
+        csr = np.zeros(n)
+        for campo, peso in pesos.items():
+            if campo == 'explicacao_acessivel':
+                ganho = np.select(
+                    [len_explicacao > 50, len_explicacao > 20], [peso, peso * 0.5], 0.0
+                )
+            elif campo == 'rastreamento':
+                ganho = np.select(
+                    [len_rastreamento >= 5, len_rastreamento >= 3, len_rastreamento > 0],
+                    [peso, peso * 0.7, peso * 0.3], 0.0
+                )
+            else:
+                ganho = np.full(n, peso)
+            csr = csr + np.where(presente[campo], ganho, 0.0)
+
+        confianca_isr = coluna('confianca_isr', np.nan).to_numpy(dtype=float)
+        com_confianca = ~np.isnan(confianca_isr)
+        csr = np.where(com_confianca, (csr * 0.6) + (np.nan_to_num(confianca_isr) * 0.4), csr)
+        csr = np.minimum(1.0, np.maximum(0.0, csr))
+        csr_adequado = csr >= 0.85
+
+        # 5. DECISÃO
+        obtida = coluna('decisao', "").fillna("").to_numpy(dtype=str)
+        esperada_bruta = coluna('decisao_esperada', None).to_numpy(dtype=object)
+        sem_esperada = pd.isna(esperada_bruta)
+        esperada = np.char.upper(np.where(sem_esperada, "", esperada_bruta).astype(str))
+        pares_aceitos = [
+            f"{e}|{o}" for e, aceitos in self.DECISOES_EQUIVALENTES.items() for o in aceitos
+        ]
+        decisao_correta = np.where(
+            np.isin(esperada, list(self.DECISOES_EQUIVALENTES)),
+            np.isin(np.char.add(np.char.add(esperada, "|"), obtida), pares_aceitos),
+            esperada == obtida
         )
 
+        # 6. PONTOS (mesma ordem de soma de _calcular_pontos_estruturado)
+        pontos = np.where(decisao_correta, 1.5, 0.0)
+        pontos = pontos + np.where(estrutura_ok, 0.5, 0.0)
+        pontos = pontos + np.where(tem_explicacao, 0.5, 0.0)
+        pontos = pontos + np.select(
+            [eh_acessivel, tem_explicacao], [score_acessibilidade * 1.0, 0.25], 0.0
+        )
+        pontos = pontos + np.where(tem_rastreamento, 0.5, 0.0)
+        pontos = pontos + np.where(rastreamento_completo, score_rastreamento * 0.5, 0.0)
+        pontos = pontos + np.where(csr_adequado, 0.5, 0.0)
+        pontos = np.minimum(5.0, np.maximum(0.0, pontos))
+
+        # 7. STATUS
+        status = np.select([pontos >= 4.5, pontos >= 2.5], ["PASS", "PARTIAL"], "FAIL")
+
+        # 8. VIESES (bits -> lista, no máximo 2^5 combinações)
+        if 'explicacao_len' in colunas:
+            len_explicacao_modelo = coluna('explicacao_len', 0).to_numpy(dtype=int)
+        else:
+            len_explicacao_modelo = coluna('explicacao', None).map(
+                lambda e: len(e) if isinstance(e, str) else 0
+            ).to_numpy(dtype=int)
+        negativa = np.isin(obtida, [Decisao.NEGADA.value, Decisao.RECUSADA.value])
+        bits = np.column_stack([
+            (coluna('confianca', 0.0).to_numpy(dtype=float) > 0.8) & (passos == 0),
+            len_explicacao_modelo == 0,
+            (len_explicacao_modelo > 0) & (len_explicacao_modelo < 30),
+            negativa & ~coluna('tem_motivo', False).to_numpy(dtype=bool) & (len_explicacao_modelo == 0),
+            (coluna('tipo_cenario', "").fillna("").astype(str).str.lower() == "alucinacao").to_numpy()
+            & (obtida == Decisao.APROVADA.value),
+        ])
+        nomes_vieses = [
+            self.VIES_CONFIANCA_SEM_RASTREAMENTO,
+            self.VIES_SEM_EXPLICACAO,
+            self.VIES_EXPLICACAO_CURTA,
+            self.VIES_NEGATIVA_SEM_MOTIVO,
+            self.VIES_ALUCINACAO,
+        ]
+        codigo_vieses = bits.astype(int) @ (1 << np.arange(len(nomes_vieses)))
+        tabela_vieses = {
+            codigo: [nome for i, nome in enumerate(nomes_vieses) if codigo >> i & 1]
+            for codigo in np.unique(codigo_vieses)
+        }
+        vieses = pd.Series(codigo_vieses).map(tabela_vieses)
+        num_vieses = bits.sum(axis=1)
+
+        # 9. FEEDBACK (arrays de objetos: concatenação sem Series de texto)
+        def textos(valores: np.ndarray, formato: str) -> np.ndarray:
+            unicos, inverso = np.unique(valores, return_inverse=True)
+            return np.array([formato % v for v in unicos], dtype=object)[inverso]
+
+        acessibilidade = np.select(
+            [eh_acessivel, tem_explicacao],
+            [" | Acessibilidade: OK (", " | Acessibilidade: PARCIAL ("],
+            " | Acessibilidade: FALTANDO"
+        ).astype(object)
+        acessibilidade = acessibilidade + np.where(
+            tem_explicacao, textos(score_acessibilidade * 100, "%.0f%%)"), ""
+        ).astype(object)
+        feedback = (
+            np.char.add("Status: ", status).astype(object)
+            + np.where(decisao_correta, " | Decisao: OK", " | Decisao: INCORRETA").astype(object)
+            + np.where(estrutura_ok, " | Estrutura: OK", " | Estrutura: INCOMPLETA").astype(object)
+            + acessibilidade
+            + np.select(
+                [rastreamento_completo, tem_rastreamento],
+                [" | Rastreamento: COMPLETO", " | Rastreamento: PARCIAL"],
+                " | Rastreamento: FALTANDO"
+            ).astype(object)
+            + textos(csr, " | CSR: %.2f")
+            + np.where(num_vieses > 0, textos(num_vieses, " | Vieses: %d"), "").astype(object)
+        )
+
+        # 10. DISCREPÂNCIA
+        discrepancia = np.where(
+            decisao_correta,
+            None,
+            "Esperado: " + np.where(sem_esperada, "N/A", esperada_bruta).astype(str).astype(object)
+            + ", Obtido: " + obtida.astype(object)
+        )
+
+        return pd.DataFrame({
+            'caso_id': coluna('caso_id', None),
+            'cliente_id': coluna('cliente_id', None),
+            'status': status,
+            'pontos': pontos,
+            'eh_acessivel': eh_acessivel,
+            'tem_explicacao': tem_explicacao,
+            'score_acessibilidade': score_acessibilidade,
+            'tem_rastreamento': tem_rastreamento,
+            'rastreamento_completo': rastreamento_completo,
+            'csr': csr,
+            'decisao_correta': decisao_correta,
+            'vieses': vieses,
+            'feedback': pd.Series(feedback, dtype=object),
+            'discrepancia': pd.Series(discrepancia, dtype=object),
+            **legibilidade,
+        })
+
     def _validar_estrutura_json(self, json_data: Dict) -> Tuple[List[str], List[str]]:
         """Valida se todos os campos obrigatórios estão presentes"""
         campos_presentes = []
@@ -195,20 +517,17 @@ class CaseEvaluator:
         if not tem_explicacao:
             return False, False, 0.0
 
-        explicacao_lower = explicacao.lower()
+        termos = self.matcher_lexico.contar(explicacao)
         score = 0.0
         max_score = 5.0
 
         # 1. Não tem jargão técnico? (+1 ponto)
-        tem_jargao = any(j.lower() in explicacao_lower for j in self.JARGOES_TECNICOS)
+        tem_jargao = termos['jargao'] > 0
         if not tem_jargao:
             score += 1.0
 
         # 2. Tem linguagem simples? (+1 ponto)
-        palavras_simples_encontradas = sum(
-            1 for p in self.PALAVRAS_SIMPLES
-            if p.lower() in explicacao_lower
-        )
+        palavras_simples_encontradas = termos['simples']
         if palavras_simples_encontradas >= 3:
             score += 1.0
 
@@ -222,7 +541,7 @@ class CaseEvaluator:
             score += 1.0
 
         # 5. Usa "você" diretamente? (+1 ponto)
-        if "você" in explicacao_lower or "seu" in explicacao_lower or "sua" in explicacao_lower:
+        if termos['tratamento'] > 0:
             score += 1.0
 
         # Normaliza score
@@ -253,14 +572,7 @@ class CaseEvaluator:
         rastreamento_completo = len(rastreamento) >= 5
 
         # Valida estrutura de cada passo
-        passos_validos = 0
-        campos_esperados = ['passo', 'nome', 'resultado', 'detalhe', 'impacto']
-
-        for passo in rastreamento:
-            if isinstance(passo, dict):
-                campos_presentes = sum(1 for c in campos_esperados if c in passo)
-                if campos_presentes >= 3:  # Pelo menos 3 campos
-                    passos_validos += 1
+        passos_validos = self._contar_passos_validos(rastreamento)
 
         # Score de rastreamento
         if len(rastreamento) > 0:
@@ -270,6 +582,15 @@ class CaseEvaluator:
 
         return tem_rastreamento, rastreamento_completo, score_rastreamento
 
+    @staticmethod
+    def _contar_passos_validos(rastreamento: List) -> int:
+        """Passos do rastreamento com pelo menos 3 dos campos esperados"""
+        campos_esperados = ['passo', 'nome', 'resultado', 'detalhe', 'impacto']
+        return sum(
+            1 for passo in rastreamento
+            if isinstance(passo, dict) and sum(1 for c in campos_esperados if c in passo) >= 3
+        )
+
     def _calcular_csr(self, json_data: Dict, resposta: RespostaModelo) -> float:
         """
         Calcula CSR (Content Sufficiency Rating).
@@ -289,20 +610,9 @@ class CaseEvaluator:
         Returns:
             Score de completude (0.0 a 1.0)
         """
-        # Pesos dos campos
-        pesos = {
-            'decisao': 0.20,
-            'score': 0.15,
-            'explicacao_acessivel': 0.20,
-            'rastreamento': 0.20,
-            'confianca_decisao': 0.10,
-            'campos_faltantes': 0.05,
-            'confianca_isr': 0.10
-        }
-
         csr = 0.0
 
-        for campo, peso in pesos.items():
+        for campo, peso in self.PESOS_CSR.items():
             valor = json_data.get(campo)
             if valor is not None:
                 # Campo presente
@@ -336,15 +646,7 @@ class CaseEvaluator:
         esperado = caso.output_esperado.get("decisao", "").upper()
         obtido = resposta.decisao.value
 
-        # Mapeamento flexível
-        mapeamento = {
-            "RECUSADA": ["NEGADA", "RECUSADA"],
-            "NEGADA": ["NEGADA", "RECUSADA"],
-            "APROVADA": ["APROVADA"],
-            "ANALISE_GERENCIAL": ["ANALISE_GERENCIAL", "ANALISE_ESPECIALIZADA"]
-        }
-
-        valores_aceitos = mapeamento.get(esperado, [esperado])
+        valores_aceitos = self.DECISOES_EQUIVALENTES.get(esperado, [esperado])
         return obtido in valores_aceitos
 
     def _calcular_pontos_estruturado(
@@ -410,24 +712,24 @@ class CaseEvaluator:
         # Viés de confiança alta sem rastreamento
         if resposta.confianca and resposta.confianca > 0.8:
             if not resposta.rastreamento or len(resposta.rastreamento) == 0:
-                vieses.append("Alta confiança sem rastreamento")
+                vieses.append(self.VIES_CONFIANCA_SEM_RASTREAMENTO)
 
         # Viés de falta de acessibilidade
         if not resposta.explicacao_acessivel:
-            vieses.append("Falta de explicação acessível")
+            vieses.append(self.VIES_SEM_EXPLICACAO)
         elif len(resposta.explicacao_acessivel) < 30:
-            vieses.append("Explicação muito curta")
+            vieses.append(self.VIES_EXPLICACAO_CURTA)
 
         # Viés de decisão negativa sem motivo
         if resposta.decisao in [Decisao.NEGADA, Decisao.RECUSADA]:
             if not resposta.motivo and not resposta.explicacao_acessivel:
-                vieses.append("Decisão negativa sem justificativa")
+                vieses.append(self.VIES_NEGATIVA_SEM_MOTIVO)
 
         # Viés de alucinação (decisão não corresponde ao tipo de caso)
         tipo_caso = caso.tipo_cenario.value.lower() if caso.tipo_cenario else ""
         if tipo_caso == "alucinacao":
             if resposta.decisao == Decisao.APROVADA:
-                vieses.append("ALUCINACAO: Aprovou cliente fictício")
+                vieses.append(self.VIES_ALUCINACAO)
 
         # Adiciona vieses do modelo
         if hasattr(resposta, 'vieses_detectados') and resposta.vieses_detectados:
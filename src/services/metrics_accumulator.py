@@ -0,0 +1,161 @@
+"""
+Acumulador incremental de métricas (uma passada, mesclável entre shards).
+
+Cada ResultadoAvaliacao é reduzido a contadores e somas no momento em que
+chega (add); acumuladores de shards/processos diferentes se combinam com
+merge, e snapshot produz as mesmas MetricasGlobais e MetricasPorCategoria
+do MetricsCalculator sem manter a lista de resultados em memória.
+O estado é só de dicts/números (serializável com pickle).
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.models.domain import ResultadoAvaliacao
+from src.models.metrics import MetricasGlobais, MetricasPorCategoria
+
+
+def categoria_do_caso(caso_id: str) -> str:
+    """Categoria/tipo pelo prefixo do caso_id (ex: "ALUCINACAO_001" -> "ALUCINACAO")"""
+    return caso_id.split("_")[0] if "_" in caso_id else "OUTRO"
+
+
+class MetricsAccumulator:
+    """Reduz resultados a contadores para MetricasGlobais e MetricasPorCategoria"""
+
+    def __init__(self):
+        self.total = 0
+        self.soma_pontos = 0.0
+        self.acessiveis = 0
+        self.status = {"PASS": 0, "FAIL": 0, "PARTIAL": 0}
+        # ISR Semântico truncado em 1.0 e Flesch-Kincaid: (soma, quantidade)
+        self.isr_semantico = [0.0, 0]
+        self.nivel_leitura = [0.0, 0]
+        # Disparate impact: grupo -> [aprovados, total]
+        self.disparate = {"protegido": [0, 0], "nao_protegido": [0, 0]}
+        # Vieses únicos na ordem em que apareceram
+        self.vieses: Dict[str, None] = {}
+        # Categoria -> contadores (ordem de primeira ocorrência)
+        self.categorias: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, resultado: ResultadoAvaliacao) -> "MetricsAccumulator":
+        """Adiciona um resultado"""
+        self.total += 1
+        self.soma_pontos += resultado.pontos
+        self.status[resultado.status] += 1
+        if resultado.eh_acessivel:
+            self.acessiveis += 1
+
+        if resultado.isr_semantico is not None:
+            self.isr_semantico[0] += min(resultado.isr_semantico, 1.0)
+            self.isr_semantico[1] += 1
+        if resultado.nivel_leitura is not None:
+            self.nivel_leitura[0] += resultado.nivel_leitura
+            self.nivel_leitura[1] += 1
+
+        # Heurística de grupo protegido: casos de acessibilidade (proxy de baixa literacia)
+        if resultado.resposta_modelo:
+            grupo = self.disparate["protegido" if "ACESSIBILIDADE" in resultado.caso_id else "nao_protegido"]
+            grupo[1] += 1
+            if resultado.resposta_modelo.decisao.value == "APROVADA":
+                grupo[0] += 1
+
+        self.vieses.update(dict.fromkeys(resultado.vieses_detectados))
+
+        categoria = self.categorias.setdefault(categoria_do_caso(resultado.caso_id), {
+            "total": 0, "PASS": 0, "FAIL": 0, "PARTIAL": 0, "soma_pontos": 0.0, "acessiveis": 0
+        })
+        categoria["total"] += 1
+        categoria[resultado.status] += 1
+        categoria["soma_pontos"] += resultado.pontos
+        if resultado.eh_acessivel:
+            categoria["acessiveis"] += 1
+
+        return self
+
+    def add_many(self, resultados: Iterable[ResultadoAvaliacao]) -> "MetricsAccumulator":
+        """Adiciona vários resultados (ex: conforme os casos chegam)"""
+        for resultado in resultados:
+            self.add(resultado)
+        return self
+
+    def merge(self, outro: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Incorpora os contadores de outro acumulador (outro shard/processo)"""
+        self.total += outro.total
+        self.soma_pontos += outro.soma_pontos
+        self.acessiveis += outro.acessiveis
+        for status, n in outro.status.items():
+            self.status[status] += n
+        for atual, extra in ((self.isr_semantico, outro.isr_semantico), (self.nivel_leitura, outro.nivel_leitura)):
+            atual[0] += extra[0]
+            atual[1] += extra[1]
+        for grupo, (aprovados, total) in outro.disparate.items():
+            self.disparate[grupo][0] += aprovados
+            self.disparate[grupo][1] += total
+        self.vieses.update(outro.vieses)
+
+        for nome, extra in outro.categorias.items():
+            categoria = self.categorias.setdefault(nome, {k: 0 for k in extra})
+            for chave, valor in extra.items():
+                categoria[chave] += valor
+
+        return self
+
+    def snapshot(self) -> Tuple[MetricasGlobais, List[MetricasPorCategoria]]:
+        """Métricas globais e por categoria com o que foi acumulado até agora"""
+        return self.metricas_globais(), self.metricas_por_categoria()
+
+    def metricas_globais(self) -> MetricasGlobais:
+        """MetricasGlobais (mesmo resultado de MetricsCalculator.calcular)"""
+        if not self.total:
+            return MetricasGlobais()
+
+        total = self.total
+        return MetricasGlobais(
+            total_casos=total,
+            casos_pass=self.status["PASS"],
+            casos_fail=self.status["FAIL"],
+            casos_partial=self.status["PARTIAL"],
+            taxa_acerto=self.status["PASS"] / total,
+            # NOTA: Campo legado - é CSR (pontos / 5.0), não ISR Semântico
+            isr_medio=self.soma_pontos / total / 5.0,
+            isr_semantico_medio=self._media(self.isr_semantico),
+            taxa_acessibilidade=self.acessiveis / total,
+            taxa_por_tipo={
+                nome: dados["PASS"] / dados["total"] for nome, dados in self.categorias.items()
+            },
+            disparate_impact=self._disparate_impact(),
+            flesch_kincaid_medio=self._media(self.nivel_leitura),
+            vieses_detectados=list(self.vieses)
+        )
+
+    def metricas_por_categoria(self) -> List[MetricasPorCategoria]:
+        """MetricasPorCategoria (mesmo resultado de MetricsCalculator.calcular_por_categoria)"""
+        return [
+            MetricasPorCategoria(
+                categoria=nome,
+                total=dados["total"],
+                pass_count=dados["PASS"],
+                fail_count=dados["FAIL"],
+                partial_count=dados["PARTIAL"],
+                taxa_acerto=dados["PASS"] / dados["total"],
+                isr_medio=dados["soma_pontos"] / dados["total"] / 5.0,  # CSR por categoria
+                taxa_acessibilidade=dados["acessiveis"] / dados["total"]
+            )
+            for nome, dados in self.categorias.items()
+        ]
+
+    @staticmethod
+    def _media(soma_quantidade: List[float]) -> Optional[float]:
+        soma, quantidade = soma_quantidade
+        return soma / quantidade if quantidade else None
+
+    def _disparate_impact(self) -> Optional[float]:
+        """
+        DI = taxa_aprovacao_grupo_protegido / taxa_aprovacao_grupo_nao_protegido
+        (None sem casos em algum grupo ou sem aprovações no grupo não protegido)
+        """
+        protegido_aprovados, protegido_total = self.disparate["protegido"]
+        nao_protegido_aprovados, nao_protegido_total = self.disparate["nao_protegido"]
+
+        if protegido_total == 0 or nao_protegido_total == 0 or nao_protegido_aprovados == 0:
+            return None
+
+        return (protegido_aprovados / protegido_total) / (nao_protegido_aprovados / nao_protegido_total)
@@ -3,20 +3,41 @@ Executor de chamadas ao modelo IA com retry, timeout e mock.
 """
 import json
 import asyncio
+import math
 import random
+import re
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, List, Tuple
 from anthropic import Anthropic
 from openai import OpenAI
 from src.models.domain import CasoTeste, Cliente, RespostaModelo, Decisao
 from src.utils.config import settings
 from src.utils.logger import setup_logger
 from src.utils.decorators import retry_with_backoff
+from src.utils.rate_limiter import get_rate_limiter, estimar_tokens
+from src.utils.json_stream import IncrementalJSONScanner
+from src.services.response_cache import ResponseCache
+from src.loaders.policy_index import PolicyIndex
 
 
 class ModelExecutor:
     """Executa chamadas ao modelo com retry + timeout + mock"""
 
+    MAX_TOKENS = 2048
+    TOP_LOGPROBS = 5
+
+    # Início do valor de "decisao" no JSON de resposta
+    DECISAO_RE = re.compile(r'"decisao"\s*:\s*"')
+
+    # Campos de usage lidos dos eventos de stream (Anthropic e OpenAI)
+    CAMPOS_USO = (
+        "input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens",
+        "prompt_tokens", "completion_tokens", "prompt_tokens_details"
+    )
+
     def __init__(
         self,
         client: Any = None,
@@ -24,13 +45,36 @@ class ModelExecutor:
         prompt_template: str = "",
         timeout: int = 60,
         provider: str = "anthropic",
-        use_mock: bool = True
+        use_mock: bool = True,
+        async_client: Any = None,
+        cache: Optional[ResponseCache] = None,
+        streaming: bool = False,
+        indice_politicas: Optional[PolicyIndex] = None,
+        logprobs_decisao: bool = False
     ):
         self.client = client
+        self.async_client = async_client
+        self.cache = cache
+        self.indice_politicas = indice_politicas
+        # Streaming exige o cliente assíncrono
+        self.streaming = streaming and async_client is not None
+        self.uso_tokens = {
+            "chamadas": 0,
+            "input_tokens": 0,
+            "cached_tokens": 0,
+            "cache_write_tokens": 0,
+            "output_tokens": 0,
+            "tempo_em_chamadas_s": 0.0
+        }
+        self._lock_uso = threading.Lock()
         self.model_name = model_name or settings.MODEL_NAME
         self.prompt_template = prompt_template
         self.timeout = timeout
         self.provider = provider
+        # Probabilidade do token de decisão (estimativa de ISR sem chamadas extras);
+        # só a OpenAI expõe logprobs na chamada de decisão
+        self.logprobs_decisao = logprobs_decisao and provider == "openai"
+        self.rate_limiter = get_rate_limiter(self.provider, self.model_name)
         self.use_mock = use_mock
         self.logger = setup_logger("ModelExecutor")
 
@@ -39,7 +83,12 @@ class ModelExecutor:
         else:
             self.logger.info(f"ModelExecutor inicializado com provider: {provider}")
 
-    @retry_with_backoff(max_retries=settings.MAX_RETRIES, backoff=settings.RETRY_BACKOFF)
+    @retry_with_backoff(
+        max_retries=settings.MAX_RETRIES,
+        backoff=settings.RETRY_BACKOFF,
+        max_backoff=settings.RETRY_MAX_BACKOFF,
+        breaker_key=lambda self, *args, **kwargs: self.provider
+    )
     async def executar_caso(
         self,
         cliente: Cliente,
@@ -73,30 +122,54 @@ class ModelExecutor:
         politicas: str
     ) -> Dict[str, Any]:
         """Executa caso usando API real"""
-        prompt_usuario = self._preparar_prompt(cliente, caso, politicas)
+        contexto_politicas = self._preparar_contexto_politicas(politicas, cliente, caso)
+        prompt_usuario = self._preparar_prompt(cliente, caso)
 
         try:
-            resposta = await asyncio.wait_for(
-                asyncio.to_thread(
-                    self._call_model,
-                    prompt_usuario
-                ),
-                timeout=self.timeout
-            )
+            chave_cache = None
+            resposta = None
+            if self.cache is not None:
+                chave_cache = self.chave_cache(prompt_usuario, contexto_politicas)
+                resposta = self.cache.obter(chave_cache)
+
+            if resposta is None:
+                # Espera por capacidade fora do timeout da chamada
+                await self.rate_limiter.acquire(
+                    self._estimar_tokens(prompt_usuario, contexto_politicas)
+                )
+
+                ttft = prob_decisao = None
+                inicio = time.monotonic()
+                if self.streaming:
+                    # Retorna assim que o objeto JSON fecha
+                    resposta, ttft, prob_decisao = await asyncio.wait_for(
+                        self._call_model_stream_async(prompt_usuario, contexto_politicas),
+                        timeout=self.timeout
+                    )
+                else:
+                    if self.async_client is not None:
+                        # Caminho nativo: wait_for cancela a requisição em voo no timeout
+                        chamada = self._call_model_async(prompt_usuario, contexto_politicas)
+                    else:
+                        chamada = asyncio.to_thread(self._call_model, prompt_usuario, contexto_politicas)
+                    resposta, prob_decisao = await asyncio.wait_for(chamada, timeout=self.timeout)
+                tempo_decisao = time.monotonic() - inicio
+                em_cache = False
+            else:
+                # O cache guarda só o texto: sem logprobs para respostas em cache
+                ttft = tempo_decisao = prob_decisao = None
+                em_cache = True
 
-            # Parseia resposta JSON
-            json_resposta = self._extrair_json(resposta)
+            resultado = self._processar_resposta(resposta, "cache" if em_cache else "real")
+            resultado["ttft_s"] = ttft
+            resultado["tempo_decisao_s"] = tempo_decisao
+            resultado["prob_decisao"] = prob_decisao
 
-            # Valida e estrutura resposta
-            resposta_modelo = self._parse_resposta(json_resposta)
+            # Só grava no cache respostas que parsearam com sucesso
+            if chave_cache is not None and not em_cache:
+                self.cache.salvar(chave_cache, resposta)
 
-            return {
-                "sucesso": True,
-                "resposta_bruta": resposta,
-                "resposta_json": json_resposta,
-                "resposta_modelo": resposta_modelo,
-                "modo": "real"
-            }
+            return resultado
 
         except asyncio.TimeoutError:
             self.logger.error(f"Model timeout para {caso.caso_id}")
@@ -108,6 +181,30 @@ class ModelExecutor:
             self.logger.error(f"Error executing case {caso.caso_id}: {e}")
             raise
 
+    def _processar_resposta(self, resposta: str, modo: str) -> Dict[str, Any]:
+        """Extrai o JSON da resposta bruta e monta o dict de retorno"""
+        # Parseia resposta JSON
+        json_resposta = self._extrair_json(resposta)
+
+        # Valida e estrutura resposta
+        resposta_modelo = self._parse_resposta(json_resposta)
+
+        return {
+            "sucesso": True,
+            "resposta_bruta": resposta,
+            "resposta_json": json_resposta,
+            "resposta_modelo": resposta_modelo,
+            "modo": modo
+        }
+
+    def chave_cache(self, prompt_usuario: str, contexto_politicas: str) -> str:
+        """Chave do cache de respostas para uma requisição renderizada"""
+        return self.cache.chave(
+            self.provider, self.model_name,
+            f"{self.prompt_template}\n\n{contexto_politicas}",
+            prompt_usuario, self.MAX_TOKENS
+        )
+
     def _mock_resposta(self, cliente: Cliente, caso: CasoTeste) -> Dict[str, Any]:
         """
         Simula resposta estruturada do modelo.
@@ -577,40 +674,326 @@ class ModelExecutor:
 
     # ========== MÉTODOS ORIGINAIS (API REAL) ==========
 
-    def _call_model(self, prompt: str) -> str:
-        """Chamada síncrona ao modelo (para usar em asyncio.to_thread)"""
+    def _montar_requisicao(self, prompt_usuario: str, contexto_politicas: str) -> Dict[str, Any]:
+        """
+        Monta os parâmetros da chamada com o prefixo estático primeiro.
+
+        O prompt de sistema é idêntico entre casos e vem antes das políticas
+        (selecionadas por caso) e da parte variável (cliente/caso), permitindo
+        cache de prefixo no provider:
+        - Anthropic: um breakpoint cache_control em cada bloco de sistema. O
+          do template é lido do cache em toda chamada; o das políticas
+          acerta quando a mesma seleção de políticas se repete
+        - OpenAI: cache automático de prefixo, que depende apenas da ordem
+        """
         if self.provider == "anthropic":
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=2048,
-                system=self.prompt_template,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return message.content[0].text
+            system = [
+                {"type": "text", "text": texto, "cache_control": {"type": "ephemeral"}}
+                for texto in (self.prompt_template, contexto_politicas) if texto
+            ]
+            return {
+                "model": self.model_name,
+                "max_tokens": self.MAX_TOKENS,
+                "system": system,
+                "messages": [{"role": "user", "content": prompt_usuario}]
+            }
         elif self.provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": self.prompt_template},
-                    {"role": "user", "content": prompt}
+            system = "\n\n".join(t for t in (self.prompt_template, contexto_politicas) if t)
+            return {
+                "model": self.model_name,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt_usuario}
                 ],
-                max_tokens=2048
-            )
-            return response.choices[0].message.content
+                "max_tokens": self.MAX_TOKENS,
+                **({"logprobs": True, "top_logprobs": self.TOP_LOGPROBS} if self.logprobs_decisao else {})
+            }
         else:
             raise ValueError(f"Provider desconhecido: {self.provider}")
 
-    def _preparar_prompt(self, cliente: Cliente, caso: CasoTeste, politicas: str) -> str:
-        """Monta o prompt para o modelo"""
-        cliente_dict = cliente.model_dump(exclude_none=True)
+    def _call_model(self, prompt: str, contexto_politicas: str = "") -> Tuple[str, Optional[float]]:
+        """
+        Chamada síncrona ao modelo (para usar em asyncio.to_thread)
+
+        Returns:
+            (texto da resposta, probabilidade do valor de "decisao" ou None)
+        """
+        params = self._montar_requisicao(prompt, contexto_politicas)
+        inicio = time.monotonic()
+        if self.provider == "anthropic":
+            message = self.client.messages.create(**params)
+            self._registrar_uso(
+                getattr(message, "usage", None), time.monotonic() - inicio,
+                self._estimar_tokens(prompt, contexto_politicas)
+            )
+            return message.content[0].text, None
+        else:
+            response = self.client.chat.completions.create(**params)
+            self._registrar_uso(
+                getattr(response, "usage", None), time.monotonic() - inicio,
+                self._estimar_tokens(prompt, contexto_politicas)
+            )
+            return response.choices[0].message.content, self._prob_decisao(response)
+
+    async def _call_model_async(self, prompt: str, contexto_politicas: str = "") -> Tuple[str, Optional[float]]:
+        """Chamada assíncrona ao modelo usando AsyncAnthropic/AsyncOpenAI (retorno como _call_model)"""
+        params = self._montar_requisicao(prompt, contexto_politicas)
+        inicio = time.monotonic()
+        if self.provider == "anthropic":
+            message = await self.async_client.messages.create(**params)
+            self._registrar_uso(
+                getattr(message, "usage", None), time.monotonic() - inicio,
+                self._estimar_tokens(prompt, contexto_politicas)
+            )
+            return message.content[0].text, None
+        else:
+            response = await self.async_client.chat.completions.create(**params)
+            self._registrar_uso(
+                getattr(response, "usage", None), time.monotonic() - inicio,
+                self._estimar_tokens(prompt, contexto_politicas)
+            )
+            return response.choices[0].message.content, self._prob_decisao(response)
+
+    async def _call_model_stream_async(
+        self,
+        prompt: str,
+        contexto_politicas: str = ""
+    ) -> Tuple[str, Optional[float], Optional[float]]:
+        """
+        Consome o stream do provider e encerra assim que o objeto JSON de
+        nível superior fecha, descartando texto posterior. Com
+        logprobs_decisao, os logprobs vêm nos próprios chunks (OpenAI).
+
+        Returns:
+            (texto da resposta, tempo até o primeiro token em segundos,
+            probabilidade do valor de "decisao" ou None)
+        """
+        params = self._montar_requisicao(prompt, contexto_politicas)
+        inicio = time.monotonic()
+        if self.provider == "anthropic":
+            stream = await self.async_client.messages.create(**params, stream=True)
+        else:
+            stream = await self.async_client.chat.completions.create(
+                **params, stream=True, stream_options={"include_usage": True}
+            )
+
+        scanner = IncrementalJSONScanner()
+        objeto = None
+        ttft = None
+        uso: Dict[str, Any] = {}
+        tokens: List[Any] = []
+        try:
+            async for evento in stream:
+                trecho, usage = self._ler_evento_stream(evento)
+                if self.logprobs_decisao:
+                    tokens.extend(self._logprobs_evento(evento))
+                if usage is not None:
+                    for campo in self.CAMPOS_USO:
+                        valor = getattr(usage, campo, None)
+                        if valor is not None:
+                            uso[campo] = valor
+                if not trecho:
+                    continue
+                if ttft is None:
+                    ttft = time.monotonic() - inicio
+                objeto = scanner.feed(trecho)
+                if objeto is not None:
+                    break
+        finally:
+            # Sempre encerra a conexão: no fim antecipado, em erro e em
+            # timeout/cancelamento (wait_for), o provider pararia de gerar
+            # só quando terminasse a resposta
+            if hasattr(stream, "close"):
+                await stream.close()
+
+        texto = objeto if objeto is not None else scanner.texto
+        self._registrar_uso(
+            self._uso_stream(uso, prompt, contexto_politicas, scanner.texto),
+            time.monotonic() - inicio,
+            self._estimar_tokens(prompt, contexto_politicas)
+        )
+        return texto, ttft, self._prob_decisao_tokens(tokens) if self.logprobs_decisao else None
+
+    def _prob_decisao(self, response: Any) -> Optional[float]:
+        """
+        Probabilidade conjunta dos tokens do valor de "decisao" na resposta
+        (exp da soma dos logprobs dos tokens que cobrem o valor).
+
+        Returns:
+            None se logprobs não foram pedidos ou o campo não foi encontrado
+        """
+        if not self.logprobs_decisao:
+            return None
+        logprobs = getattr(response.choices[0], "logprobs", None) if response.choices else None
+        return self._prob_decisao_tokens(getattr(logprobs, "content", None) or [])
+
+    @staticmethod
+    def _logprobs_evento(evento: Any) -> List[Any]:
+        """Logprobs dos tokens de um chunk de stream da OpenAI"""
+        escolhas = getattr(evento, "choices", None) or []
+        logprobs = getattr(escolhas[0], "logprobs", None) if escolhas else None
+        return getattr(logprobs, "content", None) or []
+
+    def _prob_decisao_tokens(self, tokens: List[Any]) -> Optional[float]:
+        """_prob_decisao sobre a lista de tokens (resposta completa ou chunks do stream)"""
+        if not tokens:
+            return None
+
+        texto = "".join(t.token for t in tokens)
+        m = self.DECISAO_RE.search(texto)
+        if not m:
+            return None
+        inicio = m.end()
+        fim = texto.find('"', inicio)
+        if fim <= inicio:
+            return None
+
+        soma = 0.0
+        posicao = 0
+        for token in tokens:
+            proxima = posicao + len(token.token)
+            # Tokens que se sobrepõem ao valor (podem incluir as aspas vizinhas)
+            if proxima > inicio and posicao < fim:
+                soma += token.logprob
+            posicao = proxima
+        return math.exp(soma)
+
+    def _ler_evento_stream(self, evento: Any) -> Tuple[str, Any]:
+        """Extrai (texto, usage) de um evento de stream do provider"""
+        if self.provider == "anthropic":
+            tipo = getattr(evento, "type", "")
+            if tipo == "content_block_delta":
+                return getattr(evento.delta, "text", None) or "", None
+            if tipo == "message_start":
+                return "", getattr(evento.message, "usage", None)
+            if tipo == "message_delta":
+                return "", getattr(evento, "usage", None)
+            return "", None
+
+        escolhas = getattr(evento, "choices", None) or []
+        trecho = (getattr(escolhas[0].delta, "content", None) or "") if escolhas else ""
+        return trecho, getattr(evento, "usage", None)
+
+    def _uso_stream(
+        self,
+        uso: Dict[str, Any],
+        prompt: str,
+        contexto_politicas: str,
+        texto: str
+    ) -> SimpleNamespace:
+        """
+        Completa o uso reportado no stream: ao encerrar cedo o provider não
+        envia a contagem final, então a saída (e a entrada, na OpenAI) é estimada.
+        """
+        uso = dict(uso)
+        saida_estimada = estimar_tokens(texto)
+        if self.provider == "anthropic":
+            uso["output_tokens"] = max(uso.get("output_tokens") or 0, saida_estimada)
+        else:
+            if not uso.get("prompt_tokens"):
+                uso["prompt_tokens"] = estimar_tokens(self.prompt_template + contexto_politicas + prompt)
+            uso["completion_tokens"] = max(uso.get("completion_tokens") or 0, saida_estimada)
+        return SimpleNamespace(**uso)
+
+    def _estimar_tokens(self, prompt: str, contexto_politicas: str = "") -> int:
+        """Tokens reservados no rate limiter: entrada estimada + max_tokens de saída"""
+        return estimar_tokens(self.prompt_template + contexto_politicas + prompt) + self.MAX_TOKENS
+
+    def _registrar_uso(
+        self,
+        usage: Any,
+        duracao_s: float = 0.0,
+        tokens_estimados: Optional[int] = None
+    ) -> None:
+        """
+        Acumula tokens de entrada, saída e lidos do cache de prefixo, e corrige
+        a reserva feita no rate limiter com o uso real.
+        """
+        with self._lock_uso:
+            self.uso_tokens["tempo_em_chamadas_s"] += duracao_s
+
+        if usage is None:
+            return
+
+        if self.provider == "anthropic":
+            cached = getattr(usage, "cache_read_input_tokens", None) or 0
+            escrita = getattr(usage, "cache_creation_input_tokens", None) or 0
+            # input_tokens da Anthropic exclui os tokens lidos/gravados em cache
+            entrada = (getattr(usage, "input_tokens", None) or 0) + cached + escrita
+            saida = getattr(usage, "output_tokens", None) or 0
+        else:
+            detalhes = getattr(usage, "prompt_tokens_details", None)
+            cached = (getattr(detalhes, "cached_tokens", None) or 0) if detalhes else 0
+            escrita = 0
+            entrada = getattr(usage, "prompt_tokens", None) or 0
+            saida = getattr(usage, "completion_tokens", None) or 0
+
+        with self._lock_uso:
+            self.uso_tokens["chamadas"] += 1
+            self.uso_tokens["input_tokens"] += entrada
+            self.uso_tokens["cached_tokens"] += cached
+            self.uso_tokens["cache_write_tokens"] += escrita
+            self.uso_tokens["output_tokens"] += saida
+
+        if tokens_estimados is not None:
+            self.rate_limiter.ajustar(entrada + saida - tokens_estimados)
+
+    def stats_tokens(self) -> Dict[str, float]:
+        """Uso de tokens da execução com a fração de entrada servida do cache"""
+        with self._lock_uso:
+            stats = dict(self.uso_tokens)
+        entrada = stats["input_tokens"]
+        stats["cached_token_ratio"] = stats["cached_tokens"] / entrada if entrada else 0.0
+        return stats
+
+    def _preparar_contexto_politicas(
+        self,
+        politicas: str,
+        cliente: Optional[Cliente] = None,
+        caso: Optional[CasoTeste] = None
+    ) -> str:
+        """
+        Bloco de políticas enviado no prompt de sistema.
+
+        Com índice de políticas e caso informados, envia as seções mais
+        relevantes para o caso dentro de POLICY_TOKEN_BUDGET; sem índice,
+        mantém o início do manual.
+        """
+        if not politicas:
+            return ""
+
+        if self.indice_politicas is not None and caso is not None:
+            trecho = self.indice_politicas.selecionar(
+                self._consulta_politicas(cliente, caso),
+                top_k=settings.POLICY_TOP_K,
+                token_budget=settings.POLICY_TOKEN_BUDGET
+            )
+        else:
+            trecho = politicas[:5000]
 
         return f"""# CONTEXTO: POLÍTICAS BANCÁRIAS
 
-{politicas[:5000]}
+{trecho}"""
 
----
+    def _consulta_politicas(self, cliente: Optional[Cliente], caso: CasoTeste) -> str:
+        """Texto de busca no índice: descrição do caso, entradas e perfil do cliente"""
+        partes = [
+            caso.tipo_cenario.value,
+            caso.subtipo,
+            caso.descricao,
+            json.dumps(caso.input, ensure_ascii=False, default=str),
+        ]
+        if cliente is not None:
+            partes.append(json.dumps(
+                cliente.model_dump(exclude_none=True), ensure_ascii=False, default=str
+            ))
+        return "\n".join(p for p in partes if p)
+
+    def _preparar_prompt(self, cliente: Cliente, caso: CasoTeste) -> str:
+        """Monta a parte variável do prompt (cliente e caso)"""
+        cliente_dict = cliente.model_dump(exclude_none=True)
 
-# CLIENTE PARA ANÁLISE
+        return f"""# CLIENTE PARA ANÁLISE
 
 ```json
 {json.dumps(cliente_dict, indent=2, default=str)}
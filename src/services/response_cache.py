@@ -0,0 +1,89 @@
+"""
+Cache de respostas do modelo para reexecuções baratas da auditoria.
+
+A chave é um hash de (provider, modelo, prompt de sistema, prompt do usuário,
+max_tokens): qualquer mudança no que é enviado ao modelo gera uma nova chave,
+enquanto mudanças só no avaliador ou no relatório reaproveitam as respostas.
+"""
+from pathlib import Path
+from typing import Dict, Optional
+from src.utils.disk_cache import DiskCache, hash_conteudo
+from src.utils.logger import setup_logger
+
+
+class ResponseCache:
+    """Cache em disco de respostas brutas do modelo com modos de leitura/escrita"""
+
+    MODOS = ("off", "read", "write", "readwrite")
+
+    def __init__(
+        self,
+        directory: Path,
+        mode: str = "readwrite",
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        if mode not in self.MODOS:
+            raise ValueError(f"Modo de cache inválido: {mode} (use um de {self.MODOS})")
+
+        self.mode = mode
+        self.logger = setup_logger("ResponseCache")
+        self._disk = DiskCache(directory, ttl_seconds, max_entries) if mode != "off" else None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @property
+    def pode_ler(self) -> bool:
+        return self.mode in ("read", "readwrite")
+
+    @property
+    def pode_escrever(self) -> bool:
+        return self.mode in ("write", "readwrite")
+
+    @staticmethod
+    def chave(
+        provider: str,
+        model_name: str,
+        system_prompt: str,
+        prompt_usuario: str,
+        max_tokens: int
+    ) -> str:
+        """Chave endereçada pelo conteúdo da requisição"""
+        return hash_conteudo(provider, model_name, system_prompt, prompt_usuario, max_tokens)
+
+    def obter(self, chave: str) -> Optional[str]:
+        """Retorna a resposta bruta em cache (ou None), contabilizando hit/miss"""
+        if not self.pode_ler:
+            return None
+
+        valor = self._disk.get(chave)
+        if valor is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return valor.get("resposta_bruta")
+
+    def salvar(self, chave: str, resposta_bruta: str) -> None:
+        """Armazena a resposta bruta se o modo permitir escrita"""
+        if not self.pode_escrever:
+            return
+
+        try:
+            self._disk.set(chave, {"resposta_bruta": resposta_bruta})
+            self.writes += 1
+        except OSError as e:
+            self.logger.warning(f"Falha ao gravar resposta no cache: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso do cache para o relatório"""
+        consultas = self.hits + self.misses
+        return {
+            "modo": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": self.hits / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,137 @@
+"""
+Sink JSONL append-only dos resultados de uma execução (checkpoint/retomada).
+
+Cada ResultadoAvaliacao é gravado em uma linha assim que o caso é avaliado,
+junto da resposta bruta do modelo, com flush + fsync: um crash no caso 900
+de 1000 preserva os 899 anteriores e --resume <run_id> só executa o que falta.
+Uma linha final truncada (crash no meio da escrita) é ignorada na leitura e,
+se o mesmo caso aparecer mais de uma vez, vale a última linha.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from src.models.domain import ResultadoAvaliacao
+from src.utils.logger import setup_logger
+
+
+def novo_run_id() -> str:
+    """Identificador de execução pelo horário (mesmo formato dos relatórios)"""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class ResultSink:
+    """Grava e relê os resultados de uma execução em <directory>/<run_id>.jsonl"""
+
+    def __init__(self, directory: Path, run_id: str, fsync: bool = True):
+        self.run_id = run_id
+        self.path = Path(directory) / f"{run_id}.jsonl"
+        self.fsync = fsync
+        self.logger = setup_logger("ResultSink")
+        self._lock = threading.Lock()
+        self._final_verificado = False
+
+        self.gravados = 0
+        self.linhas_invalidas = 0
+
+    @classmethod
+    def abrir(cls, path: Path, fsync: bool = True) -> "ResultSink":
+        """Sink a partir do caminho do arquivo (<directory>/<run_id>.jsonl)"""
+        path = Path(path)
+        return cls(path.parent, path.stem, fsync=fsync)
+
+    @property
+    def existe(self) -> bool:
+        return self.path.exists()
+
+    def gravar(
+        self,
+        resultado: ResultadoAvaliacao,
+        resposta_bruta: Optional[str] = None,
+        erro: bool = False
+    ) -> None:
+        """
+        Acrescenta um resultado ao sink e força a escrita em disco.
+
+        Args:
+            resultado: Resultado avaliado do caso
+            resposta_bruta: Texto retornado pelo modelo (None em falhas)
+            erro: Falha de execução (provider/cliente); o caso é refeito no --resume
+        """
+        linha = json.dumps({
+            "caso_id": resultado.caso_id,
+            "erro": erro,
+            "resultado": resultado.model_dump(mode="json"),
+            "resposta_bruta": resposta_bruta
+        }, ensure_ascii=False)
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                if not self._final_verificado:
+                    # Linha truncada de um crash anterior: começa em uma linha nova
+                    if self._termina_sem_quebra():
+                        linha = "\n" + linha
+                    self._final_verificado = True
+                f.write(linha + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self.gravados += 1
+
+    def atualizar(self, resultados: List[ResultadoAvaliacao]) -> None:
+        """
+        Regrava resultados enriquecidos depois da execução (ex: ISR semântico),
+        preservando a resposta bruta e o status de erro da última linha de
+        cada caso; na leitura vale a nova linha.
+        """
+        registros = self.registros()
+        for resultado in resultados:
+            anterior = registros.get(resultado.caso_id, {})
+            self.gravar(resultado, anterior.get("resposta_bruta"), erro=bool(anterior.get("erro")))
+
+    def _termina_sem_quebra(self) -> bool:
+        if not self.existe or self.path.stat().st_size == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def registros(self) -> Dict[str, dict]:
+        """Última linha válida de cada caso, na ordem da primeira gravação"""
+        registros: Dict[str, dict] = {}
+        self.linhas_invalidas = 0
+        if not self.existe:
+            return registros
+
+        # errors="replace": um caractere multibyte cortado invalida só a própria linha
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    registro = json.loads(linha)
+                    registros[registro["caso_id"]] = registro
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    # Tipicamente a última linha, cortada por um crash durante a escrita
+                    self.linhas_invalidas += 1
+                    self.logger.warning(f"Ignoring invalid line {numero} in {self.path}")
+
+        return registros
+
+    def carregar(self, incluir_erros: bool = True) -> List[ResultadoAvaliacao]:
+        """Resultados gravados (um por caso; falhas de execução opcionais)"""
+        return [
+            ResultadoAvaliacao.model_validate(registro["resultado"])
+            for registro in self.registros().values()
+            if incluir_erros or not registro.get("erro")
+        ]
+
+    def casos_concluidos(self) -> Set[str]:
+        """caso_ids com resultado avaliado (falhas de execução não contam)"""
+        return {
+            caso_id for caso_id, registro in self.registros().items()
+            if not registro.get("erro")
+        }
@@ -2,7 +2,7 @@
 Estado: Calcula métricas globais.
 """
 from src.core.state import SextantState
-from src.services.metrics_calculator import MetricsCalculator
+from src.services.metrics_accumulator import MetricsAccumulator
 from src.states.generate_report import GenerateReportState
 
 
@@ -19,9 +19,8 @@ class CalculateMetricsState(SextantState):
                 self.logger.warning("No results to calculate metrics")
                 context["metricas"] = None
             else:
-                calculator = MetricsCalculator()
-                metricas = calculator.calcular(resultados)
-                metricas_por_categoria = calculator.calcular_por_categoria(resultados)
+                # Uma passada para métricas globais e por categoria
+                metricas, metricas_por_categoria = MetricsAccumulator().add_many(resultados).snapshot()
                 
                 context["metricas"] = metricas
                 context["metricas_por_categoria"] = metricas_por_categoria
@@ -33,6 +32,11 @@ class CalculateMetricsState(SextantState):
                     f"Taxa Acessibilidade: {metricas.taxa_acessibilidade:.2%}"
                 )
                 
+                if metricas.isr_semantico_medio is not None:
+                    self.logger.info(
+                        f"ISR Semântico Médio: {metricas.isr_semantico_medio:.3f}"
+                    )
+
                 if metricas.flesch_kincaid_medio:
                     self.logger.info(
                         f"Flesch-Kincaid Médio: {metricas.flesch_kincaid_medio:.1f}"
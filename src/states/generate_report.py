@@ -6,6 +6,8 @@ from pathlib import Path
 from datetime import datetime
 from src.core.state import SextantState
 from src.states.done import DoneState
+from src.services.metrics_accumulator import MetricsAccumulator
+from src.services.result_sink import ResultSink
 from src.utils.config import settings
 import pandas as pd
 
@@ -16,6 +18,17 @@ class GenerateReportState(SextantState):
     async def execute(self, context):
         try:
             self.logger.info("Generating audit report...")
+
+            if "resultados" not in context and context.get("results_sink"):
+                # Relatório a partir do sink JSONL (ex: execução interrompida)
+                sink = ResultSink.abrir(context["results_sink"])
+                context["resultados"] = sink.carregar()
+                context.setdefault("run_id", sink.run_id)
+                self.logger.info(f"Loaded {len(context['resultados'])} results from {sink.path}")
+                if context.get("metricas") is None:
+                    metricas, por_categoria = MetricsAccumulator().add_many(context["resultados"]).snapshot()
+                    context["metricas"] = metricas
+                    context["metricas_por_categoria"] = por_categoria
             
             output_dir = context.get("output_dir", settings.OUTPUT_DIR)
             if isinstance(output_dir, str):
@@ -66,6 +79,8 @@ class GenerateReportState(SextantState):
         with open(path, "w", encoding="utf-8") as f:
             f.write("# Relatório de Auditoria - Sextant Banking Edition\n\n")
             f.write(f"**Data**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            if context.get("run_id"):
+                f.write(f"**Execução**: {context['run_id']}\n\n")
             
             # Resumo executivo
             f.write("## Resumo Executivo\n\n")
@@ -75,6 +90,8 @@ class GenerateReportState(SextantState):
                 f.write(f"- **Casos Fail**: {metricas.casos_fail}\n")
                 f.write(f"- **Casos Partial**: {metricas.casos_partial}\n")
                 f.write(f"- **ISR Médio**: {metricas.isr_medio:.3f}\n")
+                if metricas.isr_semantico_medio is not None:
+                    f.write(f"- **ISR Semântico Médio**: {metricas.isr_semantico_medio:.3f}\n")
                 f.write(f"- **Taxa de Acessibilidade**: {metricas.taxa_acessibilidade:.1%}\n")
                 if metricas.flesch_kincaid_medio:
                     f.write(f"- **Flesch-Kincaid Médio**: {metricas.flesch_kincaid_medio:.1f}\n")
@@ -120,6 +137,18 @@ class GenerateReportState(SextantState):
                 for vies in metricas.vieses_detectados:
                     f.write(f"- {vies}\n")
                 f.write("\n")
+
+            # Telemetria de execução (cache, latência, limites de taxa...)
+            telemetria = context.get("telemetria")
+            if telemetria:
+                f.write("## Telemetria de Execução\n\n")
+                for grupo, valores in telemetria.items():
+                    f.write(f"### {grupo}\n\n")
+                    for chave, valor in valores.items():
+                        if isinstance(valor, float):
+                            valor = f"{valor:.3f}"
+                        f.write(f"- **{chave}**: {valor}\n")
+                    f.write("\n")
     
     def _gerar_csv(self, context: dict, path: Path):
         """Gera CSV com resultados"""
@@ -138,7 +167,12 @@ class GenerateReportState(SextantState):
                 "tem_explicacao": bool(r.resposta_modelo.explicacao_acessivel if r.resposta_modelo else False),
                 "vieses": ", ".join(r.vieses_detectados),
                 "feedback": r.feedback,
-                "discrepancia": r.discrepancia or ""
+                "discrepancia": r.discrepancia or "",
+                "ttft_s": r.ttft_s,
+                "tempo_decisao_s": r.tempo_decisao_s,
+                "isr_semantico": r.isr_semantico,
+                "isr_bloqueado": r.isr_bloqueado,
+                "nivel_leitura": r.nivel_leitura
             })
         
         df = pd.DataFrame(rows)
@@ -150,10 +184,12 @@ class GenerateReportState(SextantState):
         
         output = {
             "timestamp": datetime.now().isoformat(),
+            "run_id": context.get("run_id"),
             "metricas": metricas.model_dump() if metricas else None,
             "metricas_por_categoria": [
                 m.model_dump() for m in context.get("metricas_por_categoria", [])
-            ]
+            ],
+            "telemetria": context.get("telemetria", {})
         }
         
         with open(path, "w", encoding="utf-8") as f:
@@ -4,6 +4,7 @@ Estado: Carrega todos os artefatos do Tier 1.
 from pathlib import Path
 from src.core.state import SextantState
 from src.loaders.artifacts import ArtifactLoader
+from src.loaders.policy_index import PolicyIndex
 from src.states.setup_model import SetupModelState
 from src.utils.config import settings
 
@@ -29,6 +30,12 @@ class LoadArtifactsState(SextantState):
             context["prompt_template"] = loader.carregar_prompt_template()
             context["matriz_validacao"] = loader.carregar_matriz_validacao()
             context["casos_adversariais"] = loader.carregar_casos_adversariais()
+
+            # Índice de seções das políticas para recuperação por caso
+            context["indice_politicas"] = PolicyIndex(context["politicas"]["markdown"])
+            self.logger.info(
+                f"Indexed {len(context['indice_politicas'].secoes)} policy sections"
+            )
             
             # Limita número de casos se especificado
             num_cases = context.get("num_cases")
@@ -2,130 +2,439 @@
 Estado: Executa todos os casos de teste.
 """
 import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 from src.core.state import SextantState
 from src.services.model_executor import ModelExecutor
 from src.services.evaluator import CaseEvaluator
+from src.services.response_cache import ResponseCache
+from src.services.batch_executor import BatchExecutor
+from src.services.result_sink import ResultSink, novo_run_id
 from src.states.calculate_metrics import CalculateMetricsState
+from src.states.semantic_audit import SemanticAuditState
+from src.models.domain import CasoTeste, Cliente, ResultadoAvaliacao, TipoCliente
 from src.utils.config import settings
+from src.utils.rate_limiter import rate_limiter_stats
+from src.utils.decorators import retry_stats
+from src.utils.circuit_breaker import circuit_breaker_stats
 from src.utils.logger import setup_logger
 
 
 class RunCasesState(SextantState):
     """Executa todos os casos de teste contra o modelo"""
-    
+
     async def execute(self, context):
         try:
             self.logger.info("Starting test case execution...")
-            
+
+            cache = self._criar_cache(context)
+            sink = self._criar_sink(context)
+
             # Inicializa executor e avaliador
             executor = ModelExecutor(
                 client=context["model_client"],
                 model_name=context["model_name"],
                 prompt_template=context["prompt_template"],
                 timeout=settings.MODEL_TIMEOUT,
-                provider=context["model_provider"]
+                provider=context["model_provider"],
+                use_mock=context.get("use_mock", True),
+                async_client=context.get("model_client_async"),
+                cache=cache,
+                streaming=context.get("streaming", settings.STREAMING),
+                indice_politicas=context.get("indice_politicas"),
+                logprobs_decisao=settings.ISR_DECISION_LOGPROBS
             )
-            
+
             evaluator = CaseEvaluator(
                 matriz=context["matriz_validacao"]
             )
-            
-            resultados = []
-            casos = context["casos"]
+
             clientes_map = {c.cliente_id: c for c in context["clientes"]}
             politicas_text = context["politicas"]["markdown"]
-            
+
+            # --resume: casos já avaliados no sink não são executados de novo
+            anteriores = self._carregar_anteriores(context, sink)
+            casos = [c for c in context["casos"] if c.caso_id not in anteriores]
+
             total_casos = len(casos)
-            self.logger.info(f"Executing {total_casos} test cases...")
-            
-            for i, caso in enumerate(casos, 1):
-                self.logger.info(f"Executing case {i}/{total_casos}: {caso.caso_id}")
-                
-                # Encontra cliente se houver referência
-                cliente = None
-                if caso.cliente_ref:
-                    cliente = clientes_map.get(caso.cliente_ref)
-                
-                if not cliente:
-                    # Tenta criar cliente mínimo do input do caso
-                    try:
-                        from src.models.domain import Cliente, TipoCliente
-                        input_data = caso.input.copy()
-                        input_data["cliente_id"] = caso.cliente_ref or f"TEMP_{caso.caso_id}"
-                        input_data["tipo"] = TipoCliente(input_data.get("tipo", "PF"))
-                        input_data["score_atual"] = input_data.get("score_atual", 500)
-                        input_data["renda_mensal"] = input_data.get("renda_mensal", 1000.0)
-                        cliente = Cliente(**input_data)
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Could not create client for case {caso.caso_id}: {e}"
+            concorrencia = max(1, int(context.get("concurrency") or settings.CASE_CONCURRENCY))
+            self.logger.info(
+                f"Executing {total_casos} test cases (concurrency={concorrencia})..."
+            )
+
+            if not casos:
+                resultados = []
+            elif context.get("batch_mode") and not executor.use_mock:
+                resultados = await self._executar_em_lote(
+                    context, casos, clientes_map, politicas_text, executor, evaluator, sink
+                )
+            else:
+                if context.get("batch_mode"):
+                    self.logger.warning("Batch mode ignored in mock mode")
+
+                # Semáforo limita casos em voo; gather preserva a ordem dos casos
+                semaforo = asyncio.Semaphore(concorrencia)
+
+                async def executar_limitado(i: int, caso: CasoTeste) -> ResultadoAvaliacao:
+                    async with semaforo:
+                        self.logger.info(f"Executing case {i}/{total_casos}: {caso.caso_id}")
+                        return await self._executar_caso(
+                            caso, clientes_map, politicas_text, executor, evaluator, sink
                         )
-                        # Cria resultado de falha
-                        from src.models.domain import ResultadoAvaliacao
-                        resultados.append(ResultadoAvaliacao(
-                            caso_id=caso.caso_id,
-                            status="FAIL",
-                            pontos=0.0,
-                            feedback=f"Cliente não encontrado: {e}"
-                        ))
-                        continue
-                
-                try:
-                    # Executa caso contra modelo
-                    resposta_dict = await executor.executar_caso(
-                        cliente=cliente,
-                        caso=caso,
-                        politicas=politicas_text
-                    )
-                    
-                    resposta_modelo = resposta_dict.get("resposta_modelo")
-                    resposta_json = resposta_dict.get("resposta_json", {})
-
-                    # Avalia resultado
-                    resultado = evaluator.avaliar(
-                        caso_id=caso.caso_id,
-                        cliente_id=cliente.cliente_id,
-                        resposta_modelo=resposta_modelo,
-                        caso_esperado=caso,
-                        resposta_json=resposta_json
-                    )
-                    
-                    resultados.append(resultado)
-                    
-                    self.logger.info(
-                        f"  Case {caso.caso_id}: {resultado.status} "
-                        f"(Points: {resultado.pontos:.2f}, "
-                        f"Accessible: {resultado.eh_acessivel})"
-                    )
-                    
-                    # Pequeno delay para não sobrecarregar API
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    self.logger.error(f"Error executing case {caso.caso_id}: {e}", exc_info=True)
-                    # Cria resultado de falha
-                    from src.models.domain import ResultadoAvaliacao
-                    resultados.append(ResultadoAvaliacao(
-                        caso_id=caso.caso_id,
-                        status="FAIL",
-                        pontos=0.0,
-                        feedback=f"Erro na execução: {str(e)}"
-                    ))
-            
+
+                resultados = await asyncio.gather(*(
+                    executar_limitado(i, caso) for i, caso in enumerate(casos, 1)
+                ))
+                resultados = list(resultados)
+
+            if anteriores:
+                # Mantém a ordem dos casos, misturando retomados e executados agora
+                novos = {r.caso_id: r for r in resultados}
+                resultados = [
+                    novos.get(c.caso_id) or anteriores[c.caso_id] for c in context["casos"]
+                ]
+
             context["resultados"] = resultados
-            
+
+            telemetria = context.setdefault("telemetria", {})
+            if sink is not None:
+                telemetria["sink_resultados"] = {
+                    "run_id": sink.run_id,
+                    "arquivo": str(sink.path),
+                    "retomados": len(anteriores),
+                    "gravados": sink.gravados,
+                }
+            stats_tokens = executor.stats_tokens()
+            if stats_tokens["chamadas"]:
+                telemetria["tokens"] = stats_tokens
+                self.logger.info(
+                    f"Prompt prefix cache: {stats_tokens['cached_token_ratio']:.1%} "
+                    f"of {stats_tokens['input_tokens']} input tokens served from cache"
+                )
+
+            if executor.indice_politicas is not None:
+                telemetria["politicas"] = executor.indice_politicas.stats()
+
+            latencia = self._stats_latencia(resultados)
+            if latencia:
+                telemetria["latencia"] = latencia
+
+            if cache is not None:
+                telemetria["cache_respostas"] = cache.stats()
+                self.logger.info(
+                    f"Response cache: {cache.hits} hits, {cache.misses} misses"
+                )
+
+            # Tempo de espera no limitador vs tempo em chamadas indica se a
+            # execução está limitada pela taxa ou pela latência do provider
+            for nome, stats_limiter in rate_limiter_stats().items():
+                if stats_limiter["esperas"]:
+                    telemetria[f"rate_limiter {nome}"] = stats_limiter
+
+            for nome, stats_retry in retry_stats().items():
+                if stats_retry["retentativas"] or stats_retry["fatais"] or stats_retry["rejeitadas_circuito"]:
+                    telemetria[f"retry {nome}"] = stats_retry
+
+            for nome, stats_circuito in circuit_breaker_stats().items():
+                if stats_circuito["aberturas"] or stats_circuito["falhas_consecutivas"]:
+                    telemetria[f"circuit_breaker {nome}"] = stats_circuito
+
             self.logger.info(
                 f"Completed execution: {len(resultados)} results "
                 f"({sum(1 for r in resultados if r.status == 'PASS')} PASS, "
                 f"{sum(1 for r in resultados if r.status == 'FAIL')} FAIL)"
             )
-            
+
+            if context.get("semantic_audit", settings.ISR_SEMANTIC_AUDIT):
+                self._log_transition("SemanticAuditState", {
+                    "total_resultados": len(resultados)
+                })
+                return SemanticAuditState()
+
             self._log_transition("CalculateMetricsState", {
                 "total_resultados": len(resultados)
             })
-            
+
             return CalculateMetricsState()
-        
+
         except Exception as e:
             self._log_error(e)
             raise
+
+    def _criar_cache(self, context) -> Optional[ResponseCache]:
+        """Cria o cache de respostas conforme --cache / RESPONSE_CACHE_MODE"""
+        modo = context.get("cache_mode") or settings.RESPONSE_CACHE_MODE
+        if modo == "off":
+            return None
+
+        output_dir = context.get("output_dir")
+        cache_dir = settings.RESPONSE_CACHE_DIR
+        if output_dir and not cache_dir.is_absolute():
+            # Mantém o cache junto dos demais artefatos quando --output-dir é usado
+            cache_dir = Path(output_dir) / "cache" / "responses"
+
+        return ResponseCache(
+            directory=cache_dir,
+            mode=modo,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES
+        )
+
+    def _criar_sink(self, context) -> Optional[ResultSink]:
+        """Cria o sink JSONL da execução conforme RESULTS_SINK / --resume"""
+        run_id = context.get("resume_run_id")
+        if not settings.RESULTS_SINK and not run_id:
+            return None
+
+        output_dir = context.get("output_dir")
+        sink_dir = settings.RESULTS_SINK_DIR
+        if output_dir and not sink_dir.is_absolute():
+            # Mesmo critério do cache de respostas: junto dos artefatos de --output-dir
+            sink_dir = Path(output_dir) / "runs"
+
+        sink = ResultSink(
+            sink_dir,
+            run_id or context.get("run_id") or novo_run_id(),
+            fsync=settings.RESULTS_SINK_FSYNC
+        )
+        context["run_id"] = sink.run_id
+        context["results_sink"] = sink.path
+        self.logger.info(f"Streaming results to {sink.path} (run_id={sink.run_id})")
+        return sink
+
+    def _carregar_anteriores(
+        self,
+        context,
+        sink: Optional[ResultSink]
+    ) -> Dict[str, ResultadoAvaliacao]:
+        """
+        Resultados já gravados no sink da execução retomada, por caso_id.
+
+        Falhas de execução (provider, cliente inválido) não contam como
+        concluídas e são executadas de novo.
+
+        Raises:
+            FileNotFoundError: Se --resume aponta para uma execução sem sink
+        """
+        if sink is None or not context.get("resume_run_id"):
+            return {}
+        if not sink.existe:
+            raise FileNotFoundError(f"Execução não encontrada para --resume: {sink.path}")
+
+        anteriores = {r.caso_id: r for r in sink.carregar(incluir_erros=False)}
+        pendentes = sum(1 for c in context["casos"] if c.caso_id not in anteriores)
+        self.logger.info(
+            f"Resuming run {sink.run_id}: {len(context['casos']) - pendentes} cases "
+            f"already evaluated, {pendentes} pending"
+        )
+        return anteriores
+
+    def _gravar(
+        self,
+        sink: Optional[ResultSink],
+        resultado: ResultadoAvaliacao,
+        resposta_bruta: Optional[str] = None,
+        erro: bool = False
+    ) -> ResultadoAvaliacao:
+        """Grava o resultado no sink; falha de disco não interrompe a execução"""
+        if sink is not None:
+            try:
+                sink.gravar(resultado, resposta_bruta, erro=erro)
+            except OSError as e:
+                self.logger.error(f"Could not write case {resultado.caso_id} to {sink.path}: {e}")
+        return resultado
+
+    async def _executar_caso(
+        self,
+        caso: CasoTeste,
+        clientes_map: Dict[str, Cliente],
+        politicas_text: str,
+        executor: ModelExecutor,
+        evaluator: CaseEvaluator,
+        sink: Optional[ResultSink] = None
+    ) -> ResultadoAvaliacao:
+        """
+        Executa e avalia um único caso.
+
+        Erros ficam isolados no caso: qualquer falha vira um ResultadoAvaliacao
+        com status FAIL, sem interromper os demais casos. O resultado é gravado
+        no sink assim que avaliado.
+        """
+        try:
+            cliente = self._resolver_cliente(caso, clientes_map)
+        except Exception as e:
+            self.logger.warning(
+                f"Could not create client for case {caso.caso_id}: {e}"
+            )
+            return self._gravar(sink, self._resultado_falha(caso, f"Cliente não encontrado: {e}"), erro=True)
+
+        try:
+            # Executa caso contra modelo
+            resposta_dict = await executor.executar_caso(
+                cliente=cliente,
+                caso=caso,
+                politicas=politicas_text
+            )
+
+            resultado = self._avaliar_resposta(caso, cliente, resposta_dict, evaluator)
+            self._gravar(sink, resultado, resposta_dict.get("resposta_bruta"))
+
+            # Pequeno delay para não sobrecarregar API
+            await asyncio.sleep(0.1)
+
+            return resultado
+
+        except Exception as e:
+            self.logger.error(f"Error executing case {caso.caso_id}: {e}", exc_info=True)
+            return self._gravar(sink, self._resultado_falha(caso, f"Erro na execução: {str(e)}"), erro=True)
+
+    async def _executar_em_lote(
+        self,
+        context,
+        casos: List[CasoTeste],
+        clientes_map: Dict[str, Cliente],
+        politicas_text: str,
+        executor: ModelExecutor,
+        evaluator: CaseEvaluator,
+        sink: Optional[ResultSink] = None
+    ) -> List[ResultadoAvaliacao]:
+        """
+        Executa todos os casos em um único job da API de lote do provider.
+
+        Mantém a ordem dos casos e o isolamento de erros por caso do modo
+        interativo; o lote é retomado automaticamente após um crash.
+        """
+        resultados: List[Optional[ResultadoAvaliacao]] = [None] * len(casos)
+        itens = []
+        indices = []
+
+        for i, caso in enumerate(casos):
+            try:
+                cliente = self._resolver_cliente(caso, clientes_map)
+            except Exception as e:
+                self.logger.warning(
+                    f"Could not create client for case {caso.caso_id}: {e}"
+                )
+                resultados[i] = self._gravar(
+                    sink, self._resultado_falha(caso, f"Cliente não encontrado: {e}"), erro=True
+                )
+                continue
+            itens.append((cliente, caso))
+            indices.append(i)
+
+        output_dir = Path(context.get("output_dir") or settings.OUTPUT_DIR)
+        batch = BatchExecutor(
+            executor,
+            estado_dir=output_dir / "batches",
+            poll_interval=settings.BATCH_POLL_INTERVAL
+        )
+
+        self.logger.info(f"Submitting {len(itens)} cases as a provider batch...")
+        respostas = await batch.executar(
+            itens, politicas_text, batch_id=context.get("batch_id")
+        )
+
+        for i, (cliente, caso), resposta in zip(indices, itens, respostas):
+            if isinstance(resposta, Exception):
+                self.logger.error(f"Error executing case {caso.caso_id}: {resposta}")
+                resultados[i] = self._gravar(
+                    sink, self._resultado_falha(caso, f"Erro na execução: {str(resposta)}"), erro=True
+                )
+                continue
+            try:
+                resultados[i] = self._gravar(
+                    sink,
+                    self._avaliar_resposta(caso, cliente, resposta, evaluator),
+                    resposta.get("resposta_bruta")
+                )
+            except Exception as e:
+                self.logger.error(f"Error evaluating case {caso.caso_id}: {e}", exc_info=True)
+                resultados[i] = self._gravar(
+                    sink, self._resultado_falha(caso, f"Erro na execução: {str(e)}"), erro=True
+                )
+
+        context.setdefault("telemetria", {})["batch"] = batch.stats
+        return resultados
+
+    def _resultado_falha(self, caso: CasoTeste, feedback: str) -> ResultadoAvaliacao:
+        """Cria resultado de falha para um caso"""
+        return ResultadoAvaliacao(
+            caso_id=caso.caso_id,
+            status="FAIL",
+            pontos=0.0,
+            feedback=feedback
+        )
+
+    def _resolver_cliente(
+        self,
+        caso: CasoTeste,
+        clientes_map: Dict[str, Cliente]
+    ) -> Cliente:
+        """
+        Encontra o cliente referenciado pelo caso ou cria um cliente mínimo
+        a partir do input do caso.
+
+        Raises:
+            Exception: Se o input do caso não formar um Cliente válido
+        """
+        # Encontra cliente se houver referência
+        cliente: Optional[Cliente] = None
+        if caso.cliente_ref:
+            cliente = clientes_map.get(caso.cliente_ref)
+
+        if cliente:
+            return cliente
+
+        # Tenta criar cliente mínimo do input do caso
+        input_data = caso.input.copy()
+        input_data["cliente_id"] = caso.cliente_ref or f"TEMP_{caso.caso_id}"
+        input_data["tipo"] = TipoCliente(input_data.get("tipo", "PF"))
+        input_data["score_atual"] = input_data.get("score_atual", 500)
+        input_data["renda_mensal"] = input_data.get("renda_mensal", 1000.0)
+        return Cliente(**input_data)
+
+    def _avaliar_resposta(
+        self,
+        caso: CasoTeste,
+        cliente: Cliente,
+        resposta_dict: Dict[str, Any],
+        evaluator: CaseEvaluator
+    ) -> ResultadoAvaliacao:
+        """Avalia a resposta do modelo para um caso"""
+        resposta_modelo = resposta_dict.get("resposta_modelo")
+        resposta_json = resposta_dict.get("resposta_json", {})
+
+        # Avalia resultado
+        resultado = evaluator.avaliar(
+            caso_id=caso.caso_id,
+            cliente_id=cliente.cliente_id,
+            resposta_modelo=resposta_modelo,
+            caso_esperado=caso,
+            resposta_json=resposta_json
+        )
+        resultado.ttft_s = resposta_dict.get("ttft_s")
+        resultado.tempo_decisao_s = resposta_dict.get("tempo_decisao_s")
+        resultado.prob_decisao = resposta_dict.get("prob_decisao")
+
+        self.logger.info(
+            f"  Case {caso.caso_id}: {resultado.status} "
+            f"(Points: {resultado.pontos:.2f}, "
+            f"Accessible: {resultado.eh_acessivel})"
+        )
+
+        return resultado
+
+    @staticmethod
+    def _stats_latencia(resultados: List[ResultadoAvaliacao]) -> Dict[str, float]:
+        """Média e p95 de TTFT e tempo até a decisão (casos chamados ao modelo)"""
+        stats: Dict[str, float] = {}
+        for campo, nome in (("ttft_s", "ttft"), ("tempo_decisao_s", "decisao")):
+            valores = sorted(
+                getattr(r, campo) for r in resultados if getattr(r, campo) is not None
+            )
+            if not valores:
+                continue
+            stats[f"{nome}_casos"] = len(valores)
+            stats[f"{nome}_medio_s"] = sum(valores) / len(valores)
+            stats[f"{nome}_p95_s"] = valores[min(len(valores) - 1, int(0.95 * len(valores)))]
+        return stats
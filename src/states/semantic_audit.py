@@ -0,0 +1,221 @@
+"""
+Estado: Auditoria semântica ISR das decisões do modelo.
+
+Etapa opcional entre RunCasesState e CalculateMetricsState (--isr /
+ISR_SEMANTIC_AUDIT). Cada decisão é verificada com o SemanticISRAuditorTool
+em lotes concorrentes (audit_many), reaproveitando o limitador de taxa
+compartilhado, o cache de logprobs e a estimativa pela chamada de decisão.
+"""
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from openai import AsyncOpenAI, OpenAI
+from src.core.state import SextantState
+from src.models.domain import CasoTeste, ResultadoAvaliacao
+from src.services.result_sink import ResultSink
+from src.states.calculate_metrics import CalculateMetricsState
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.logprob_cache import LogprobCache
+from src.utils.config import settings
+
+
+class SemanticAuditState(SextantState):
+    """Calcula o ISR Semântico por caso a partir das decisões do modelo"""
+
+    async def execute(self, context):
+        try:
+            resultados: List[ResultadoAvaliacao] = context.get("resultados", [])
+            auditor = context.get("isr_auditor") or self._criar_auditor(context)
+
+            if auditor is None:
+                self.logger.warning(
+                    "Semantic ISR audit skipped: requires --real and OPENAI_API_KEY (logprobs)"
+                )
+            else:
+                await self._auditar(context, resultados, auditor)
+
+            self._log_transition("CalculateMetricsState", {
+                "auditados": sum(1 for r in resultados if r.isr_semantico is not None)
+            })
+
+            return CalculateMetricsState()
+
+        except Exception as e:
+            self._log_error(e)
+            raise
+
+    def _criar_auditor(self, context) -> Optional[SemanticISRAuditorTool]:
+        """Auditor com clientes OpenAI (reusa os do contexto quando o provider é OpenAI)"""
+        if context.get("use_mock", True):
+            return None
+
+        if context.get("model_provider") == "openai":
+            client, async_client = context["model_client"], context.get("model_client_async")
+        elif settings.OPENAI_API_KEY:
+            client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            async_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        else:
+            return None
+
+        logprob_cache = None
+        if settings.ISR_LOGPROB_CACHE:
+            logprob_cache = LogprobCache(
+                settings.ISR_LOGPROB_CACHE_DIR,
+                max_entries=settings.ISR_LOGPROB_CACHE_MAX_ENTRIES
+            )
+
+        return SemanticISRAuditorTool(
+            client,
+            model=settings.ISR_MODEL,
+            max_concurrency=settings.ISR_CONCURRENCY,
+            async_client=async_client,
+            adaptive=settings.ISR_ADAPTIVE,
+            logprob_cache=logprob_cache,
+            probability_log=settings.ISR_PROBABILITY_LOG,
+            permutation_strategy=settings.ISR_PERMUTATION_STRATEGY,
+            scoring_mode=settings.ISR_SCORING_MODE
+        )
+
+    async def _auditar(
+        self,
+        context: Dict[str, Any],
+        resultados: List[ResultadoAvaliacao],
+        auditor: SemanticISRAuditorTool
+    ) -> None:
+        """
+        Audita em lotes os casos com decisão e grava o ISR em cada resultado
+        (e no sink da execução, quando houver). Casos que já têm ISR, como
+        os retomados com --resume, não são auditados de novo.
+        """
+        casos = {c.caso_id: c for c in context.get("casos", [])}
+        clientes = {c.cliente_id: c for c in context.get("clientes", [])}
+
+        pendentes: List[Tuple[ResultadoAvaliacao, List[str], str]] = []
+        ja_auditados = 0
+        for resultado in resultados:
+            caso = casos.get(resultado.caso_id)
+            if resultado.resposta_modelo is None or caso is None:
+                continue
+            if resultado.isr_semantico is not None:
+                ja_auditados += 1
+                continue
+            pendentes.append((
+                resultado,
+                self._contexto_auditoria(context, caso, clientes.get(resultado.cliente_id)),
+                resultado.resposta_modelo.decisao.value
+            ))
+
+        self.logger.info(f"Running semantic ISR audit on {len(pendentes)} decisions...")
+
+        inicio = time.monotonic()
+        chamadas_antes = dict(auditor.call_stats)
+        tokens_antes = auditor.cached_token_stats()
+        requisicoes_antes = auditor.request_stats["api_requests"]
+        tamanho_lote = max(1, settings.ISR_BATCH_SIZE)
+        lotes_com_falha = 0
+        casos_com_erro_api = 0
+
+        for i in range(0, len(pendentes), tamanho_lote):
+            lote = pendentes[i:i + tamanho_lote]
+            try:
+                auditorias = await auditor.audit_many_async(
+                    [(prompt, decisao) for _, prompt, decisao in lote],
+                    decision_probabilities=[r.prob_decisao for r, _, _ in lote]
+                )
+            except Exception as e:
+                # Falha de um lote não interrompe a execução: casos ficam sem ISR
+                self.logger.error(f"Semantic ISR batch failed: {e}")
+                lotes_com_falha += 1
+                continue
+
+            for (resultado, _, _), auditoria in zip(lote, auditorias):
+                if auditoria["metrics"].get("API_Errors", 0):
+                    # Chamadas com falha não viram BLOQUEADO: o caso fica sem ISR
+                    casos_com_erro_api += 1
+                    continue
+                resultado.isr_semantico = auditoria["metrics"]["ISR"]
+                resultado.isr_bloqueado = auditoria["decision"] == "BLOQUEADO"
+
+        duracao = time.monotonic() - inicio
+        auditados = [r for r, _, _ in pendentes if r.isr_semantico is not None]
+        self._gravar_no_sink(context, auditados)
+        chamadas = {k: auditor.call_stats[k] - chamadas_antes.get(k, 0) for k in auditor.call_stats}
+        tokens = auditor.cached_token_stats()
+        tokens_entrada = tokens["prompt_tokens"] - tokens_antes["prompt_tokens"]
+        tokens_cache = tokens["cached_tokens"] - tokens_antes["cached_tokens"]
+
+        requisicoes = auditor.request_stats["api_requests"] - requisicoes_antes
+
+        telemetria: Dict[str, Any] = {
+            "casos": len(auditados),
+            "ja_auditados": ja_auditados,
+            "bloqueados": sum(1 for r in auditados if r.isr_bloqueado),
+            "estimados_por_logprobs": chamadas.get("estimated", 0),
+            "chamadas": chamadas["calls_used"],
+            "requisicoes_http": requisicoes,
+            # Chamadas à API por decisão auditada (compara os modos single e packed)
+            "requisicoes_por_auditoria": requisicoes / len(pendentes) if pendentes else 0.0,
+            "modo_pontuacao": auditor.scoring_mode,
+            "chamadas_economizadas": chamadas["calls_saved"],
+            "lotes_com_falha": lotes_com_falha,
+            "casos_com_erro_api": casos_com_erro_api,
+            "erros_api": chamadas.get("api_errors", 0),
+            "estrategia_permutacao": auditor.permutation_strategy,
+            "tokens_entrada": tokens_entrada,
+            "tokens_cache_prefixo": tokens_cache,
+            "cached_token_ratio": tokens_cache / tokens_entrada if tokens_entrada else 0.0,
+            "tempo_total_s": duracao,
+        }
+        if auditor.logprob_cache is not None:
+            telemetria.update({
+                f"cache_logprobs_{k}": v for k, v in auditor.logprob_cache.stats().items()
+            })
+        context.setdefault("telemetria", {})["isr_semantico"] = telemetria
+
+        self.logger.info(
+            f"Semantic ISR: {len(auditados)} decisions audited in {duracao:.2f}s "
+            f"({telemetria['bloqueados']} blocked, {telemetria['chamadas']} API calls)"
+        )
+        if casos_com_erro_api:
+            self.logger.warning(
+                f"Semantic ISR: {casos_com_erro_api} decisions left unaudited after "
+                f"{telemetria['erros_api']} failed API calls"
+            )
+
+    def _gravar_no_sink(self, context: Dict[str, Any], auditados: List[ResultadoAvaliacao]) -> None:
+        """Acrescenta ao sink os resultados com ISR (a última linha de cada caso vale)"""
+        if not auditados or not context.get("results_sink"):
+            return
+        sink = ResultSink.abrir(context["results_sink"], fsync=settings.RESULTS_SINK_FSYNC)
+        try:
+            sink.atualizar(auditados)
+        except OSError as e:
+            # Como em RunCasesState: falha de disco não interrompe a execução
+            self.logger.error(f"Could not write semantic ISR results to {sink.path}: {e}")
+
+    @staticmethod
+    def _contexto_auditoria(context: Dict[str, Any], caso: CasoTeste, cliente: Any) -> List[str]:
+        """
+        Evidência apresentada ao auditor, em chunks permutáveis: dados do
+        cliente, caso e uma seção de política relevante por chunk (sem a
+        justificativa do próprio modelo).
+        """
+        dados_cliente = (
+            cliente.model_dump(exclude_none=True) if cliente is not None else caso.input
+        )
+        chunks = [
+            "# Cliente\n" + json.dumps(dados_cliente, ensure_ascii=False, default=str),
+            f"# Caso\n{caso.tipo_cenario.value} / {caso.subtipo}: {caso.descricao}\n"
+            + json.dumps(caso.input, ensure_ascii=False, default=str),
+        ]
+
+        indice = context.get("indice_politicas")
+        if indice is not None:
+            secoes = indice.selecionar_secoes(
+                "\n".join(chunks),
+                top_k=settings.POLICY_TOP_K,
+                token_budget=settings.POLICY_TOKEN_BUDGET
+            )
+            chunks += [indice.renderizar(secao) for secao in secoes]
+
+        return chunks
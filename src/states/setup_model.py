@@ -1,8 +1,8 @@
 """
 Estado: Configura cliente do modelo IA.
 """
-from anthropic import Anthropic
-from openai import OpenAI
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI
 from src.core.state import SextantState
 from src.states.run_cases import RunCasesState
 from src.utils.config import settings
@@ -26,6 +26,8 @@ class SetupModelState(SextantState):
                     raise ValueError("ANTHROPIC_API_KEY não configurada")
                 
                 context["model_client"] = Anthropic(api_key=api_key)
+                # Cliente async compartilhado por todos os casos (sem thread por chamada)
+                context["model_client_async"] = AsyncAnthropic(api_key=api_key)
                 context["model_provider"] = "anthropic"
                 
             elif provider == "openai":
@@ -34,6 +36,8 @@ class SetupModelState(SextantState):
                     raise ValueError("OPENAI_API_KEY não configurada")
                 
                 context["model_client"] = OpenAI(api_key=api_key)
+                # Cliente async compartilhado por todos os casos (sem thread por chamada)
+                context["model_client_async"] = AsyncOpenAI(api_key=api_key)
                 context["model_provider"] = "openai"
             else:
                 raise ValueError(f"Provider desconhecido: {provider}")
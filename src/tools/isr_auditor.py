@@ -8,15 +8,27 @@ with all 4 critical patches from Chlon et al. (2025):
 3. Hard Veto (instability detection)
 4. Success Shortcut (high confidence bypass)
 
-Adapted from AsyncISRAuditorV3 to work synchronously with OpenAI client.
+Adapted from AsyncISRAuditorV3. Permutations are scored concurrently
+(bounded by max_concurrency); audit() remains a synchronous wrapper around
+audit_async().
 """
 
+import asyncio
+import concurrent.futures
+import itertools
 import math
 import json
 import random
+import threading
+from pathlib import Path
 import numpy as np
 from openai import OpenAI
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+from src.utils.rate_limiter import get_rate_limiter, estimar_tokens
+from src.utils.disk_cache import hash_conteudo
+from src.tools.isr_batch import compute_isr_batch, REGIME_SHORTCUT, REGIME_VETO
+from src.tools.logprob_cache import LogprobCache
+from src.tools.isr_backends import ProbabilityBackend
 
 
 class SemanticISRAuditorTool:
@@ -36,6 +48,14 @@ class SemanticISRAuditorTool:
     # Minimum value to avoid division by zero and invalid logs
     EPSILON = 1e-9
     MIN_B2T = 1e-6
+
+    # Probability assumed for a failed call (reported in metrics["API_Errors"])
+    API_ERROR_PROBABILITY = 0.5
+
+    # How permutation prompts are built (see _build_permutation_prompts)
+    PERMUTATION_STRATEGIES = ("variation", "random", "shared_prefix")
+    VERIFICATION_QUERY = "Is the proposed decision correct for this case?"
+    SCORING_MODES = ("single", "packed")
     
     def __init__(
         self,
@@ -44,7 +64,17 @@ class SemanticISRAuditorTool:
         target_confidence: float = 0.95,
         num_permutations: int = 6,
         clipping_b: float = 12.0,
-        hard_veto_threshold: float = 0.20
+        hard_veto_threshold: float = 0.20,
+        max_concurrency: int = 6,
+        async_client: Optional[Any] = None,
+        adaptive: bool = False,
+        min_permutations: int = 3,
+        confidence_z: float = 2.0,
+        logprob_cache: Optional[LogprobCache] = None,
+        probability_log: Optional[Path] = None,
+        permutation_strategy: str = "variation",
+        scoring_mode: str = "single",
+        backend: Optional[ProbabilityBackend] = None
     ):
         """
         Initializes the Semantic ISR Auditor Tool.
@@ -56,12 +86,46 @@ class SemanticISRAuditorTool:
             num_permutations: Number of permutations to generate (default: 6)
             clipping_b: One-sided clipping bound for Delta (default: 12.0)
             hard_veto_threshold: Threshold for hard veto on instability (default: 0.20)
+            max_concurrency: Maximum permutation calls in flight per audit (default: 6)
+            async_client: Optional AsyncOpenAI client used by audit_async
+            adaptive: Stop sampling once the decision is determined; permutations
+                are requested in waves (min_permutations, then one at a time)
+                so an early stop actually saves calls (default: False)
+            min_permutations: Minimum permutations scored in adaptive mode (default: 3)
+            confidence_z: z of the lower prediction bound used for the early
+                success shortcut in adaptive mode (default: 2.0)
+            logprob_cache: Optional persistent cache of top_logprobs payloads;
+                cached prompts skip the rate limiter and the API call
+            probability_log: Optional JSONL file receiving the per-permutation
+                probabilities of every audit (input of the offline calibration sweep)
+            permutation_strategy: "variation" (original prompt with a [Variation i]
+                marker), "random" (seeded shuffles of the context chunks) or
+                "shared_prefix" (chunk orders that only permute the tail, so all
+                permutations share the longest common prefix for provider
+                prefix caching) (default: "variation")
+            scoring_mode: "single" (one chat request per permutation) or "packed"
+                (the permutation prompts of a whole audit_many batch are
+                deduplicated before scoring; same requests and numbers as
+                "single", fewer calls; not used by adaptive sampling)
+                (default: "single")
+            backend: Optional probability backend replacing the OpenAI calls
+                (e.g. SyntheticBackend for offline benchmarks); the logprob
+                cache and rate limiter are bypassed
         """
         if not 0.0 <= target_confidence <= 1.0:
             raise ValueError(f"target_confidence must be between 0.0 and 1.0, received: {target_confidence}")
+        if scoring_mode not in self.SCORING_MODES:
+            raise ValueError(f"scoring_mode must be one of {self.SCORING_MODES}, received: {scoring_mode}")
+        if permutation_strategy not in self.PERMUTATION_STRATEGIES:
+            raise ValueError(
+                f"permutation_strategy must be one of {self.PERMUTATION_STRATEGIES}, received: {permutation_strategy}"
+            )
         
         self.client = client
+        self.async_client = async_client
         self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
         self.target_confidence = target_confidence
         self.num_permutations = num_permutations
         self.clipping_b = clipping_b
@@ -71,64 +135,233 @@ class SemanticISRAuditorTool:
         # Prevents division by zero and infinite B2T
         # Formula: 1 / (N + 2) -> For num_permutations=6, floor = 0.125
         self.PROB_FLOOR = 1.0 / (self.num_permutations + 2)
+
+        self.adaptive = adaptive
+        self.min_permutations = max(1, min(min_permutations, self.num_permutations))
+        self.confidence_z = confidence_z
+        self.call_stats = {"audits": 0, "calls_used": 0, "calls_saved": 0, "estimated": 0, "api_errors": 0}
+
+        self.logprob_cache = logprob_cache
+        self.probability_log = Path(probability_log) if probability_log else None
+        self._log_lock = threading.Lock()
+
+        self.permutation_strategy = permutation_strategy
+        # Prompt tokens billed vs served from the provider's prefix cache
+        self.token_stats = {"prompt_tokens": 0, "cached_tokens": 0}
+        # HTTP round-trips vs permutation probabilities obtained from them
+        self.request_stats = {"api_requests": 0, "prompts_scored": 0}
+        self._stats_lock = threading.Lock()
+
+        self.backend = backend
+        self.scoring_mode = scoring_mode
+
+        # Process-wide limiter shared with ModelExecutor for the same (provider, model)
+        self.rate_limiter = get_rate_limiter("openai", self.model)
     
+    SYSTEM_PROMPT = "You are a precise fact auditor. Answer only Yes or No."
+
+    def _build_request(self, text_prompt: str) -> Dict[str, Any]:
+        """Builds the single-token logprob request for a verification prompt."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": text_prompt}
+            ],
+            "max_tokens": 1,
+            "temperature": 0.0,
+            "logprobs": True,
+            "top_logprobs": 5
+        }
+
+    def _estimate_request_tokens(self, text_prompt: str) -> int:
+        """Input tokens plus the single completion token, for the rate limiter."""
+        return estimar_tokens(self.SYSTEM_PROMPT + text_prompt) + 1
+
+    @staticmethod
+    def _extract_top_logprobs(response: Any) -> List[Dict[str, Any]]:
+        """Serializable top_logprobs payload of the first completion token."""
+        if not response.choices or not response.choices[0].logprobs:
+            return []
+        return [
+            {"token": token_obj.token, "logprob": token_obj.logprob}
+            for token_obj in response.choices[0].logprobs.content[0].top_logprobs
+        ]
+
+    def _yes_probability_from_top(self, top_logprobs: List[Dict[str, Any]]) -> float:
+        """
+        Linear probability of the "Yes" token from a top_logprobs payload.
+
+        Returns 0.0001 if "Yes" is not found in top_logprobs.
+        """
+        for token_obj in top_logprobs:
+            # Robust normalization: remove spaces and convert to lowercase
+            token_str = token_obj["token"].strip().lower()
+            if token_str in self.YES_TOKENS:
+                # Convert logprob to linear probability: e^(logprob)
+                return math.exp(token_obj["logprob"])
+
+        # If "Yes" not found, use minimum value to avoid log issues
+        return 0.0001
+
+    def _extract_yes_probability(self, response: Any) -> float:
+        """Extracts the linear probability of the "Yes" token from a logprob response."""
+        return self._yes_probability_from_top(self._extract_top_logprobs(response))
+
+    def _cached_probability(self, request: Dict[str, Any]) -> Tuple[Optional[str], Optional[float]]:
+        """Looks the request up in the logprob cache; returns (key, probability or None)."""
+        if self.logprob_cache is None:
+            return None, None
+        key = self.logprob_cache.key(request)
+        top = self.logprob_cache.get(key)
+        return key, (self._yes_probability_from_top(top) if top is not None else None)
+
+    def _record_usage(self, response: Any) -> None:
+        """Accumulates prompt and prefix-cached tokens reported by the provider."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._stats_lock:
+            self.token_stats["prompt_tokens"] += getattr(usage, "prompt_tokens", None) or 0
+            self.token_stats["cached_tokens"] += (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+    def _record_requests(self, requests: int, prompts: int) -> None:
+        with self._stats_lock:
+            self.request_stats["api_requests"] += requests
+            self.request_stats["prompts_scored"] += prompts
+
+    def cached_token_stats(self) -> Dict[str, float]:
+        """Prompt tokens, prefix-cached tokens and their ratio since creation."""
+        with self._stats_lock:
+            stats = dict(self.token_stats)
+        prompt = stats["prompt_tokens"]
+        stats["cached_token_ratio"] = stats["cached_tokens"] / prompt if prompt else 0.0
+        return stats
+
+    def _store_response(self, key: Optional[str], response: Any) -> float:
+        """Caches the response payload (when caching is on) and returns P(Yes)."""
+        self._record_usage(response)
+        top = self._extract_top_logprobs(response)
+        if key is not None:
+            self.logprob_cache.put(key, top)
+        return self._yes_probability_from_top(top)
+
     def _get_yes_probability(self, text_prompt: str) -> float:
         """
         Gets the linear probability of the "Yes" token for a given prompt.
         
         Makes a synchronous call to the OpenAI API with logprobs enabled and extracts
         the probability of the "Yes" token (or variations) from top_logprobs.
-        Enhanced token recognition supports multiple languages.
+        Enhanced token recognition supports multiple languages. Prompts already
+        in logprob_cache are answered without an API call.
         
         Args:
             text_prompt: Prompt to be evaluated
         
         Returns:
             Linear probability (0.0 to 1.0) of the "Yes" token.
-            Returns 1e-6 if "Yes" is not found in top_logprobs.
+            Returns 0.0001 if "Yes" is not found in top_logprobs.
             Returns 0.5 in case of API error.
         """
-        system_prompt = "You are a precise fact auditor. Answer only Yes or No."
-        
+        if self.backend is not None:
+            self._record_requests(1, 1)
+            return self._run_sync(self.backend.score(text_prompt))
+
+        request = self._build_request(text_prompt)
+        key, cached = self._cached_probability(request)
+        if cached is not None:
+            return cached
+        p = self._request_yes_probability(text_prompt, request, key)
+        return self.API_ERROR_PROBABILITY if math.isnan(p) else p
+
+    def _request_yes_probability(self, text_prompt: str, request: Dict[str, Any], key: Optional[str]) -> float:
+        """Rate-limited sync API call for a cache miss; NaN on API error."""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": text_prompt}
-                ],
-                max_tokens=1,
-                temperature=0.0,
-                logprobs=True,
-                top_logprobs=5
-            )
-            
-            if not response.choices or not response.choices[0].logprobs:
-                return 0.0001
-            
-            top_tokens = response.choices[0].logprobs.content[0].top_logprobs
-            
-            prob_yes = 0.0
-            found = False
-            
-            for token_obj in top_tokens:
-                # Robust normalization: remove spaces and convert to lowercase
-                token_str = token_obj.token.strip().lower()
-                if token_str in self.YES_TOKENS:
-                    # Convert logprob to linear probability: e^(logprob)
-                    prob_yes = math.exp(token_obj.logprob)
-                    found = True
-                    break
-            
-            # If "Yes" not found, use minimum value to avoid log issues
-            if not found:
-                prob_yes = 0.0001
-            
-            return prob_yes
+            # Shared with ModelExecutor for the same (provider, model)
+            self.rate_limiter.acquire_sync(self._estimate_request_tokens(text_prompt))
+            response = self.client.chat.completions.create(**request)
+            self._record_requests(1, 1)
+            # API errors are never cached
+            return self._store_response(key, response)
         
         except Exception as e:
             print(f"ISR Audit API Error: {e}")
-            return 0.5
+            return math.nan
+
+    async def _get_yes_probability_async(self, text_prompt: str, use_async_client: bool = True) -> float:
+        """
+        Async counterpart of _get_yes_probability.
+
+        Awaits the AsyncOpenAI client when available; otherwise runs the
+        synchronous call in a worker thread so permutations still overlap.
+        Returns NaN on API error, so callers can count failed calls (see
+        _apply_error_fallback).
+        """
+        if self.backend is not None:
+            self._record_requests(1, 1)
+            return await self.backend.score(text_prompt)
+
+        request = self._build_request(text_prompt)
+        key, cached = self._cached_probability(request)
+        if cached is not None:
+            return cached
+
+        if not (use_async_client and self.async_client is not None):
+            # Dedicated pool: the default executor may have fewer workers than max_concurrency
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._thread_pool(), self._request_yes_probability, text_prompt, request, key
+            )
+
+        try:
+            await self.rate_limiter.acquire(self._estimate_request_tokens(text_prompt))
+            response = await self.async_client.chat.completions.create(**request)
+            self._record_requests(1, 1)
+            return self._store_response(key, response)
+
+        except Exception as e:
+            print(f"ISR Audit API Error: {e}")
+            return math.nan
+
+    def _thread_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Lazily created worker pool for scoring with the sync client."""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="isr-audit"
+            )
+        return self._executor
+
+    async def _score_packed(self, prompts: List[str], use_async_client: bool = True) -> np.ndarray:
+        """
+        Packed scoring: identical verification prompts (the same chat request
+        to model) are scored once per batch and cached ones not at all; the
+        rest go out concurrently through the single-call path, so every
+        probability is exactly the one "single" mode would obtain.
+        """
+        unique = list(dict.fromkeys(prompts))
+        scored = await self._score_concurrently(unique, use_async_client)
+        probs = dict(zip(unique, scored))
+        return np.array([probs[p] for p in prompts])
+
+    async def _score_concurrently(self, prompts: List[str], use_async_client: bool) -> List[float]:
+        """Scores prompts through the single-call path, at most max_concurrency in flight."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def score(prompt: str) -> float:
+            async with semaphore:
+                return await self._get_yes_probability_async(prompt, use_async_client)
+
+        return list(await asyncio.gather(*(score(p) for p in prompts)))
+
+    async def _score_permutations(self, prompts: List[str], use_async_client: bool = True) -> np.ndarray:
+        """
+        Scores all permutation prompts concurrently, at most max_concurrency
+        in flight. Failed calls are NaN (see _apply_error_fallback).
+        """
+        if self.scoring_mode == "packed":
+            return await self._score_packed(prompts, use_async_client)
+        return np.array(await self._score_concurrently(prompts, use_async_client))
     
     @staticmethod
     def _calculate_entropy(p: float) -> float:
@@ -271,58 +504,212 @@ PROPOSED ANSWER: {answer_candidate}
 Is the 'PROPOSED ANSWER' completely supported and true based ONLY on the 'CONTEXT' provided above?
 Answer only with 'Yes' or 'No'."""
     
-    def audit(self, prompt_context: str, proposed_decision: str) -> str:
+    def _decision_determined(self, probs: np.ndarray) -> bool:
         """
-        Main method that orchestrates the ISR audit process for fact verification.
-        
-        This version works with:
-        - prompt_context: The original user prompt or context (can contain query + context)
-        - proposed_decision: Proposed decision token (e.g., "APROVADO", "BLOQUEADO")
-        
-        The process consists of:
-        1. Generate permutations of context (simulated via prompt variations)
-        2. Get probabilities for each permutation
-        3. Calculate metrics: Delta, B2T, JS Bound, ISR
-        4. Apply all 4 critical patches (Laplace, Clipping, Hard Veto, Success Shortcut)
-        5. Make decision based on calculated metrics
-        
+        Adaptive stopping rule over a NaN-padded probability vector.
+
+        Stops when:
+        - every permutation has been scored;
+        - the hard veto is certain: the running minimum is below
+          hard_veto_threshold and can only decrease, so the success shortcut
+          is no longer reachable;
+        - the success shortcut is statistically assured: the observed minimum
+          and the lower prediction bound for a further permutation,
+          mean - z * sd * sqrt(1 + 1/n), are both >= target_confidence.
+
+        The original prompt (index 0) and min_permutations must be scored first.
+        """
+        observed = probs[~np.isnan(probs)]
+        if len(observed) == len(probs):
+            return True
+        if np.isnan(probs[0]) or len(observed) < self.min_permutations:
+            return False
+
+        q_lo = float(observed.min())
+        if q_lo < self.hard_veto_threshold and max(q_lo, self.PROB_FLOOR) < self.target_confidence:
+            return True
+
+        if len(observed) >= 2:
+            lower = observed.mean() - self.confidence_z * observed.std(ddof=1) * math.sqrt(1 + 1 / len(observed))
+            if min(lower, q_lo) >= self.target_confidence:
+                return True
+
+        return False
+
+    async def _score_adaptive(
+        self,
+        prompts: List[str],
+        use_async_client: bool = True,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[np.ndarray, int, np.ndarray]:
+        """
+        Scores permutations in waves until _decision_determined: first the
+        original plus min_permutations - 1 permutations concurrently, then
+        one permutation at a time. Calls are only started when their result
+        can still change the decision, so an early stop never leaves billed
+        calls in flight. The semaphore (shared across an audit_many batch)
+        caps permutation calls in flight at max_concurrency. Failed calls
+        stay NaN, so they never settle the decision.
+
+        Returns:
+            (NaN-padded probabilities in permutation order, calls started,
+            mask of failed calls)
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        probs = np.full(len(prompts), np.nan)
+        errors = np.zeros(len(prompts), dtype=bool)
+        started = 0
+
+        async def score(i: int) -> None:
+            nonlocal started
+            async with semaphore:
+                started += 1
+                try:
+                    probs[i] = await self._get_yes_probability_async(prompts[i], use_async_client)
+                except Exception as e:
+                    print(f"ISR Audit API Error: {e}")
+                errors[i] = np.isnan(probs[i])
+
+        # Cancelling the audit cancels the wave in flight (gather propagates it)
+        first_wave = min(self.min_permutations, len(prompts))
+        await asyncio.gather(*(score(i) for i in range(first_wave)))
+
+        for i in range(first_wave, len(prompts)):
+            if self._decision_determined(probs):
+                break
+            await score(i)
+
+        return probs, started, errors
+
+    def _apply_error_fallback(self, probs: np.ndarray, errors: np.ndarray) -> np.ndarray:
+        """Failed calls count as API_ERROR_PROBABILITY in the metrics."""
+        return np.where(errors, self.API_ERROR_PROBABILITY, probs)
+
+    def _record_calls(self, metrics: Dict[str, Any], calls_used: int, api_errors: int = 0) -> None:
+        """Adds Calls_Used / Calls_Saved / API_Errors to the metrics and the running totals."""
+        metrics["Calls_Used"] = calls_used
+        metrics["Calls_Saved"] = self.num_permutations - calls_used
+        metrics["API_Errors"] = api_errors
+        self.call_stats["audits"] += 1
+        self.call_stats["calls_used"] += calls_used
+        self.call_stats["calls_saved"] += self.num_permutations - calls_used
+        self.call_stats["api_errors"] += api_errors
+
+    def estimate_from_decision(self, decision_probability: Optional[float]) -> Optional[Dict[str, Any]]:
+        """
+        First-pass audit from the probability the decision call itself gave
+        to its decision (logprobs of the primary call), at no extra API cost.
+
+        The single probability is treated as a one-permutation audit: only the
+        success shortcut and hard veto regimes are conclusive. Anything in
+        between needs the full permutation audit.
+
+        Returns:
+            Result dictionary (as _decide, with Estimated=True) or None when inconclusive
+        """
+        if decision_probability is None:
+            return None
+        batch = self.compute_isr_batch(np.array([[decision_probability]]))
+        if batch["regime"][0] not in (REGIME_SHORTCUT, REGIME_VETO):
+            return None
+
+        result = self._results_from_batch(batch)[0]
+        result["metrics"]["Estimated"] = True
+        result["reason"] = f"Estimated from decision logprobs. {result['reason']}"
+        self._record_calls(result["metrics"], 0)
+        self.call_stats["estimated"] += 1
+        return result
+
+    @staticmethod
+    def _as_chunks(prompt_context: Union[str, Sequence[str]]) -> List[str]:
+        """Context chunks: a list is used as is, a string is split on blank lines."""
+        if isinstance(prompt_context, str):
+            return [c.strip() for c in prompt_context.split("\n\n") if c.strip()]
+        return [c for c in prompt_context if c and c.strip()]
+
+    @classmethod
+    def _as_text(cls, prompt_context: Union[str, Sequence[str]]) -> str:
+        if isinstance(prompt_context, str):
+            return prompt_context
+        return "\n\n".join(cls._as_chunks(prompt_context))
+
+    def _chunk_orders(self, n_chunks: int, seed: str) -> List[Tuple[int, ...]]:
+        """
+        Distinct chunk orders, the original order first.
+
+        shared_prefix permutes only the smallest tail with at least
+        num_permutations distinct orders, in lexicographic order, so every
+        prompt shares the first n_chunks - m chunks. random draws seeded
+        shuffles (same context -> same prompts, so logprob caching still works).
+        Orders never repeat: with fewer than num_permutations distinct orders
+        (n_chunks! < num_permutations) the audit uses all of them and no more,
+        since a repeated prompt adds no evidence about order sensitivity.
+        """
+        identity = tuple(range(n_chunks))
+        limit = min(self.num_permutations, math.factorial(n_chunks))
+        if self.permutation_strategy == "random":
+            rng = random.Random(seed)
+            orders = [identity]
+            while len(orders) < limit:
+                order = tuple(rng.sample(identity, n_chunks))
+                if order not in orders:
+                    orders.append(order)
+            return orders
+
+        tail = 2
+        while tail < n_chunks and math.factorial(tail) < self.num_permutations:
+            tail += 1
+        head = identity[:n_chunks - tail]
+        orders = [head + perm for perm in itertools.permutations(identity[n_chunks - tail:])]
+        return orders[:limit]
+
+    def _build_permutation_prompts(
+        self,
+        prompt_context: Union[str, Sequence[str]],
+        proposed_decision: str
+    ) -> List[str]:
+        """
+        Builds the verification prompts, one per permutation; the first is
+        always the original order. Chunk strategies return fewer than
+        num_permutations prompts when the context has fewer distinct orders.
+
+        "variation" keeps the original context and appends a [Variation i]
+        marker. "random" and "shared_prefix" reorder the context chunks and
+        render them with construct_verification_prompt; with fewer than two
+        chunks they fall back to "variation".
+        """
+        chunks = self._as_chunks(prompt_context)
+        if self.permutation_strategy == "variation" or len(chunks) < 2:
+            text = self._as_text(prompt_context)
+            base_prompt = f"{text}\n\nIs this decision '{proposed_decision}' correct? Answer only Yes or No."
+            permutations_prompts = [base_prompt]
+
+            # Generate variations (simulating chunk permutations)
+            for i in range(self.num_permutations - 1):
+                variation = f"{text} [Variation {i+1}]\n\nIs this decision '{proposed_decision}' correct? Answer only Yes or No."
+                permutations_prompts.append(variation)
+
+            return permutations_prompts
+
+        orders = self._chunk_orders(len(chunks), hash_conteudo(chunks, proposed_decision))
+        return [
+            self.construct_verification_prompt(
+                self.VERIFICATION_QUERY, [chunks[i] for i in order], proposed_decision
+            )
+            for order in orders
+        ]
+
+    def _decide(self, probs_permutations: np.ndarray) -> Dict[str, Any]:
+        """
+        Computes the ISR metrics and decision from the permutation probabilities.
+
         Args:
-            prompt_context: Original prompt or context to verify
-            proposed_decision: Proposed decision token to verify
-        
+            probs_permutations: Probability of "Yes" for each permutation (original first)
+
         Returns:
-            JSON string containing:
-                - decision: "APROVADO" or "BLOQUEADO"
-                - metrics: Dictionary with ISR, B2T, Delta, JS_Bound, P_Original, P_Min_Permutation
-                - reason: Reason for the decision
+            Dictionary with decision, metrics and reason
         """
-        if not prompt_context or not prompt_context.strip():
-            raise ValueError("Prompt context cannot be empty")
-        
-        if not proposed_decision or not proposed_decision.strip():
-            raise ValueError("Proposed decision cannot be empty")
-        
-        # For this simplified version, we'll use the prompt_context as the base
-        # and generate permutations by creating variations
-        # In a full RAG system, this would be context_chunks
-        
-        # 1. Generate permutations (simulated via prompt variations)
-        # First permutation is always the original
-        base_prompt = f"{prompt_context}\n\nIs this decision '{proposed_decision}' correct? Answer only Yes or No."
-        permutations_prompts = [base_prompt]
-        
-        # Generate variations (simulating chunk permutations)
-        for i in range(self.num_permutations - 1):
-            # Create a variation by reordering or slightly modifying
-            variation = f"{prompt_context} [Variation {i+1}]\n\nIs this decision '{proposed_decision}' correct? Answer only Yes or No."
-            permutations_prompts.append(variation)
-        
-        # 2. Get probabilities for each permutation
-        probs_permutations = np.array([
-            self._get_yes_probability(prompt) for prompt in permutations_prompts
-        ])
-        
-        # 3. Calculate statistics
+        # Statistics
         q_bar = np.mean(probs_permutations)  # Bayesian mean
         q_lo_raw = float(np.min(probs_permutations))  # Worst case (raw)
         q_lo_adj = max(q_lo_raw, self.PROB_FLOOR)  # Worst case (adjusted with Laplace floor)
@@ -344,12 +731,11 @@ Answer only with 'Yes' or 'No'."""
                 "P_Min_Permutation": round(q_lo_raw, 4)
             }
             
-            result = {
+            return {
                 "decision": "APROVADO",
                 "metrics": metrics_dict,
                 "reason": "High confidence in all permutations. Model is robust and confident."
             }
-            return json.dumps(result, indent=2)
         
         # ==============================================================================
         # PATCH 4: HARD VETO (Instability Detection)
@@ -365,14 +751,13 @@ Answer only with 'Yes' or 'No'."""
                 "P_Min_Permutation": round(q_lo_raw, 4)
             }
             
-            result = {
+            return {
                 "decision": "BLOQUEADO",
                 "metrics": metrics_dict,
                 "reason": f"Severe instability detected (Min: {q_lo_raw:.4f} < {self.hard_veto_threshold}). Answer depends on prompt order."
             }
-            return json.dumps(result, indent=2)
         
-        # 4. Standard ISR Calculation
+        # Standard ISR Calculation
         # B2T: How much information do we need? (KL divergence to target)
         b2t = self._kl_divergence_bernoulli(target_prob, q_lo_adj)
         
@@ -388,11 +773,10 @@ Answer only with 'Yes' or 'No'."""
         else:
             isr = delta / b2t
         
-        # 5. Make decision
+        # Make decision
         decision = "APROVADO" if isr >= 1.0 else "BLOQUEADO"
         reason = f"ISR calculated: {isr:.4f} (Threshold >= 1.0)"
         
-        # 6. Package result
         metrics_dict = {
             "ISR": round(isr, 4),
             "B2T": round(b2t, 4),
@@ -402,10 +786,279 @@ Answer only with 'Yes' or 'No'."""
             "P_Min_Permutation": round(q_lo_raw, 4)
         }
         
-        result = {
+        return {
             "decision": decision,
             "metrics": metrics_dict,
             "reason": reason
         }
+
+    def compute_isr_batch(self, probs_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Vectorized ISR metrics for an (n_audits x n_permutations) probability
+        matrix, using this tool's thresholds (see src.tools.isr_batch).
+        """
+        return compute_isr_batch(
+            probs_matrix,
+            target_confidence=self.target_confidence,
+            clipping_b=self.clipping_b,
+            hard_veto_threshold=self.hard_veto_threshold,
+            prob_floor=self.PROB_FLOOR
+        )
+
+    def _results_from_batch(self, batch: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Formats compute_isr_batch output as _decide-style result dictionaries."""
+        results = []
+        for i in range(len(batch["ISR"])):
+            regime = batch["regime"][i]
+            isr = float(batch["ISR"][i])
+            q_lo_raw = float(batch["P_Min_Permutation"][i])
+
+            if regime == REGIME_SHORTCUT:
+                reason = "High confidence in all permutations. Model is robust and confident."
+            elif regime == REGIME_VETO:
+                reason = f"Severe instability detected (Min: {q_lo_raw:.4f} < {self.hard_veto_threshold}). Answer depends on prompt order."
+            else:
+                reason = f"ISR calculated: {isr:.4f} (Threshold >= 1.0)"
+
+            results.append({
+                "decision": "APROVADO" if batch["approved"][i] else "BLOQUEADO",
+                "metrics": {
+                    "ISR": round(isr, 4),
+                    "B2T": round(float(batch["B2T"][i]), 4),
+                    "Delta": round(float(batch["Delta"][i]), 4),
+                    "JS_Bound": round(float(batch["JS_Bound"][i]), 4),
+                    "P_Original": round(float(batch["P_Original"][i]), 4),
+                    "P_Min_Permutation": round(q_lo_raw, 4)
+                },
+                "reason": reason
+            })
+        return results
+
+    def _pad_rows(self, rows: List[np.ndarray], fill: Any) -> np.ndarray:
+        """Stacks per-audit rows, padded with fill up to num_permutations columns."""
+        matrix = np.full((len(rows), self.num_permutations), fill, dtype=np.asarray(rows[0]).dtype)
+        for i, row in enumerate(rows):
+            matrix[i, :len(row)] = row
+        return matrix
+
+    async def _audit_many(
+        self,
+        items: List[Tuple[str, str]],
+        use_async_client: bool,
+        decision_probabilities: Optional[List[Optional[float]]] = None
+    ) -> List[Dict[str, Any]]:
+        for prompt_context, proposed_decision in items:
+            self._validate_inputs(prompt_context, proposed_decision)
+
+        # Conclusive first-pass estimates skip the permutation calls entirely
+        estimates = [self.estimate_from_decision(p) for p in decision_probabilities or []]
+        pending = [i for i in range(len(items)) if i >= len(estimates) or estimates[i] is None]
+        if len(pending) < len(items):
+            audited = await self._audit_many([items[i] for i in pending], use_async_client)
+            results = estimates + [None] * (len(items) - len(estimates))
+            for i, result in zip(pending, audited):
+                results[i] = result
+            return results
+
+        if not items:
+            return []
+
+        prompts_per_item = [
+            self._build_permutation_prompts(prompt_context, proposed_decision)
+            for prompt_context, proposed_decision in items
+        ]
+
+        # One pool of calls: max_concurrency bounds the whole batch
+        if self.adaptive:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            scored = await asyncio.gather(*(
+                self._score_adaptive(prompts, use_async_client, semaphore) for prompts in prompts_per_item
+            ))
+            rows = [p for p, _, _ in scored]
+            calls_used = [used for _, used, _ in scored]
+            errors = self._pad_rows([e for _, _, e in scored], False)
+        else:
+            flat = [prompt for prompts in prompts_per_item for prompt in prompts]
+            scored = await self._score_permutations(flat, use_async_client)
+            bounds = np.cumsum([0] + [len(prompts) for prompts in prompts_per_item])
+            rows = [scored[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+            calls_used = [len(prompts) for prompts in prompts_per_item]
+            errors = self._pad_rows([np.isnan(row) for row in rows], False)
+        # Audits with fewer distinct orders are padded with NaN (unscored)
+        probs = self._pad_rows(rows, np.nan)
+        # Failed calls are logged as null, not as the fallback probability
+        self._log_probabilities(items, probs)
+
+        # NaN-padded rows (adaptive early stops) are handled by the batch engine
+        probs = self._apply_error_fallback(probs, errors)
+        results = self._results_from_batch(self.compute_isr_batch(probs))
+        for result, used, failed in zip(results, calls_used, errors.sum(axis=1)):
+            self._record_calls(result["metrics"], used, int(failed))
+        return results
+
+    async def audit_many_async(
+        self,
+        items: List[Tuple[str, str]],
+        decision_probabilities: Optional[List[Optional[float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Audits many (prompt_context, proposed_decision) pairs: all permutation
+        calls share one concurrency bound and metrics are computed in a single
+        vectorized pass.
+
+        Args:
+            items: (prompt_context, proposed_decision) pairs
+            decision_probabilities: Optional probability of each decision from the
+                primary call's logprobs (None entries allowed); items with a
+                conclusive estimate_from_decision are not re-audited
+
+        Returns:
+            List of result dictionaries (decision, metrics, reason), aligned with items
+        """
+        return await self._audit_many(items, True, decision_probabilities)
+
+    def audit_many(
+        self,
+        items: List[Tuple[str, str]],
+        decision_probabilities: Optional[List[Optional[float]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Synchronous wrapper around audit_many_async (see audit())."""
+        return self._run_sync(self._audit_many(items, False, decision_probabilities))
+
+    @classmethod
+    def audit_id(cls, prompt_context: Union[str, Sequence[str]], proposed_decision: str) -> str:
+        """Stable identifier of an audit, used to join logged probabilities with labels."""
+        return hash_conteudo(cls._as_text(prompt_context), proposed_decision)[:16]
+
+    def _log_probabilities(self, items: List[Tuple[str, str]], probs: np.ndarray) -> None:
+        """Appends one JSONL record per audit; unscored permutations are stored as null."""
+        if self.probability_log is None:
+            return
+        lines = []
+        for (prompt_context, proposed_decision), row in zip(items, np.atleast_2d(probs)):
+            lines.append(json.dumps({
+                "id": self.audit_id(prompt_context, proposed_decision),
+                "model": self.model,
+                "decision": proposed_decision,
+                "probs": [None if np.isnan(p) else float(p) for p in row],
+            }))
+        with self._log_lock:
+            self.probability_log.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.probability_log, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    @classmethod
+    def _validate_inputs(cls, prompt_context: Union[str, Sequence[str]], proposed_decision: str) -> None:
+        if not prompt_context or not cls._as_text(prompt_context).strip():
+            raise ValueError("Prompt context cannot be empty")
         
+        if not proposed_decision or not proposed_decision.strip():
+            raise ValueError("Proposed decision cannot be empty")
+
+    async def _audit(
+        self,
+        prompt_context: Union[str, Sequence[str]],
+        proposed_decision: str,
+        use_async_client: bool,
+        decision_probability: Optional[float] = None
+    ) -> str:
+        self._validate_inputs(prompt_context, proposed_decision)
+
+        estimate = self.estimate_from_decision(decision_probability)
+        if estimate is not None:
+            return json.dumps(estimate, indent=2)
+
+        prompts = self._build_permutation_prompts(prompt_context, proposed_decision)
+        if self.adaptive:
+            probs_permutations, calls_used, errors = await self._score_adaptive(prompts, use_async_client)
+        else:
+            probs_permutations = await self._score_permutations(prompts, use_async_client)
+            calls_used = len(prompts)
+            errors = np.isnan(probs_permutations)
+        self._log_probabilities([(prompt_context, proposed_decision)], probs_permutations)
+
+        # Unscored permutations (adaptive early stop) are dropped; the original stays first
+        probs_permutations = self._apply_error_fallback(probs_permutations, errors)
+        probs_permutations = probs_permutations[~np.isnan(probs_permutations)]
+
+        result = self._decide(probs_permutations)
+        self._record_calls(result["metrics"], calls_used, int(errors.sum()))
         return json.dumps(result, indent=2)
+
+    async def audit_async(
+        self,
+        prompt_context: Union[str, Sequence[str]],
+        proposed_decision: str,
+        decision_probability: Optional[float] = None
+    ) -> str:
+        """
+        Async ISR audit: all permutation calls are issued concurrently
+        (bounded by max_concurrency), so latency is roughly that of one call.
+        In adaptive mode, permutations are requested in waves and sampling
+        stops as soon as _decision_determined holds.
+
+        Args:
+            prompt_context: Original prompt or context to verify, or its list of chunks
+            proposed_decision: Proposed decision token to verify
+            decision_probability: Optional probability of the decision from the
+                primary call's logprobs; a conclusive estimate skips the permutations
+
+        Returns:
+            JSON string with decision, metrics and reason (same format as audit())
+        """
+        return await self._audit(prompt_context, proposed_decision, True, decision_probability)
+
+    def audit(
+        self,
+        prompt_context: Union[str, Sequence[str]],
+        proposed_decision: str,
+        decision_probability: Optional[float] = None
+    ) -> str:
+        """
+        Main method that orchestrates the ISR audit process for fact verification.
+        
+        This version works with:
+        - prompt_context: The original user prompt or context (can contain query + context)
+        - proposed_decision: Proposed decision token (e.g., "APROVADO", "BLOQUEADO")
+        
+        The process consists of:
+        1. Generate permutations of context (simulated via prompt variations)
+        2. Get probabilities for each permutation (concurrently, see audit_async)
+        3. Calculate metrics: Delta, B2T, JS Bound, ISR
+        4. Apply all 4 critical patches (Laplace, Clipping, Hard Veto, Success Shortcut)
+        5. Make decision based on calculated metrics
+        
+        Args:
+            prompt_context: Original prompt or context to verify, or its list of chunks
+            proposed_decision: Proposed decision token to verify
+            decision_probability: Optional probability of the decision from the
+                primary call's logprobs (see estimate_from_decision)
+        
+        Returns:
+            JSON string containing:
+                - decision: "APROVADO" or "BLOQUEADO"
+                - metrics: Dictionary with ISR, B2T, Delta, JS_Bound, P_Original, P_Min_Permutation,
+                  Calls_Used, Calls_Saved (non-zero only in adaptive mode) and API_Errors
+                  (failed calls, scored as API_ERROR_PROBABILITY; results with errors
+                  should not be trusted)
+                - reason: Reason for the decision
+        """
+        self._validate_inputs(prompt_context, proposed_decision)
+        return self._run_sync(self._audit(prompt_context, proposed_decision, False, decision_probability))
+
+    @staticmethod
+    def _run_sync(coro: Any) -> Any:
+        """
+        Runs an audit coroutine to completion from synchronous code.
+
+        Sync wrappers use the sync client from worker threads: an AsyncOpenAI
+        client is bound to the event loop that created it.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # Called from inside a running loop: run the audit on its own loop in a thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
@@ -0,0 +1,89 @@
+"""
+Probability backends for SemanticISRAuditorTool.
+
+By default the auditor scores verification prompts with OpenAI logprobs. A
+backend replaces those API calls with another source of P("Yes") while the
+rest of the pipeline (permutations, concurrency bounds, adaptive sampling,
+batch metrics) stays the same.
+
+SyntheticBackend is a seeded offline backend for load tests and benchmarks:
+the same (seed, prompt) always yields the same probability, latency is
+simulated with asyncio.sleep, and profiles reproduce the three ISR regimes.
+"""
+
+import asyncio
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+from src.utils.disk_cache import hash_conteudo
+
+
+class ProbabilityBackend(ABC):
+    """Source of the linear probability of "Yes" for a verification prompt."""
+
+    @abstractmethod
+    async def score(self, prompt: str) -> float:
+        """Returns P("Yes") in [0, 1] for one verification prompt."""
+
+
+class SyntheticBackend(ProbabilityBackend):
+    """
+    Deterministic synthetic probabilities with configurable latency.
+
+    Each prompt draws P("Yes") uniformly from [low, high]; with probability
+    veto_rate it draws from [veto_low, veto_high] instead, simulating a
+    permutation the model is unstable on.
+    """
+
+    PROFILES: Dict[str, Dict[str, float]] = {
+        # Confident under every order: success shortcut
+        "stable": {"low": 0.96, "high": 0.995, "veto_rate": 0.0},
+        # Spread-out probabilities: decided by ISR = Delta / B2T
+        "unstable": {"low": 0.35, "high": 0.9, "veto_rate": 0.0},
+        # Mostly confident, but some orders collapse: hard veto
+        "veto": {"low": 0.85, "high": 0.97, "veto_rate": 0.35, "veto_low": 0.01, "veto_high": 0.15},
+    }
+
+    def __init__(
+        self,
+        profile: Union[str, Dict[str, float]] = "stable",
+        seed: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0
+    ):
+        """
+        Args:
+            profile: "stable", "unstable", "veto" or a dict with low, high and
+                optionally veto_rate, veto_low, veto_high
+            seed: Seed combined with each prompt
+            latency: Simulated seconds per call
+            latency_jitter: Extra uniform [0, latency_jitter] seconds per call
+        """
+        if isinstance(profile, str):
+            if profile not in self.PROFILES:
+                raise ValueError(f"profile must be one of {tuple(self.PROFILES)}, received: {profile}")
+            profile = self.PROFILES[profile]
+        self.profile = {"veto_rate": 0.0, "veto_low": 0.0, "veto_high": 0.0, **profile}
+        self.seed = seed
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _draw(self, prompt: str) -> Dict[str, Any]:
+        rng = random.Random(hash_conteudo(self.seed, prompt))
+        p = self.profile
+        if rng.random() < p["veto_rate"]:
+            prob = rng.uniform(p["veto_low"], p["veto_high"])
+        else:
+            prob = rng.uniform(p["low"], p["high"])
+        return {"prob": prob, "delay": self.latency + rng.uniform(0.0, self.latency_jitter)}
+
+    async def score(self, prompt: str) -> float:
+        draw = self._draw(prompt)
+        with self._lock:
+            self.calls += 1
+        if draw["delay"] > 0:
+            await asyncio.sleep(draw["delay"])
+        return draw["prob"]
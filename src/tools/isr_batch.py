@@ -0,0 +1,106 @@
+"""
+Vectorized ISR metric engine.
+
+Computes the same metrics and decisions as SemanticISRAuditorTool._decide
+for a whole (n_audits x n_permutations) probability matrix at once, so
+stored audits can be re-scored (e.g. with a different target_confidence or
+hard_veto_threshold) without looping in Python.
+
+Rows may be NaN-padded when audits used different numbers of permutations;
+NaN entries are ignored in every statistic.
+"""
+
+from typing import Dict, Optional
+import numpy as np
+
+EPSILON = 1e-9
+MIN_B2T = 1e-6
+
+# Symbolic values used by the scalar auditor for the two patches
+SHORTCUT_ISR = 999.0
+VETO_B2T = 999.0
+ZERO_B2T_ISR = 100.0
+
+REGIME_SHORTCUT = "shortcut"
+REGIME_VETO = "veto"
+REGIME_ISR = "isr"
+
+
+def _binary_entropy(p: np.ndarray) -> np.ndarray:
+    """Elementwise binary entropy (nats); 0 outside (0, 1), NaN preserved."""
+    inside = (p > 0) & (p < 1)
+    safe = np.where(inside, p, 0.5)
+    h = -(safe * np.log(safe) + (1 - safe) * np.log(1 - safe))
+    return np.where(np.isnan(p), np.nan, np.where(inside, h, 0.0))
+
+
+def compute_isr_batch(
+    probs: np.ndarray,
+    target_confidence: float = 0.95,
+    clipping_b: float = 12.0,
+    hard_veto_threshold: float = 0.20,
+    prob_floor: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Computes Delta, B2T, JS bound, ISR and decisions for many audits.
+
+    Args:
+        probs: Array (n_audits x n_permutations) of "Yes" probabilities,
+            original prompt first; a 1-D array is treated as one audit
+        target_confidence: Confidence target for B2T
+        clipping_b: One-sided clipping bound for Delta
+        hard_veto_threshold: Minimum raw probability before hard veto
+        prob_floor: Laplace floor; defaults to 1 / (n_permutations + 2)
+
+    Returns:
+        Dictionary of 1-D arrays (length n_audits): ISR, B2T, Delta, JS_Bound,
+        P_Original, P_Min_Permutation, q_bar, approved (bool) and regime
+        ("shortcut", "veto" or "isr")
+    """
+    probs = np.asarray(probs, dtype=np.float64)
+    if probs.ndim == 1:
+        probs = probs[np.newaxis, :]
+
+    if prob_floor is None:
+        prob_floor = 1.0 / (probs.shape[1] + 2)
+
+    q_bar = np.nanmean(probs, axis=1)
+    q_lo_raw = np.nanmin(probs, axis=1)
+    q_lo_adj = np.maximum(q_lo_raw, prob_floor)
+
+    # Patch 3 (success shortcut) wins over Patch 4 (hard veto)
+    shortcut = q_lo_adj >= target_confidence
+    veto = ~shortcut & (q_lo_raw < hard_veto_threshold)
+
+    # JS bound: H(mean) - mean(H)
+    js_bound = _binary_entropy(q_bar) - np.nanmean(_binary_entropy(probs), axis=1)
+
+    # B2T: KL(target || q_lo_adj) with epsilon clipping
+    p_safe = np.clip(target_confidence, EPSILON, 1.0 - EPSILON)
+    q_safe = np.clip(q_lo_adj, EPSILON, 1.0 - EPSILON)
+    b2t = p_safe * np.log(p_safe / q_safe) + (1 - p_safe) * np.log((1 - p_safe) / (1 - q_safe))
+
+    # Delta: mean of one-sided clipped ln(q_bar / s_k)
+    loss = np.log(np.maximum(q_bar, EPSILON)[:, np.newaxis] / np.maximum(probs, EPSILON))
+    delta = np.nanmean(np.clip(loss, 0.0, clipping_b), axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        isr = np.where(b2t < MIN_B2T, ZERO_B2T_ISR, delta / b2t)
+
+    # Patched audits report symbolic metrics, as in the scalar path
+    isr = np.where(shortcut, SHORTCUT_ISR, np.where(veto, 0.0, isr))
+    b2t = np.where(shortcut, 0.0, np.where(veto, VETO_B2T, b2t))
+    delta = np.where(shortcut | veto, 0.0, delta)
+    js_bound = np.where(shortcut, 0.0, js_bound)
+
+    return {
+        "ISR": isr,
+        "B2T": b2t,
+        "Delta": delta,
+        "JS_Bound": js_bound,
+        "P_Original": probs[:, 0],
+        "P_Min_Permutation": q_lo_raw,
+        "q_bar": q_bar,
+        "approved": shortcut | (~veto & (isr >= 1.0)),
+        "regime": np.where(shortcut, REGIME_SHORTCUT, np.where(veto, REGIME_VETO, REGIME_ISR)),
+    }
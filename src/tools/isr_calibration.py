@@ -0,0 +1,116 @@
+"""
+Offline calibration of the ISR decision parameters.
+
+Loads the per-permutation probabilities logged by SemanticISRAuditorTool
+(probability_log) together with labelled outcomes and re-scores them with the
+vectorized engine over a grid of target_confidence, hard_veto_threshold and
+clipping_b values. No model calls are made.
+
+Labels follow the audit's question: 1 = the proposed decision is correct
+(should pass), 0 = it is wrong and should be blocked. Blocking is the
+positive class, so precision/recall measure how well BLOQUEADO catches bad
+decisions.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.tools.isr_batch import compute_isr_batch
+
+DEFAULT_TARGETS = (0.80, 0.85, 0.90, 0.95, 0.99)
+DEFAULT_VETOS = (0.05, 0.10, 0.20, 0.30, 0.40)
+DEFAULT_CLIPPINGS = (4.0, 8.0, 12.0)
+
+
+def load_probability_log(
+    path: Path,
+    labels: Optional[Dict[str, int]] = None
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Reads a probability log into a NaN-padded matrix.
+
+    Args:
+        path: JSONL written by SemanticISRAuditorTool (probability_log)
+        labels: Optional {audit id: label}; overrides a "label" field in the records
+
+    Returns:
+        (probs, labels, ids); records without a label are skipped and the
+        last record wins for repeated ids
+    """
+    labels = labels or {}
+    records: Dict[str, Tuple[List[Optional[float]], int]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            label = labels.get(record["id"], record.get("label"))
+            if label is None:
+                continue
+            records[record["id"]] = (record["probs"], int(label))
+
+    ids = list(records)
+    width = max((len(probs) for probs, _ in records.values()), default=0)
+    matrix = np.full((len(ids), width), np.nan)
+    for i, audit_id in enumerate(ids):
+        probs = records[audit_id][0]
+        matrix[i, :len(probs)] = [np.nan if p is None else p for p in probs]
+
+    return matrix, np.array([records[i][1] for i in ids], dtype=int), ids
+
+
+def calibration_sweep(
+    probs: np.ndarray,
+    labels: np.ndarray,
+    target_confidences: Iterable[float] = DEFAULT_TARGETS,
+    hard_veto_thresholds: Iterable[float] = DEFAULT_VETOS,
+    clipping_bs: Iterable[float] = DEFAULT_CLIPPINGS,
+    prob_floor: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Re-scores every audit for each parameter combination.
+
+    Args:
+        probs: Matrix (n_audits x n_permutations), NaN-padded
+        labels: 1 = decision should pass, 0 = decision should be blocked
+        target_confidences, hard_veto_thresholds, clipping_bs: Grid axes
+        prob_floor: Laplace floor; defaults to 1 / (n_permutations + 2)
+
+    Returns:
+        One row per combination with blocked_rate, precision, recall, f1,
+        accuracy and the confusion counts (positive class = blocked)
+    """
+    bad = np.asarray(labels) == 0
+    rows = []
+    for target, veto, clipping in itertools.product(target_confidences, hard_veto_thresholds, clipping_bs):
+        blocked = ~compute_isr_batch(
+            probs,
+            target_confidence=target,
+            clipping_b=clipping,
+            hard_veto_threshold=veto,
+            prob_floor=prob_floor
+        )["approved"]
+
+        tp = int(np.sum(blocked & bad))
+        fp = int(np.sum(blocked & ~bad))
+        fn = int(np.sum(~blocked & bad))
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        rows.append({
+            "target_confidence": target,
+            "hard_veto_threshold": veto,
+            "clipping_b": clipping,
+            "blocked_rate": float(blocked.mean()) if len(blocked) else 0.0,
+            "precision": precision,
+            "recall": recall,
+            "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            "accuracy": float(np.mean(blocked == bad)) if len(blocked) else 0.0,
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+        })
+
+    return pd.DataFrame(rows)
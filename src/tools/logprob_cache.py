@@ -0,0 +1,72 @@
+"""
+Persistent memoization of ISR verification calls.
+
+Verification requests are deterministic (temperature 0, max_tokens 1), so the
+top_logprobs payload for a given (model, request) pair can be stored once and
+reused by repeated audits and threshold experiments. Entries live in a
+DiskCache: reads refresh recency and writes evict the least recently used
+entries above max_entries.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.utils.disk_cache import DiskCache, hash_conteudo
+
+
+class LogprobCache:
+    """Disk-backed LRU cache of top_logprobs payloads keyed by request hash."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_entries: Optional[int] = 100_000,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            directory: Cache directory
+            max_entries: Size limit; least recently used entries are evicted beyond it
+            ttl_seconds: Optional expiry (None = entries never expire)
+        """
+        self._disk = DiskCache(directory, ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        """Content hash of the full request (model, messages, sampling params)."""
+        return hash_conteudo("isr-logprobs", request)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the stored top_logprobs ([{"token", "logprob"}, ...]) or None."""
+        value = self._disk.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value.get("top_logprobs")
+
+    def put(self, key: str, top_logprobs: List[Dict[str, Any]]) -> None:
+        try:
+            self._disk.set(key, {"top_logprobs": top_logprobs})
+        except OSError:
+            return
+        with self._lock:
+            self.writes += 1
+
+    def __len__(self) -> int:
+        return len(self._disk)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,159 @@
+"""
+Circuit breaker por provider, compartilhado no processo.
+
+Depois de `failure_threshold` falhas retentáveis consecutivas o circuito abre
+e as chamadas falham imediatamente durante `cooldown_seconds`, em vez de
+continuar martelando um provider em instabilidade. Passado o cool-down, uma
+única chamada de sonda (half-open) decide se o circuito fecha ou reabre.
+A sonda sempre devolve a vaga (liberar_sonda): uma sonda cancelada ou que
+termina sem desfecho registrado não deixa o circuito preso em half-open.
+"""
+import threading
+import time
+from typing import Dict, Optional
+from src.utils.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CircuitOpenError(RuntimeError):
+    """Chamada recusada porque o circuito do provider está aberto"""
+
+
+class CircuitBreaker:
+    """Máquina de estados closed -> open -> half_open -> closed"""
+
+    FECHADO = "closed"
+    ABERTO = "open"
+    SEMIABERTO = "half_open"
+
+    def __init__(self, nome: str, failure_threshold: int = 5, cooldown_seconds: float = 30.0):
+        """
+        Args:
+            nome: Identificação do circuito (ex: provider)
+            failure_threshold: Falhas consecutivas para abrir (0 = nunca abre)
+            cooldown_seconds: Tempo aberto antes de permitir uma sonda
+        """
+        self.nome = nome
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._estado = self.FECHADO
+        self._falhas_consecutivas = 0
+        self._aberto_em = 0.0
+        self._sondando = False
+        self._sonda_id = 0
+
+        self.aberturas = 0
+        self.rejeitadas = 0
+
+    @property
+    def estado(self) -> str:
+        with self._lock:
+            return self._estado_atual()
+
+    def _estado_atual(self) -> str:
+        if self._estado == self.ABERTO and time.monotonic() - self._aberto_em >= self.cooldown_seconds:
+            self._estado = self.SEMIABERTO
+            self._sondando = False
+        return self._estado
+
+    def antes_da_chamada(self) -> Optional[int]:
+        """
+        Levanta CircuitOpenError se a chamada não pode prosseguir.
+
+        Returns:
+            Id da sonda quando esta chamada é a sonda half-open (deve ser
+            devolvido com liberar_sonda ao terminar); None caso contrário
+        """
+        with self._lock:
+            estado = self._estado_atual()
+            if estado == self.FECHADO:
+                return None
+            if estado == self.SEMIABERTO and not self._sondando:
+                self._sondando = True
+                self._sonda_id += 1
+                return self._sonda_id
+
+            self.rejeitadas += 1
+            restante = max(0.0, self.cooldown_seconds - (time.monotonic() - self._aberto_em))
+            raise CircuitOpenError(
+                f"Circuito '{self.nome}' aberto após {self._falhas_consecutivas} falhas; "
+                f"nova tentativa em {restante:.1f}s"
+            )
+
+    def liberar_sonda(self, sonda: Optional[int]) -> None:
+        """
+        Devolve a vaga de sonda se ela terminou sem registrar sucesso/falha
+        (ex: cancelamento); a próxima chamada poderá sondar de novo.
+        """
+        if sonda is None:
+            return
+        with self._lock:
+            if self._sondando and self._sonda_id == sonda:
+                self._sondando = False
+
+    def registrar_sucesso(self) -> None:
+        with self._lock:
+            if self._estado != self.FECHADO:
+                logger.info(f"Circuit breaker '{self.nome}' closed")
+            self._estado = self.FECHADO
+            self._falhas_consecutivas = 0
+            self._sondando = False
+
+    def registrar_falha(self) -> None:
+        """Contabiliza uma falha retentável (erros fatais não indicam instabilidade)"""
+        with self._lock:
+            self._falhas_consecutivas += 1
+            estado = self._estado_atual()
+            if estado == self.SEMIABERTO or (
+                self.failure_threshold and self._falhas_consecutivas >= self.failure_threshold
+            ):
+                if estado != self.ABERTO:
+                    self.aberturas += 1
+                    logger.warning(
+                        f"Circuit breaker '{self.nome}' open for {self.cooldown_seconds}s "
+                        f"after {self._falhas_consecutivas} consecutive failures"
+                    )
+                self._estado = self.ABERTO
+                self._aberto_em = time.monotonic()
+                self._sondando = False
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "estado": self._estado_atual(),
+                "falhas_consecutivas": self._falhas_consecutivas,
+                "aberturas": self.aberturas,
+                "rejeitadas": self.rejeitadas,
+            }
+
+
+_circuitos: Dict[str, CircuitBreaker] = {}
+_registro_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    nome: str,
+    failure_threshold: Optional[int] = None,
+    cooldown_seconds: Optional[float] = None
+) -> CircuitBreaker:
+    """Retorna o circuito do processo para `nome`, criando-o com os limites de Settings"""
+    with _registro_lock:
+        circuito = _circuitos.get(nome)
+        if circuito is None:
+            circuito = CircuitBreaker(
+                nome,
+                failure_threshold if failure_threshold is not None else settings.CIRCUIT_BREAKER_THRESHOLD,
+                cooldown_seconds if cooldown_seconds is not None else settings.CIRCUIT_BREAKER_COOLDOWN
+            )
+            _circuitos[nome] = circuito
+        return circuito
+
+
+def circuit_breaker_stats() -> Dict[str, Dict[str, object]]:
+    """Estado de todos os circuitos criados no processo"""
+    with _registro_lock:
+        circuitos = list(_circuitos.values())
+    return {c.nome: c.stats() for c in circuitos}
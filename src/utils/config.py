@@ -3,7 +3,7 @@ Configurações globais do Sextant usando Pydantic Settings.
 """
 from pydantic_settings import BaseSettings
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -39,12 +39,75 @@ class Settings(BaseSettings):
     MODEL_TIMEOUT: int = 60
     MAX_RETRIES: int = 3
     RETRY_BACKOFF: float = 2.0
+    RETRY_MAX_BACKOFF: float = 60.0
+    CIRCUIT_BREAKER_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_COOLDOWN: float = 30.0
+
+    # Execução de casos
+    CASE_CONCURRENCY: int = 4  # Casos em voo simultaneamente (1 = sequencial)
+
+    # Limites de taxa por (provider, modelo), compartilhados no processo (0 = sem limite)
+    RATE_LIMIT_REQUESTS_PER_MINUTE: int = 0
+    RATE_LIMIT_TOKENS_PER_MINUTE: int = 0
+    RATE_LIMIT_OVERRIDES: Dict[str, Dict[str, int]] = {}  # {"provider:modelo": {"rpm": .., "tpm": ..}}
+
+    # Modo lote (--batch): APIs de lote dos providers
+    BATCH_POLL_INTERVAL: float = 30.0
+
+    # Recuperação de seções do manual de políticas por caso
+    POLICY_TOP_K: int = 6
+    POLICY_TOKEN_BUDGET: int = 1500
+
+    # Streaming (--stream): encerra a resposta assim que o objeto JSON fecha
+    STREAMING: bool = False
+
+    # Cache de respostas do modelo
+    RESPONSE_CACHE_MODE: str = "off"  # "off", "read", "write" ou "readwrite"
+    RESPONSE_CACHE_DIR: Path = Path("outputs/cache/responses")
+    RESPONSE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    RESPONSE_CACHE_MAX_ENTRIES: int = 50000
+
+    # Sink JSONL dos resultados por execução (checkpoint para --resume <run_id>)
+    RESULTS_SINK: bool = True
+    RESULTS_SINK_DIR: Path = Path("outputs/runs")
+    RESULTS_SINK_FSYNC: bool = True  # fsync por resultado (sobrevive a queda do sistema)
+
+    # Cache persistente de top_logprobs das verificações ISR (LRU por tamanho)
+    ISR_LOGPROB_CACHE: bool = False
+    ISR_LOGPROB_CACHE_DIR: Path = Path("outputs/cache/logprobs")
+    ISR_LOGPROB_CACHE_MAX_ENTRIES: int = 100000
+
+    # JSONL com as probabilidades por permutação de cada auditoria ISR
+    # (entrada de scripts/calibrate_isr.py); None = desativado
+    ISR_PROBABILITY_LOG: Optional[Path] = None
+
+    # Pede logprobs na chamada de decisão (OpenAI) para estimar o ISR sem
+    # permutações; a auditoria completa só roda quando a estimativa é inconclusiva
+    ISR_DECISION_LOGPROBS: bool = False
+
+    # Auditoria semântica ISR como etapa do FSM (--isr)
+    ISR_SEMANTIC_AUDIT: bool = False
+    ISR_MODEL: str = "gpt-4o-mini"  # Requer logprobs (OpenAI)
+    ISR_CONCURRENCY: int = 6  # Chamadas de verificação em voo
+    ISR_BATCH_SIZE: int = 20  # Decisões por audit_many
+    ISR_ADAPTIVE: bool = False  # Encerra a amostragem quando a decisão está determinada
+    # "variation", "random" ou "shared_prefix" (permuta só o fim: prefixo comum em cache)
+    ISR_PERMUTATION_STRATEGY: str = "variation"
+    # "single" (uma requisição por permutação) ou "packed" (prompts idênticos
+    # do lote pontuados uma vez; mesmas requisições e mesmo ISR do single)
+    ISR_SCORING_MODE: str = "single"
     
     # Thresholds
     ISR_THRESHOLD: float = 0.85
     DISPARATE_IMPACT_THRESHOLD: float = 1.25
     ACCESSIBILITY_THRESHOLD: float = 0.70
     FLESCH_KINCAID_MAX_GRADE: float = 8.0  # 8ª série
+
+    # Legibilidade (AccessibilityService)
+    # "textstat" ou "nativo" (contador de sílabas em português, sem textstat)
+    ACCESSIBILITY_READABILITY_ENGINE: str = "textstat"
+    # Entradas do LRU de legibilidade por texto normalizado (0 = sem cache)
+    ACCESSIBILITY_CACHE_SIZE: int = 4096
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -3,62 +3,204 @@ Decoradores utilitários para retry, timeout, etc.
 """
 import asyncio
 import functools
+import json
+import random
+import threading
 import time
-from typing import Callable, TypeVar, Any
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, TypeVar, Any
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 T = TypeVar("T")
 
+# 408 timeout, 409 conflito, 429 rate limit; 5xx tratados à parte
+RETRYABLE_STATUS = {408, 409, 429}
+FATAL_EXCEPTIONS = (json.JSONDecodeError, ValueError, TypeError, KeyError, AttributeError, NotImplementedError)
 
-def retry_with_backoff(max_retries: int = 3, backoff: float = 2.0, exceptions: tuple = (Exception,)):
+_retry_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def is_retryable(exc: BaseException) -> bool:
     """
-    Decorador para retry com backoff exponencial.
-    
+    Classifica a exceção: True se vale retentar (instabilidade do provider),
+    False se é fatal (autenticação, requisição inválida, resposta não parseável).
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # JSONDecodeError e ValidationError do pydantic são ValueError
+    if isinstance(exc, FATAL_EXCEPTIONS):
+        return False
+    # Erros de conexão/timeout dos SDKs não têm status HTTP
+    return True
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Extrai Retry-After (ms, segundos ou data HTTP) da resposta anexada à exceção"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        valor_ms = headers.get("retry-after-ms")
+        if valor_ms is not None:
+            return max(0.0, float(valor_ms) / 1000.0)
+
+        valor = headers.get("retry-after")
+        if valor is None:
+            return None
+        try:
+            return max(0.0, float(valor))
+        except ValueError:
+            data = parsedate_to_datetime(valor)
+            return max(0.0, data.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _decorrelated_jitter(base: float, anterior: float, teto: float) -> float:
+    """Backoff com jitter descorrelacionado: uniforme em [base, 3 * espera anterior]"""
+    return min(teto, random.uniform(base, max(base, anterior * 3)))
+
+
+def _registrar(nome: str, campo: str) -> None:
+    with _stats_lock:
+        stats = _retry_stats.setdefault(nome, {
+            "chamadas": 0, "retentativas": 0, "fatais": 0, "esgotadas": 0, "rejeitadas_circuito": 0
+        })
+        stats[campo] += 1
+
+
+def retry_stats() -> Dict[str, Dict[str, int]]:
+    """Contadores de retry por função decorada"""
+    with _stats_lock:
+        return {nome: dict(stats) for nome, stats in _retry_stats.items()}
+
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    backoff: float = 2.0,
+    exceptions: tuple = (Exception,),
+    max_backoff: float = 60.0,
+    breaker_key: Optional[Callable[..., str]] = None
+):
+    """
+    Decorador para retry com backoff exponencial e jitter descorrelacionado.
+
+    Apenas exceções retentáveis (ver is_retryable) são repetidas; a espera
+    respeita o Retry-After do provider quando presente. Com `breaker_key`,
+    as chamadas passam pelo circuit breaker do provider retornado por
+    `breaker_key(*args, **kwargs)` e falham imediatamente enquanto ele
+    estiver aberto. Erros fatais contam como sucesso para o circuito (o
+    provider respondeu); a vaga da sonda half-open é sempre devolvida.
+
     Args:
         max_retries: Número máximo de tentativas
-        backoff: Fator de backoff (segundos)
+        backoff: Espera base (segundos)
         exceptions: Tupla de exceções que devem ser retentadas
+        max_backoff: Teto da espera entre tentativas (segundos)
+        breaker_key: Função que recebe os argumentos da chamada e retorna o nome do circuito
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        nome = func.__qualname__
+
+        def _circuito(args: Any, kwargs: Any) -> Optional[CircuitBreaker]:
+            return get_circuit_breaker(breaker_key(*args, **kwargs)) if breaker_key else None
+
+        def _tratar_falha(
+            e: BaseException,
+            attempt: int,
+            anterior: float,
+            circuito: Optional[CircuitBreaker]
+        ) -> Optional[float]:
+            """Retorna a espera antes da próxima tentativa ou None se deve propagar"""
+            if isinstance(e, CircuitOpenError):
+                _registrar(nome, "rejeitadas_circuito")
+                return None
+            if not is_retryable(e):
+                _registrar(nome, "fatais")
+                logger.error(f"Non-retryable error in {nome}: {e}")
+                if circuito is not None:
+                    # Provider respondeu (ex: 400, JSON inválido): não é instabilidade
+                    circuito.registrar_sucesso()
+                return None
+
+            if circuito is not None:
+                circuito.registrar_falha()
+            if attempt >= max_retries - 1:
+                _registrar(nome, "esgotadas")
+                logger.error(f"All {max_retries} attempts failed for {nome}")
+                return None
+
+            _registrar(nome, "retentativas")
+            wait_time = _decorrelated_jitter(backoff, anterior, max_backoff)
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                wait_time = min(max(wait_time, retry_after), max_backoff)
+            logger.warning(
+                f"Attempt {attempt + 1}/{max_retries} failed for {nome}: {e}. "
+                f"Retrying in {wait_time:.2f}s..."
+            )
+            return wait_time
+
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception = None
+            _registrar(nome, "chamadas")
+            circuito = _circuito(args, kwargs)
+            wait_time = backoff
             for attempt in range(max_retries):
+                sonda = None
                 try:
-                    return await func(*args, **kwargs)
+                    if circuito is not None:
+                        sonda = circuito.antes_da_chamada()
+                    resultado = await func(*args, **kwargs)
+                    if circuito is not None:
+                        circuito.registrar_sucesso()
+                    return resultado
                 except exceptions as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        wait_time = backoff * (2 ** attempt)
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed for {func.__name__}: {e}. "
-                            f"Retrying in {wait_time}s..."
-                        )
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"All {max_retries} attempts failed for {func.__name__}")
-            raise last_exception
-        
+                    wait_time = _tratar_falha(e, attempt, wait_time, circuito)
+                    if wait_time is None:
+                        raise
+                finally:
+                    # Cancelamento ou exceção fora de `exceptions` durante a sonda
+                    if circuito is not None:
+                        circuito.liberar_sonda(sonda)
+                await asyncio.sleep(wait_time)
+
         @functools.wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception = None
+            _registrar(nome, "chamadas")
+            circuito = _circuito(args, kwargs)
+            wait_time = backoff
             for attempt in range(max_retries):
+                sonda = None
                 try:
-                    return func(*args, **kwargs)
+                    if circuito is not None:
+                        sonda = circuito.antes_da_chamada()
+                    resultado = func(*args, **kwargs)
+                    if circuito is not None:
+                        circuito.registrar_sucesso()
+                    return resultado
                 except exceptions as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        wait_time = backoff * (2 ** attempt)
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{max_retries} failed for {func.__name__}: {e}. "
-                            f"Retrying in {wait_time}s..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        logger.error(f"All {max_retries} attempts failed for {func.__name__}")
-            raise last_exception
+                    wait_time = _tratar_falha(e, attempt, wait_time, circuito)
+                    if wait_time is None:
+                        raise
+                finally:
+                    if circuito is not None:
+                        circuito.liberar_sonda(sonda)
+                time.sleep(wait_time)
         
         # Retorna wrapper apropriado baseado se função é async
         if asyncio.iscoroutinefunction(func):
@@ -0,0 +1,131 @@
+"""
+Cache em disco endereçado por conteúdo, com expiração (TTL) e limite de tamanho.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.utils.logger import setup_logger
+
+
+def hash_conteudo(*partes: Any) -> str:
+    """
+    Gera chave SHA-256 estável para uma sequência de valores serializáveis.
+
+    Args:
+        *partes: Valores que compõem a chave (strings, números, dicts...)
+
+    Returns:
+        Hash hexadecimal
+    """
+    payload = json.dumps(partes, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Cache chave→JSON persistido em arquivos, um arquivo por entrada.
+
+    - Entradas mais antigas que `ttl_seconds` são tratadas como ausentes e removidas.
+    - Leituras atualizam o mtime do arquivo, então a remoção por excesso de
+      entradas (`max_entries`) descarta as menos usadas recentemente (LRU).
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = setup_logger("DiskCache")
+        self._lock = threading.Lock()
+        self._num_entradas: Optional[int] = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, chave: str) -> Path:
+        return self.directory / chave[:2] / f"{chave}.json"
+
+    def get(self, chave: str) -> Optional[Dict[str, Any]]:
+        """Retorna o valor armazenado ou None se ausente/expirado/corrompido"""
+        path = self._path(chave)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                registro = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Entrada de cache ilegível {path.name}: {e}")
+            self._remover(path)
+            return None
+
+        if self.ttl_seconds and time.time() - registro.get("criado_em", 0) > self.ttl_seconds:
+            self._remover(path)
+            return None
+
+        # Marca uso recente para a política LRU
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return registro.get("valor")
+
+    def set(self, chave: str, valor: Dict[str, Any]) -> None:
+        """Grava o valor de forma atômica e aplica o limite de entradas"""
+        path = self._path(chave)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        nova = not path.exists()
+
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"criado_em": time.time(), "valor": valor}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+        if nova:
+            with self._lock:
+                if self._num_entradas is not None:
+                    self._num_entradas += 1
+            self._aplicar_limite()
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._num_entradas is None:
+                self._num_entradas = sum(1 for _ in self.directory.glob("*/*.json"))
+            return self._num_entradas
+
+    def _remover(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if self._num_entradas is not None:
+                self._num_entradas -= 1
+
+    def _aplicar_limite(self) -> None:
+        """Remove entradas menos usadas recentemente acima de max_entries"""
+        if not self.max_entries or len(self) <= self.max_entries:
+            return
+
+        arquivos = []
+        for p in self.directory.glob("*/*.json"):
+            try:
+                arquivos.append((p.stat().st_mtime, p))
+            except FileNotFoundError:
+                continue
+        arquivos.sort()
+
+        # Remove um pouco além do limite para não varrer o diretório a cada escrita
+        excesso = len(arquivos) - int(self.max_entries * 0.9)
+        for _, p in arquivos[:max(0, excesso)]:
+            self._remover(p)
+
+        with self._lock:
+            self._num_entradas = None
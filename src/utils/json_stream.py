@@ -0,0 +1,61 @@
+"""
+Detecção incremental do fim de um objeto JSON em texto recebido por streaming.
+"""
+import json
+from typing import Optional
+
+
+class IncrementalJSONScanner:
+    """
+    Acumula trechos de texto e detecta quando o primeiro objeto JSON de nível
+    superior fecha, respeitando strings e escapes. Texto antes do objeto
+    (ex: cerca ```json) é ignorado; candidatos que não parseiam são descartados
+    e a varredura continua.
+    """
+
+    def __init__(self):
+        self.texto = ""
+        self._pos = 0
+        self._inicio = -1
+        self._profundidade = 0
+        self._em_string = False
+        self._escape = False
+
+    def feed(self, trecho: str) -> Optional[str]:
+        """
+        Adiciona um trecho e retorna o texto do objeto JSON assim que ele fecha
+        (None enquanto o objeto estiver incompleto).
+        """
+        self.texto += trecho
+        texto = self.texto
+
+        for i in range(self._pos, len(texto)):
+            c = texto[i]
+            if self._em_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._em_string = False
+            elif c == '"':
+                if self._inicio >= 0:
+                    self._em_string = True
+            elif c == "{":
+                if self._inicio < 0:
+                    self._inicio = i
+                self._profundidade += 1
+            elif c == "}" and self._inicio >= 0:
+                self._profundidade -= 1
+                if self._profundidade == 0:
+                    candidato = texto[self._inicio:i + 1]
+                    self._inicio = -1
+                    try:
+                        json.loads(candidato)
+                    except json.JSONDecodeError:
+                        continue
+                    self._pos = i + 1
+                    return candidato
+
+        self._pos = len(texto)
+        return None
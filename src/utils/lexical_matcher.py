@@ -0,0 +1,90 @@
+"""
+Casamento lexical de listas de termos por palavra inteira, em uma passada.
+"""
+import itertools
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Palavra = sequência de letras/dígitos Unicode ("seção", "você", "2")
+_PALAVRA_RE = re.compile(r"\w+")
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Palavras do texto em minúsculas (casefold), na ordem em que aparecem"""
+    return _PALAVRA_RE.findall(texto.casefold())
+
+
+def formas_plurais(palavra: str) -> Set[str]:
+    """
+    A palavra e seus plurais regulares do português: +s (dívidas,
+    critérios), +es após r/z/s, -ão -> -ões/-ães/-ãos, vogal + l -> is e
+    -m -> -ns. Palavras com dígitos ("2") ficam como estão.
+    """
+    formas = {palavra}
+    if not palavra.isalpha():
+        return formas
+    formas.add(palavra + "s")
+    if palavra[-1] in "rzs":
+        formas.add(palavra + "es")
+    if palavra.endswith("ão"):
+        formas.update(palavra[:-2] + sufixo for sufixo in ("ões", "ães", "ãos"))
+    if len(palavra) > 2 and palavra[-1] == "l" and palavra[-2] in "aeou":
+        formas.add(palavra[:-1] + "is")
+    if palavra[-1] == "m":
+        formas.add(palavra[:-1] + "ns")
+    return formas
+
+
+class LexicalMatcher:
+    """
+    Índice de termos (uma ou mais palavras) agrupados por categoria.
+
+    Os termos são tokenizados uma única vez na construção; cada texto é
+    tokenizado uma vez e cada posição consulta apenas os n-gramas com
+    tamanho de algum termo. O custo não cresce com o número de termos e o
+    casamento respeita limites de palavra ("seu" não casa em "museu",
+    "pep" não casa em "pepino"). Com plurais=True cada palavra do termo
+    também casa com seus plurais regulares ("critério" casa "critérios",
+    "conforme política" casa "conforme políticas"), indexados na construção.
+    """
+
+    def __init__(self, categorias: Dict[str, Iterable[str]], plurais: bool = True):
+        """
+        Args:
+            categorias: nome da categoria -> termos (sem distinção de caixa;
+                termos com várias palavras casam com qualquer espaçamento
+                ou pontuação entre elas)
+            plurais: Casa também os plurais regulares (ver formas_plurais)
+        """
+        self.categorias = list(categorias)
+        self._indice: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+        for categoria, termos in categorias.items():
+            for termo in termos:
+                palavras = tokenizar(termo)
+                if not palavras:
+                    raise ValueError(f"Termo sem palavras na categoria '{categoria}': {termo!r}")
+                formas = [formas_plurais(p) if plurais else {p} for p in palavras]
+                for chave in itertools.product(*formas):
+                    entradas = self._indice.setdefault(chave, [])
+                    if (categoria, termo) not in entradas:
+                        entradas.append((categoria, termo))
+        self._tamanhos = sorted({len(chave) for chave in self._indice})
+
+    def encontrar(self, texto: str) -> Dict[str, Set[str]]:
+        """Termos distintos encontrados no texto, por categoria"""
+        encontrados: Dict[str, Set[str]] = {categoria: set() for categoria in self.categorias}
+        tokens = tokenizar(texto)
+        indice = self._indice
+
+        for i in range(len(tokens)):
+            for n in self._tamanhos:
+                if i + n > len(tokens):
+                    break
+                for categoria, termo in indice.get(tuple(tokens[i:i + n]), ()):
+                    encontrados[categoria].add(termo)
+
+        return encontrados
+
+    def contar(self, texto: str) -> Dict[str, int]:
+        """Quantidade de termos distintos encontrados no texto, por categoria"""
+        return {categoria: len(termos) for categoria, termos in self.encontrar(texto).items()}
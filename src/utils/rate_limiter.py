@@ -0,0 +1,161 @@
+"""
+Limitador de taxa token-bucket compartilhado no processo.
+
+Cada par (provider, modelo) tem um único limitador com dois baldes:
+requisições/minuto e tokens/minuto. ModelExecutor e SemanticISRAuditorTool
+adquirem do mesmo limitador, então a concorrência somada das duas pontas
+respeita os limites do provider em vez de disparar 429s.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from src.utils.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket com reserva: cada aquisição debita os baldes imediatamente
+    (podendo ficar negativos) e espera o tempo necessário para o saldo voltar
+    a zero. Isso atende chamadores síncronos e assíncronos na ordem de chegada.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        nome: str = ""
+    ):
+        """
+        Args:
+            requests_per_minute: Limite de requisições/minuto (None ou 0 = sem limite)
+            tokens_per_minute: Limite de tokens/minuto (None ou 0 = sem limite)
+            nome: Identificação do limitador nas métricas
+        """
+        self.nome = nome
+        self.rpm = requests_per_minute or None
+        self.tpm = tokens_per_minute or None
+        self._lock = threading.Lock()
+        self._ultimo = time.monotonic()
+
+        # Baldes começam cheios (capacidade de 1 minuto)
+        self._saldo_req = float(self.rpm or 0)
+        self._saldo_tok = float(self.tpm or 0)
+
+        self.aquisicoes = 0
+        self.esperas = 0
+        self.espera_total_s = 0.0
+        self.espera_max_s = 0.0
+
+    @property
+    def ativo(self) -> bool:
+        return bool(self.rpm or self.tpm)
+
+    def _reservar(self, tokens: int) -> float:
+        """Debita os baldes e retorna quanto esperar (segundos)"""
+        with self._lock:
+            self.aquisicoes += 1
+            if not self.ativo:
+                return 0.0
+
+            agora = time.monotonic()
+            decorrido = agora - self._ultimo
+            self._ultimo = agora
+
+            espera = 0.0
+            if self.rpm:
+                taxa = self.rpm / 60.0
+                self._saldo_req = min(float(self.rpm), self._saldo_req + decorrido * taxa) - 1
+                if self._saldo_req < 0:
+                    espera = max(espera, -self._saldo_req / taxa)
+            if self.tpm:
+                taxa = self.tpm / 60.0
+                self._saldo_tok = min(float(self.tpm), self._saldo_tok + decorrido * taxa) - tokens
+                if self._saldo_tok < 0:
+                    espera = max(espera, -self._saldo_tok / taxa)
+
+            if espera > 0:
+                self.esperas += 1
+                self.espera_total_s += espera
+                self.espera_max_s = max(self.espera_max_s, espera)
+            return espera
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """Aguarda (sem bloquear o event loop) até haver capacidade. Retorna a espera."""
+        espera = self._reservar(tokens)
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+    def acquire_sync(self, tokens: int = 0) -> float:
+        """Versão bloqueante de acquire para chamadores síncronos"""
+        espera = self._reservar(tokens)
+        if espera > 0:
+            time.sleep(espera)
+        return espera
+
+    def ajustar(self, delta_tokens: int) -> None:
+        """Corrige o balde de tokens com o uso real (real - estimado)"""
+        if not self.tpm or not delta_tokens:
+            return
+        with self._lock:
+            self._saldo_tok -= delta_tokens
+
+    def stats(self) -> Dict[str, float]:
+        """Métricas de espera: tempo alto aqui indica execução limitada pela taxa"""
+        with self._lock:
+            return {
+                "rpm": self.rpm or 0,
+                "tpm": self.tpm or 0,
+                "aquisicoes": self.aquisicoes,
+                "esperas": self.esperas,
+                "espera_total_s": self.espera_total_s,
+                "espera_max_s": self.espera_max_s,
+                "espera_media_s": self.espera_total_s / self.aquisicoes if self.aquisicoes else 0.0,
+            }
+
+
+_limitadores: Dict[Tuple[str, str], TokenBucketRateLimiter] = {}
+_registro_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str) -> TokenBucketRateLimiter:
+    """
+    Retorna o limitador do processo para (provider, modelo), criando-o com os
+    limites de Settings na primeira chamada.
+
+    RATE_LIMIT_OVERRIDES tem precedência sobre os limites padrão, com chaves
+    no formato "provider:modelo" (ex: {"openai:gpt-4o-mini": {"rpm": 500, "tpm": 200000}}).
+    """
+    chave = (provider, model)
+    with _registro_lock:
+        limitador = _limitadores.get(chave)
+        if limitador is None:
+            override = settings.RATE_LIMIT_OVERRIDES.get(f"{provider}:{model}", {})
+            limitador = TokenBucketRateLimiter(
+                requests_per_minute=override.get("rpm", settings.RATE_LIMIT_REQUESTS_PER_MINUTE),
+                tokens_per_minute=override.get("tpm", settings.RATE_LIMIT_TOKENS_PER_MINUTE),
+                nome=f"{provider}:{model}"
+            )
+            _limitadores[chave] = limitador
+            if limitador.ativo:
+                logger.info(
+                    f"Rate limiter {limitador.nome}: {limitador.rpm or '∞'} req/min, "
+                    f"{limitador.tpm or '∞'} tokens/min"
+                )
+        return limitador
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    """Métricas de todos os limitadores criados no processo"""
+    with _registro_lock:
+        limitadores = list(_limitadores.values())
+    return {l.nome: l.stats() for l in limitadores}
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa grosseira de tokens (~4 caracteres por token)"""
+    return len(texto) // 4 + 1
@@ -0,0 +1,93 @@
+"""
+Legibilidade Flesch nativa para português (sem textstat/pyphen/cmudict).
+
+Calcula Flesch-Kincaid Grade e Flesch Reading Ease a partir de uma única
+contagem de frases, palavras e sílabas. Frases e palavras seguem as mesmas
+regras do textstat (as duas métricas ficam comparáveis com as do
+AccessibilityService); as sílabas vêm de núcleos vocálicos com regras de
+ditongo do português, em vez de dicionários de hifenização em inglês.
+"""
+import re
+from functools import lru_cache
+from typing import Dict
+
+# Mesmas regras do textstat: frase = trecho até . ! ? (frases com até
+# 2 palavras são ignoradas); palavra = token após remover pontuação
+_FRASE_RE = re.compile(r"\b[^.!?]+[.!?]*")
+_PONTUACAO_RE = re.compile(r"[^\w\s]")
+# Três tokens com letra/dígito (tokens só de pontuação não contam como palavra)
+_TRES_PALAVRAS_RE = re.compile(r"(?:[^\w\s]*\w\S*\s+(?:[^\w\s]+\s+)*){2}[^\w\s]*\w")
+
+_VOGAIS = frozenset("aeiouyáéíóúâêôãõàü")
+_NASAIS = frozenset("ãõ")
+
+
+@lru_cache(maxsize=65536)
+def contar_silabas(palavra: str) -> int:
+    """
+    Sílabas de uma palavra em português (heurística por núcleos vocálicos).
+
+    Cada grupo de vogais conta um núcleo por vogal, exceto semivogais:
+    i/u átonos depois de um núcleo (ditongo decrescente: "dinheiro",
+    "ouvir"), e/o depois de ã/õ (ditongo nasal: "mãe", "ações") e o u de
+    qu/gu antes de vogal ("qualquer", "guerra"). Vogais acentuadas são
+    sempre núcleo ("saúde", "país"). Palavras sem vogal (números, siglas)
+    contam 1 sílaba.
+    """
+    palavra = palavra.lower()
+    silabas = 0
+    tem_nucleo = False
+    anterior = ""
+
+    for i, c in enumerate(palavra):
+        if c not in _VOGAIS:
+            tem_nucleo = False
+            anterior = c
+            continue
+
+        proximo = palavra[i + 1] if i + 1 < len(palavra) else ""
+        if c in "uü" and anterior in ("q", "g") and proximo in _VOGAIS:
+            # u de qu/gu: não forma sílaba própria
+            pass
+        elif tem_nucleo and (c in "iu" or (anterior in _NASAIS and c in "eo")):
+            # Semivogal: mesma sílaba do núcleo anterior
+            pass
+        else:
+            silabas += 1
+            tem_nucleo = True
+        anterior = c
+
+    return max(1, silabas)
+
+
+def legibilidade(texto: str) -> Dict[str, float]:
+    """
+    Flesch-Kincaid Grade e Flesch Reading Ease em uma passada de contagem.
+
+    Returns:
+        Dict com nivel_leitura (grade), facilidade_leitura (0-100), frases,
+        palavras e silabas. Texto sem palavras resulta em 0.0 nas duas
+        métricas (mesmo comportamento do textstat).
+    """
+    palavras = _PONTUACAO_RE.sub("", texto).split()
+    silabas = sum(map(contar_silabas, palavras))
+
+    frases = _FRASE_RE.findall(texto)
+    ignoradas = sum(1 for f in frases if not _TRES_PALAVRAS_RE.search(f))
+    num_frases = max(1, len(frases) - ignoradas) if texto else 0
+
+    if not palavras or not num_frases:
+        nivel = facilidade = 0.0
+    else:
+        palavras_por_frase = len(palavras) / num_frases
+        silabas_por_palavra = silabas / len(palavras)
+        nivel = (0.39 * palavras_por_frase) + (11.8 * silabas_por_palavra) - 15.59
+        facilidade = 206.835 - 1.015 * palavras_por_frase - 84.6 * silabas_por_palavra
+
+    return {
+        "nivel_leitura": nivel,
+        "facilidade_leitura": facilidade,
+        "frases": num_frases,
+        "palavras": len(palavras),
+        "silabas": silabas,
+    }
@@ -0,0 +1,202 @@
+"""
+Local stub server implementing the Anthropic Message Batches and OpenAI
+Batch/Files endpoints used by BatchExecutor.
+
+Every request in a batch is answered with `resposta_texto`. Batches report
+themselves as in progress until `liberar()` is called (or for the first
+`polls_ate_concluir` status checks), which lets tests simulate a crash
+while a batch is still running.
+"""
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class BatchStubServer:
+    """Threaded HTTP server with in-memory batch state."""
+
+    def __init__(self, resposta_texto: str, polls_ate_concluir: int = 1):
+        self.resposta_texto = resposta_texto
+        self.polls_ate_concluir = polls_ate_concluir
+        self.liberado = polls_ate_concluir is not None
+        self.batches: Dict[str, Dict] = {}
+        self.arquivos: Dict[str, str] = {}
+        self.criacoes = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _corpo(self) -> bytes:
+                tamanho = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(tamanho) if tamanho else b""
+
+            def _responder(self, status: int, payload, content_type: str = "application/json"):
+                dados = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_POST(self):
+                corpo = self._corpo()
+                if self.path.startswith("/v1/messages/batches"):
+                    requests = json.loads(corpo)["requests"]
+                    self._responder(200, stub._criar_batch([r["custom_id"] for r in requests], "anthropic"))
+                elif self.path == "/v1/files":
+                    linhas = re.findall(rb'\{"custom_id".*\}', corpo)
+                    file_id = f"file-in-{len(stub.arquivos)}"
+                    stub.arquivos[file_id] = b"\n".join(linhas).decode("utf-8")
+                    self._responder(200, {
+                        "id": file_id, "object": "file", "bytes": len(corpo), "created_at": 0,
+                        "filename": "sextant_batch.jsonl", "purpose": "batch", "status": "processed",
+                    })
+                elif self.path == "/v1/batches":
+                    input_file_id = json.loads(corpo)["input_file_id"]
+                    custom_ids = [json.loads(l)["custom_id"] for l in stub.arquivos[input_file_id].splitlines()]
+                    self._responder(200, stub._criar_batch(custom_ids, "openai"))
+                else:
+                    self._responder(404, {"error": {"message": f"unknown path {self.path}"}})
+
+            def do_GET(self):
+                m = re.match(r"^/v1/messages/batches/([^/]+)(/results)?$", self.path.split("?")[0])
+                if m:
+                    batch_id, resultados = m.group(1), m.group(2)
+                    if resultados:
+                        self._responder(200, stub._resultados_anthropic(batch_id), "application/binary")
+                    else:
+                        self._responder(200, stub._status_anthropic(batch_id, self._base_url()))
+                    return
+
+                m = re.match(r"^/v1/batches/([^/]+)$", self.path)
+                if m:
+                    self._responder(200, stub._status_openai(m.group(1)))
+                    return
+
+                m = re.match(r"^/v1/files/([^/]+)/content$", self.path)
+                if m:
+                    self._responder(200, stub.arquivos[m.group(1)].encode("utf-8"), "application/octet-stream")
+                    return
+
+                self._responder(404, {"error": {"message": f"unknown path {self.path}"}})
+
+            def _base_url(self) -> str:
+                return f"http://{self.headers.get('Host')}"
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "BatchStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def bloquear(self) -> None:
+        """Keep every batch in progress until `liberar()`."""
+        self.liberado = False
+
+    def liberar(self) -> None:
+        self.liberado = True
+
+    # ========== STATE ==========
+
+    def _criar_batch(self, custom_ids: List[str], provider: str) -> Dict:
+        with self.lock:
+            self.criacoes += 1
+            batch_id = f"{'msgbatch' if provider == 'anthropic' else 'batch'}_{self.criacoes}"
+            self.batches[batch_id] = {"custom_ids": custom_ids, "polls": 0}
+        if provider == "anthropic":
+            return self._objeto_anthropic(batch_id, "in_progress", None)
+        return self._objeto_openai(batch_id, "in_progress")
+
+    def _concluido(self, batch_id: str) -> bool:
+        with self.lock:
+            batch = self.batches[batch_id]
+            batch["polls"] += 1
+            return self.liberado and batch["polls"] > (self.polls_ate_concluir or 0)
+
+    def _status_anthropic(self, batch_id: str, base_url: str) -> Dict:
+        if self.batches[batch_id].get("ended") or self._concluido(batch_id):
+            self.batches[batch_id]["ended"] = True
+            return self._objeto_anthropic(
+                batch_id, "ended", f"{base_url}/v1/messages/batches/{batch_id}/results"
+            )
+        return self._objeto_anthropic(batch_id, "in_progress", None)
+
+    def _status_openai(self, batch_id: str) -> Dict:
+        batch = self.batches[batch_id]
+        if batch.get("output_file_id") or self._concluido(batch_id):
+            if not batch.get("output_file_id"):
+                output_id = f"file-out-{batch_id}"
+                self.arquivos[output_id] = "\n".join(
+                    json.dumps({
+                        "id": f"req_{i}",
+                        "custom_id": cid,
+                        "response": {
+                            "status_code": 200,
+                            "body": {
+                                "choices": [{"message": {"role": "assistant", "content": self.resposta_texto}}],
+                                "usage": {"prompt_tokens": 100, "completion_tokens": 10},
+                            },
+                        },
+                        "error": None,
+                    })
+                    for i, cid in enumerate(batch["custom_ids"])
+                )
+                batch["output_file_id"] = output_id
+            return self._objeto_openai(batch_id, "completed", batch["output_file_id"])
+        return self._objeto_openai(batch_id, "in_progress")
+
+    def _resultados_anthropic(self, batch_id: str) -> bytes:
+        linhas = [
+            json.dumps({
+                "custom_id": cid,
+                "result": {
+                    "type": "succeeded",
+                    "message": {
+                        "id": f"msg_{i}", "type": "message", "role": "assistant", "model": "stub",
+                        "content": [{"type": "text", "text": self.resposta_texto}],
+                        "stop_reason": "end_turn", "stop_sequence": None,
+                        "usage": {"input_tokens": 100, "output_tokens": 10},
+                    },
+                },
+            })
+            for i, cid in enumerate(self.batches[batch_id]["custom_ids"])
+        ]
+        return "\n".join(linhas).encode("utf-8")
+
+    def _objeto_anthropic(self, batch_id: str, status: str, results_url: Optional[str]) -> Dict:
+        n = len(self.batches[batch_id]["custom_ids"])
+        return {
+            "id": batch_id, "type": "message_batch", "processing_status": status,
+            "request_counts": {
+                "processing": 0 if status == "ended" else n, "succeeded": n if status == "ended" else 0,
+                "errored": 0, "canceled": 0, "expired": 0,
+            },
+            "results_url": results_url, "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z", "ended_at": None,
+            "archived_at": None, "cancel_initiated_at": None,
+        }
+
+    def _objeto_openai(self, batch_id: str, status: str, output_file_id: Optional[str] = None) -> Dict:
+        return {
+            "id": batch_id, "object": "batch", "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in-0", "completion_window": "24h", "status": status,
+            "created_at": 0, "output_file_id": output_file_id, "error_file_id": None,
+        }
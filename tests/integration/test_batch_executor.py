@@ -0,0 +1,121 @@
+"""
+Integration tests for BatchExecutor against a local batch stub server.
+"""
+import asyncio
+import pytest
+from anthropic import Anthropic
+from openai import OpenAI
+from src.services.batch_executor import BatchExecutor, custom_id_do_caso
+from src.services.model_executor import ModelExecutor
+from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente, Decisao
+from tests.integration.batch_stub_server import BatchStubServer
+
+RESPOSTA = '{"decisao": "APROVADA", "score": 780, "explicacao_acessivel": "Seu crédito foi aprovado."}'
+
+
+def _create_itens(n: int = 3):
+    itens = []
+    for i in range(n):
+        cliente = Cliente(cliente_id=f"PF_{i:03d}", tipo=TipoCliente.PF, score_atual=780, renda_mensal=5000.0)
+        caso = CasoTeste(
+            caso_id=f"NEEDLE_{i:03d}",
+            tipo_cenario=TipoCaso.NEEDLE,
+            subtipo="test",
+            descricao="Test case",
+            cliente_ref=cliente.cliente_id,
+            input={"tipo": "PF"},
+            output_esperado={"decisao": "APROVADA"}
+        )
+        itens.append((cliente, caso))
+    return itens
+
+
+def _create_executor(provider: str, url: str) -> ModelExecutor:
+    if provider == "anthropic":
+        client = Anthropic(api_key="test", base_url=url, max_retries=0)
+    else:
+        client = OpenAI(api_key="test", base_url=f"{url}/v1", max_retries=0)
+    return ModelExecutor(
+        client=client,
+        model_name="stub-model",
+        prompt_template="SYSTEM",
+        provider=provider,
+        use_mock=False
+    )
+
+
+@pytest.mark.parametrize("provider", ["anthropic", "openai"])
+def test_lote_completo(provider, tmp_path):
+    """Submits one batch, polls until done and returns parsed responses in order."""
+    with BatchStubServer(RESPOSTA, polls_ate_concluir=2) as stub:
+        executor = _create_executor(provider, stub.url)
+        batch = BatchExecutor(executor, estado_dir=tmp_path, poll_interval=0.01)
+
+        respostas = asyncio.run(batch.executar(_create_itens(), "POLITICAS"))
+
+    assert stub.criacoes == 1
+    assert len(respostas) == 3
+    assert all(r["resposta_modelo"].decisao == Decisao.APROVADA for r in respostas)
+    assert all(r["modo"] == "batch" for r in respostas)
+    assert executor.stats_tokens()["input_tokens"] == 300
+    assert list(tmp_path.glob("*.json")) == []
+
+
+@pytest.mark.parametrize("provider", ["anthropic", "openai"])
+def test_retoma_lote_apos_crash(provider, tmp_path):
+    """A run interrupted while polling resumes the same batch instead of resubmitting."""
+    itens = _create_itens()
+    with BatchStubServer(RESPOSTA) as stub:
+        stub.bloquear()
+        executor = _create_executor(provider, stub.url)
+
+        interrompido = BatchExecutor(executor, estado_dir=tmp_path, poll_interval=0.01, max_espera=0.05)
+        with pytest.raises(TimeoutError):
+            asyncio.run(interrompido.executar(itens, "POLITICAS"))
+
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        stub.liberar()
+        retomado = BatchExecutor(executor, estado_dir=tmp_path, poll_interval=0.01)
+        respostas = asyncio.run(retomado.executar(itens, "POLITICAS"))
+
+    assert stub.criacoes == 1
+    assert retomado.stats["retomado"] is True
+    assert all(r["resposta_json"]["decisao"] == "APROVADA" for r in respostas)
+
+
+def test_batch_id_informado_valida_casos(tmp_path):
+    """An explicit batch_id resumes by caso_id and rejects cases the batch never contained."""
+    itens = _create_itens(3)
+    with BatchStubServer(RESPOSTA) as stub:
+        stub.bloquear()
+        executor = _create_executor("anthropic", stub.url)
+
+        interrompido = BatchExecutor(executor, estado_dir=tmp_path, poll_interval=0.01, max_espera=0.05)
+        with pytest.raises(TimeoutError):
+            asyncio.run(interrompido.executar(itens, "POLITICAS"))
+        batch_id = interrompido.stats["batch_id"]
+
+        # Lista alterada com um caso que não foi submetido: erro antes do polling
+        novo = _create_itens(4)[3]
+        with pytest.raises(ValueError, match="NEEDLE_003"):
+            asyncio.run(BatchExecutor(executor, estado_dir=tmp_path).executar(
+                [itens[0], novo], "POLITICAS", batch_id=batch_id
+            ))
+
+        # Subconjunto (ex: --resume já concluiu NEEDLE_000): cada resposta vai para o seu caso
+        stub.liberar()
+        retomado = BatchExecutor(executor, estado_dir=tmp_path, poll_interval=0.01)
+        respostas = asyncio.run(retomado.executar(itens[1:], "POLITICAS", batch_id=batch_id))
+
+    assert stub.criacoes == 1
+    assert len(respostas) == 2
+    assert all(r["resposta_json"]["decisao"] == "APROVADA" for r in respostas)
+    assert list(tmp_path.glob("*.json")) == []
+
+
+def test_custom_id_do_caso():
+    """custom_ids follow the caso_id and stay distinct after normalisation."""
+    assert custom_id_do_caso("NEEDLE_001") == "NEEDLE_001"
+    assert custom_id_do_caso("caso 1") != custom_id_do_caso("caso/1")
+    assert all(len(custom_id_do_caso(c)) <= 64 for c in ("x" * 100, "caso ç"))
@@ -5,10 +5,17 @@ import json
 
 # MOCK DEPENDENCIES BEFORE IMPORTING APP MODULES
 # This allows running tests even if openai/numpy are not installed in the environment
-mock_openai = MagicMock()
-sys.modules["openai"] = mock_openai
-mock_numpy = MagicMock()
-sys.modules["numpy"] = mock_numpy
+# Only stub what is missing so real packages are not shadowed for other test modules
+try:
+    import openai  # noqa: F401
+except ImportError:
+    mock_openai = MagicMock()
+    sys.modules["openai"] = mock_openai
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    mock_numpy = MagicMock()
+    sys.modules["numpy"] = mock_numpy
 
 # Now we can import the modules that use these dependencies
 try:
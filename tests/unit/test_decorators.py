@@ -0,0 +1,184 @@
+"""
+Unit tests for retry_with_backoff and the per-provider circuit breaker.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from src.utils import circuit_breaker as cb
+from src.utils import decorators
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.decorators import is_retryable, retry_after_seconds, retry_with_backoff
+
+
+class _HTTPError(Exception):
+    """Mimics SDK status errors: status_code plus a response with headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.fixture(autouse=True)
+def sem_espera(monkeypatch):
+    """Records sleeps instead of waiting and isolates process-wide registries."""
+    esperas = []
+
+    async def fake_async_sleep(segundos):
+        esperas.append(segundos)
+
+    monkeypatch.setattr(decorators.asyncio, "sleep", fake_async_sleep)
+    monkeypatch.setattr(decorators.time, "sleep", esperas.append)
+    monkeypatch.setattr(cb, "_circuitos", {})
+    monkeypatch.setattr(decorators, "_retry_stats", {})
+    return esperas
+
+
+class TestClassificacao:
+    """Tests for is_retryable and retry_after_seconds."""
+
+    @pytest.mark.parametrize("exc", [
+        _HTTPError(429), _HTTPError(500), _HTTPError(503), _HTTPError(408),
+        asyncio.TimeoutError(), ConnectionError("reset"),
+    ])
+    def test_retentaveis(self, exc):
+        assert is_retryable(exc)
+
+    @pytest.mark.parametrize("exc", [
+        _HTTPError(400), _HTTPError(401), _HTTPError(403),
+        json.JSONDecodeError("bad", "{", 0), ValueError("invalid"),
+        CircuitOpenError("open"),
+    ])
+    def test_fatais(self, exc):
+        assert not is_retryable(exc)
+
+    def test_retry_after(self):
+        assert retry_after_seconds(_HTTPError(429, {"retry-after": "7"})) == 7.0
+        assert retry_after_seconds(_HTTPError(429, {"retry-after-ms": "1500"})) == 1.5
+        assert retry_after_seconds(_HTTPError(429, {"retry-after": "soon"})) is None
+        assert retry_after_seconds(ValueError()) is None
+
+
+class TestRetryWithBackoff:
+    """Tests for the retry decorator."""
+
+    def test_nao_retenta_erro_fatal(self, sem_espera):
+        chamadas = []
+
+        @retry_with_backoff(max_retries=3, backoff=0.1)
+        def parse():
+            chamadas.append(1)
+            raise json.JSONDecodeError("bad", "{", 0)
+
+        with pytest.raises(json.JSONDecodeError):
+            parse()
+
+        assert len(chamadas) == 1
+        assert sem_espera == []
+        assert decorators.retry_stats()[parse.__qualname__]["fatais"] == 1
+
+    def test_jitter_limitado_e_retry_after(self, sem_espera):
+        erros = [_HTTPError(503), _HTTPError(429, {"retry-after": "5"})]
+
+        @retry_with_backoff(max_retries=3, backoff=0.1, max_backoff=10.0)
+        async def chamar():
+            if erros:
+                raise erros.pop(0)
+            return "ok"
+
+        assert asyncio.run(chamar()) == "ok"
+        assert 0.1 <= sem_espera[0] <= 0.3
+        assert sem_espera[1] == 5.0
+        assert decorators.retry_stats()[chamar.__qualname__]["retentativas"] == 2
+
+    def test_circuito_abre_e_falha_rapido(self, sem_espera):
+        chamadas = []
+
+        @retry_with_backoff(max_retries=2, backoff=0.1, breaker_key=lambda provider: provider)
+        async def chamar(provider):
+            chamadas.append(provider)
+            raise _HTTPError(503)
+
+        cb.get_circuit_breaker("anthropic", failure_threshold=4, cooldown_seconds=60.0)
+        for _ in range(2):
+            with pytest.raises(_HTTPError):
+                asyncio.run(chamar("anthropic"))
+        assert len(chamadas) == 4
+
+        # Open circuit: fails fast without reaching the provider
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(chamar("anthropic"))
+        assert len(chamadas) == 4
+
+        stats = cb.circuit_breaker_stats()["anthropic"]
+        assert stats["estado"] == CircuitBreaker.ABERTO
+        assert stats["rejeitadas"] == 1
+        assert decorators.retry_stats()[chamar.__qualname__]["rejeitadas_circuito"] == 1
+
+    def test_erro_fatal_na_sonda_fecha_circuito(self, sem_espera):
+        """A fatal error on the half-open probe must not leave the circuit stuck."""
+        respostas = [_HTTPError(400), "ok"]
+
+        @retry_with_backoff(max_retries=2, backoff=0.1, breaker_key=lambda provider: provider)
+        async def chamar(provider):
+            resposta = respostas.pop(0)
+            if isinstance(resposta, Exception):
+                raise resposta
+            return resposta
+
+        circuito = cb.get_circuit_breaker("openai", failure_threshold=1, cooldown_seconds=0.0)
+        circuito.registrar_falha()
+        assert circuito.estado == CircuitBreaker.SEMIABERTO
+
+        with pytest.raises(_HTTPError):
+            asyncio.run(chamar("openai"))
+
+        assert circuito.estado == CircuitBreaker.FECHADO
+        assert asyncio.run(chamar("openai")) == "ok"
+        assert circuito.rejeitadas == 0
+
+    def test_sonda_cancelada_libera_vaga(self, sem_espera):
+        """A cancelled probe gives its slot back so the next call can probe."""
+        @retry_with_backoff(max_retries=2, backoff=0.1, breaker_key=lambda provider: provider)
+        async def chamar(provider):
+            raise asyncio.CancelledError()
+
+        circuito = cb.get_circuit_breaker("openai", failure_threshold=1, cooldown_seconds=0.0)
+        circuito.registrar_falha()
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(chamar("openai"))
+
+        assert circuito.estado == CircuitBreaker.SEMIABERTO
+        circuito.antes_da_chamada()
+        assert circuito.rejeitadas == 0
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state transitions."""
+
+    def test_sonda_apos_cooldown(self):
+        circuito = CircuitBreaker("openai", failure_threshold=2, cooldown_seconds=0.0)
+        circuito.registrar_falha()
+        circuito.registrar_falha()
+        assert circuito.aberturas == 1
+
+        # Cool-down elapsed: a single probe goes through
+        assert circuito.estado == CircuitBreaker.SEMIABERTO
+        circuito.antes_da_chamada()
+        circuito.registrar_sucesso()
+        assert circuito.estado == CircuitBreaker.FECHADO
+
+    def test_sonda_falha_reabre(self):
+        circuito = CircuitBreaker("openai", failure_threshold=1, cooldown_seconds=60.0)
+        circuito.registrar_falha()
+        with pytest.raises(CircuitOpenError):
+            circuito.antes_da_chamada()
+
+        circuito.cooldown_seconds = 0.0
+        circuito.antes_da_chamada()
+        circuito.cooldown_seconds = 60.0
+        circuito.registrar_falha()
+        assert circuito.estado == CircuitBreaker.ABERTO
+        assert circuito.aberturas == 2
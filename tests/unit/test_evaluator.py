@@ -2,6 +2,7 @@
 Unit tests for CaseEvaluator functionality.
 """
 import pytest
+from src.services.accessibility import AccessibilityService
 from src.services.evaluator import CaseEvaluator
 from src.models.domain import RespostaModelo, CasoTeste, TipoCaso, Decisao
 
@@ -68,6 +69,23 @@ class TestCaseEvaluator:
         assert tem_explicacao is True
         assert eh_acessivel is False
 
+    def test_validar_acessibilidade_palavra_inteira(self):
+        """Test that terms only match whole words (no hits inside other words)."""
+        explicacao = "O museu recusou o pepino: o plano kycx expira em 2030 para todos os clientes."
+
+        termos = self.evaluator.matcher_lexico.contar(explicacao)
+
+        assert termos == {"jargao": 0, "simples": 0, "tratamento": 0}
+
+    def test_validar_acessibilidade_plurais(self):
+        """Test that inflected plurals still count as jargon and plain words."""
+        explicacao = "Pelos critérios internos, suas dívidas e parcelas em atraso impedem novas contas."
+
+        termos = self.evaluator.matcher_lexico.contar(explicacao)
+
+        assert termos["jargao"] == 1
+        assert termos["simples"] >= 4
+
     def test_validar_acessibilidade_vazia(self):
         """Test accessibility validation with empty explanation."""
         tem_explicacao, eh_acessivel, score = self.evaluator._validar_acessibilidade("")
@@ -156,6 +174,16 @@ class TestCaseEvaluator:
         assert resultado.eh_acessivel is True
         assert resultado.tem_rastreamento is True
 
+    def test_avaliar_preenche_legibilidade(self):
+        """Test that readability scores are carried on the result."""
+        evaluator = CaseEvaluator(self.matriz, AccessibilityService("nativo"))
+
+        resultado = evaluator.avaliar("TEST_001", "PF_001", self._create_resposta(), self._create_caso())
+
+        assert resultado.nivel_leitura is not None
+        assert resultado.facilidade_leitura is not None
+        assert resultado.palavras_explicacao == 9
+
     def test_avaliar_caso_fail(self):
         """Test full case evaluation with FAIL result."""
         resposta = self._create_resposta(
@@ -193,3 +221,94 @@ class TestCaseEvaluator:
 
         assert isr >= 0.85
         assert isr <= 1.0
+
+
+class TestAvaliarLote:
+    """Tests for the columnar batch evaluation path."""
+
+    EXPLICACOES = [
+        None,
+        "",
+        "Curta demais.",
+        "Seu crédito foi aprovado!",
+        "Seu score de crédito é 750, que é muito bom. O banco aprova a partir de 700.",
+        "Score 750 > threshold 700. Conforme Seção 2.2.2 do compliance e KYC.",
+        "Você tem uma dívida em atraso de R$ 300 e por isso a parcela mínima foi negada pelo banco.",
+    ]
+
+    def _itens(self, n: int, seed: int = 42):
+        import random
+        rng = random.Random(seed)
+        passo_ok = {"passo": 1, "nome": "n", "resultado": "r", "detalhe": "d", "impacto": "i"}
+        itens = []
+        for i in range(n):
+            rastreamento = [passo_ok if rng.random() < 0.8 else {"passo": 1} for _ in range(rng.randint(0, 7))]
+            resposta = RespostaModelo(
+                decisao=rng.choice(list(Decisao)),
+                score=rng.choice([None, 500, 750]),
+                confianca=rng.choice([0.0, 0.5, 0.81, 0.95]),
+                explicacao_acessivel=rng.choice(self.EXPLICACOES),
+                rastreamento=rastreamento,
+                motivo=rng.choice([None, "", "renda insuficiente"])
+            )
+            caso = CasoTeste(
+                caso_id=f"C{i}",
+                tipo_cenario=rng.choice(list(TipoCaso)),
+                subtipo="x",
+                descricao="d",
+                input={},
+                output_esperado=rng.choice([
+                    {}, {"decisao": "APROVADA"}, {"decisao": "recusada"},
+                    {"decisao": "NEGADA"}, {"decisao": "ANALISE_GERENCIAL"}, {"decisao": "OUTRA"}
+                ])
+            )
+            resposta_json = None
+            if rng.random() < 0.7:
+                resposta_json = {
+                    campo: valor for campo, valor in {
+                        "decisao": resposta.decisao.value,
+                        "score": resposta.score,
+                        "confianca_decisao": rng.choice([None, 0.9]),
+                        "explicacao_acessivel": rng.choice(self.EXPLICACOES + [123]),
+                        "rastreamento": rng.choice([rastreamento, [], "texto", None]),
+                        "campos_faltantes": rng.choice([None, []]),
+                        "confianca_isr": rng.choice([None, 0.95, 0.3, True, "alta"]),
+                    }.items() if rng.random() < 0.9
+                }
+            itens.append((caso.caso_id, f"PF_{i}", resposta, caso, resposta_json))
+        return itens
+
+    def test_paridade_com_avaliacao_por_caso(self):
+        evaluator = CaseEvaluator({"matriz": []}, AccessibilityService("nativo"))
+        itens = self._itens(600)
+
+        lote = evaluator.avaliar_lote(evaluator.colunas_lote(itens))
+
+        assert len(lote) == len(itens)
+        for (caso_id, cliente_id, resposta, caso, resposta_json), linha in zip(itens, lote.itertuples()):
+            esperado = evaluator.avaliar(caso_id, cliente_id, resposta, caso, resposta_json)
+            assert linha.caso_id == esperado.caso_id
+            assert linha.status == esperado.status
+            assert linha.pontos == esperado.pontos
+            assert linha.csr == esperado.isr_score
+            assert bool(linha.eh_acessivel) == esperado.eh_acessivel
+            assert bool(linha.tem_rastreamento) == esperado.tem_rastreamento
+            assert sorted(linha.vieses) == sorted(esperado.vieses_detectados)
+            assert linha.feedback == esperado.feedback
+            assert linha.discrepancia == esperado.discrepancia
+            assert linha.nivel_leitura == esperado.nivel_leitura
+            assert linha.palavras_explicacao == esperado.palavras_explicacao
+
+    def test_acessibilidade_pre_calculada_e_lote_vazio(self):
+        evaluator = CaseEvaluator({"matriz": []})
+        colunas = evaluator.colunas_lote(self._itens(50, seed=7))
+        completo = evaluator.avaliar_lote(colunas)
+
+        colunas["tem_explicacao"] = completo["tem_explicacao"]
+        colunas["eh_acessivel"] = completo["eh_acessivel"]
+        colunas["score_acessibilidade"] = completo["score_acessibilidade"]
+        sem_texto = evaluator.avaliar_lote(colunas.drop(columns=["explicacao"]))
+
+        assert sem_texto["pontos"].tolist() == completo["pontos"].tolist()
+        assert sem_texto["feedback"].tolist() == completo["feedback"].tolist()
+        assert evaluator.avaliar_lote(colunas.iloc[:0]).empty
@@ -0,0 +1,436 @@
+"""
+Unit tests for SemanticISRAuditorTool concurrent permutation scoring.
+"""
+import asyncio
+import json
+import math
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.logprob_cache import LogprobCache
+
+
+def _logprob_response(prob_yes: float):
+    top = [SimpleNamespace(token="Yes", logprob=math.log(prob_yes))]
+    return SimpleNamespace(choices=[SimpleNamespace(
+        logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+    )])
+
+
+class _SlowSyncCompletions:
+    """Sync chat.completions stand-in that tracks peak concurrency."""
+
+    def __init__(self, prob_yes: float, delay: float):
+        self.prob_yes = prob_yes
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def create(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        return _logprob_response(self.prob_yes)
+
+
+class _AsyncCompletions:
+    """AsyncOpenAI chat.completions stand-in with per-permutation probability and delay."""
+
+    def __init__(self, probs, delays=None):
+        self.probs = list(probs)
+        self.delays = list(delays) if delays is not None else [0.01] * len(self.probs)
+        self.calls = 0
+        self.completed = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        prompt = kwargs["messages"][1]["content"]
+        # Permutation index is encoded in the variation marker (original = 0)
+        index = int(prompt.split("[Variation ")[1].split("]")[0]) if "[Variation " in prompt else 0
+        await asyncio.sleep(self.delays[index])
+        self.completed += 1
+        return _logprob_response(self.probs[index])
+
+
+class _FailingCompletions(_AsyncCompletions):
+    """Fails the calls for the given permutation indices."""
+
+    def __init__(self, probs, failing):
+        super().__init__(probs)
+        self.failing = set(failing)
+
+    async def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        index = int(prompt.split("[Variation ")[1].split("]")[0]) if "[Variation " in prompt else 0
+        if index in self.failing:
+            self.calls += 1
+            raise RuntimeError("429 Too Many Requests")
+        return await super().create(**kwargs)
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+class TestConcurrentAudit:
+    """Tests for audit_async and the synchronous audit() wrapper."""
+
+    def test_audit_sync_paraleliza_permutacoes(self):
+        completions = _SlowSyncCompletions(prob_yes=0.99, delay=0.2)
+        tool = SemanticISRAuditorTool(_client(completions), num_permutations=6)
+
+        inicio = time.monotonic()
+        result = json.loads(tool.audit("Cliente com score 780", "APROVADO"))
+        duracao = time.monotonic() - inicio
+
+        assert completions.calls == 6
+        assert completions.peak == 6
+        assert duracao < 0.6
+        assert result["decision"] == "APROVADO"
+
+    def test_concorrencia_limitada(self):
+        completions = _SlowSyncCompletions(prob_yes=0.99, delay=0.05)
+        tool = SemanticISRAuditorTool(_client(completions), num_permutations=6, max_concurrency=2)
+
+        tool.audit("Cliente com score 780", "APROVADO")
+
+        assert completions.peak == 2
+
+    def test_audit_async_usa_cliente_async(self):
+        probs = [0.9, 0.85, 0.8, 0.88, 0.1, 0.9]
+        completions = _AsyncCompletions(probs)
+        tool = SemanticISRAuditorTool(client=None, async_client=_client(completions), num_permutations=6)
+
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert completions.calls == 6
+        assert result["decision"] == "BLOQUEADO"
+        assert result["metrics"]["P_Original"] == pytest.approx(0.9, abs=1e-4)
+        assert result["metrics"]["P_Min_Permutation"] == pytest.approx(0.1, abs=1e-4)
+
+    def test_audit_sync_dentro_de_loop_em_execucao(self):
+        completions = _SlowSyncCompletions(prob_yes=0.99, delay=0.0)
+        tool = SemanticISRAuditorTool(_client(completions), num_permutations=3)
+
+        async def chamar():
+            return tool.audit("contexto", "APROVADO")
+
+        assert json.loads(asyncio.run(chamar()))["decision"] == "APROVADO"
+
+    def test_decisao_igual_ao_calculo_escalar(self):
+        tool = SemanticISRAuditorTool(client=None, num_permutations=4)
+        probs = [0.7, 0.6, 0.65, 0.72]
+
+        result = tool._decide(np.array(probs))
+
+        q_lo_adj = max(min(probs), tool.PROB_FLOOR)
+        b2t = tool._kl_divergence_bernoulli(tool.target_confidence, q_lo_adj)
+        delta = tool._calculate_delta(sum(probs) / len(probs), probs)
+        assert result["metrics"]["ISR"] == pytest.approx(round(delta / b2t, 4))
+        assert result["decision"] == ("APROVADO" if delta / b2t >= 1.0 else "BLOQUEADO")
+
+    def test_erros_de_api_reportados_nas_metricas(self, tmp_path):
+        completions = _FailingCompletions(probs=[0.9] * 4, failing=[2])
+        log = tmp_path / "probs.jsonl"
+        tool = SemanticISRAuditorTool(
+            client=None, async_client=_client(completions), num_permutations=4, probability_log=log
+        )
+
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert result["metrics"]["API_Errors"] == 1
+        assert tool.call_stats["api_errors"] == 1
+        # The failed call is scored as the fallback, but logged as unscored
+        assert result["metrics"]["P_Min_Permutation"] == tool.API_ERROR_PROBABILITY
+        assert json.loads(log.read_text())["probs"] == [0.9, 0.9, None, 0.9]
+
+    def test_entrada_vazia(self):
+        tool = SemanticISRAuditorTool(client=None)
+        with pytest.raises(ValueError):
+            tool.audit("  ", "APROVADO")
+
+
+class TestAdaptiveAudit:
+    """Tests for adaptive permutation counts with early stopping."""
+
+    def _tool(self, completions, **kwargs):
+        return SemanticISRAuditorTool(
+            client=None, async_client=_client(completions), num_permutations=6, adaptive=True, **kwargs
+        )
+
+    def test_veto_antecipado_nao_inicia_chamadas(self):
+        completions = _AsyncCompletions(
+            probs=[0.9, 0.05, 0.9, 0.9, 0.9, 0.9],
+            delays=[0.01, 0.01, 2.0, 2.0, 2.0, 2.0]
+        )
+        tool = self._tool(completions, min_permutations=2, max_concurrency=3)
+
+        inicio = time.monotonic()
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert time.monotonic() - inicio < 1.0
+        assert result["decision"] == "BLOQUEADO"
+        assert result["metrics"]["B2T"] == 999.0
+        # Veto after the first wave: no further call is ever started (or billed)
+        assert completions.calls == completions.completed == 2
+        assert result["metrics"]["Calls_Used"] == 2
+        assert result["metrics"]["Calls_Saved"] == 4
+
+    def test_padroes_economizam_chamadas_em_auditoria_determinada(self):
+        """With default concurrency and permutations, a clear audit stops after the first wave."""
+        completions = _AsyncCompletions(probs=[0.99] * 6)
+        tool = SemanticISRAuditorTool(client=None, async_client=_client(completions), adaptive=True)
+
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert result["decision"] == "APROVADO"
+        assert completions.calls == tool.min_permutations < tool.num_permutations
+        assert result["metrics"]["Calls_Saved"] == tool.num_permutations - tool.min_permutations
+
+    def test_ondas_respeitam_concorrencia(self):
+        em_voo = pico = 0
+
+        class _Contando(_AsyncCompletions):
+            async def create(self, **kwargs):
+                nonlocal em_voo, pico
+                em_voo += 1
+                pico = max(pico, em_voo)
+                try:
+                    return await super().create(**kwargs)
+                finally:
+                    em_voo -= 1
+
+        completions = _Contando(probs=[0.7, 0.6, 0.65, 0.72, 0.68, 0.7])
+        tool = self._tool(completions, min_permutations=4, max_concurrency=2)
+
+        asyncio.run(tool.audit_async("contexto", "APROVADO"))
+
+        assert completions.calls == 6
+        assert pico == 2
+
+    def test_chamada_com_falha_nao_encerra_amostragem(self):
+        completions = _FailingCompletions(probs=[0.99] * 6, failing=[1])
+        tool = self._tool(completions, min_permutations=2, max_concurrency=1)
+
+        results = asyncio.run(tool.audit_many_async([("contexto", "APROVADO")]))
+
+        # The failure is neither a veto nor evidence: one more permutation is scored
+        assert results[0]["metrics"]["API_Errors"] == 1
+        assert results[0]["metrics"]["Calls_Used"] == 3
+
+    def test_atalho_de_sucesso_por_limite_de_confianca(self):
+        completions = _AsyncCompletions(probs=[0.99] * 6)
+        tool = self._tool(completions, min_permutations=3, max_concurrency=1)
+
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert result["decision"] == "APROVADO"
+        assert result["metrics"]["Calls_Used"] == 3
+        assert tool.call_stats == {
+            "audits": 1, "calls_used": 3, "calls_saved": 3, "estimated": 0, "api_errors": 0
+        }
+
+    def test_regime_isr_usa_todas_as_permutacoes(self):
+        completions = _AsyncCompletions(probs=[0.7, 0.6, 0.65, 0.72, 0.68, 0.7])
+        tool = self._tool(completions, max_concurrency=2)
+
+        result = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADO")))
+
+        assert completions.calls == 6
+        assert result["metrics"]["Calls_Saved"] == 0
+        assert result == {**result, "decision": tool._decide(np.array(completions.probs))["decision"]}
+
+    def test_audit_many_adaptativo(self):
+        completions = _AsyncCompletions(probs=[0.99] * 6)
+        tool = self._tool(completions, min_permutations=2, max_concurrency=1)
+
+        results = asyncio.run(tool.audit_many_async([("a", "APROVADO"), ("b", "APROVADO")]))
+
+        assert [r["decision"] for r in results] == ["APROVADO", "APROVADO"]
+        assert all(r["metrics"]["Calls_Used"] == 2 for r in results)
+        assert tool.call_stats["calls_saved"] == 8
+
+
+class TestDecisionEstimate:
+    """Tests for the first-pass estimate from the decision call's logprobs."""
+
+    def test_estimativa_conclusiva_dispensa_permutacoes(self):
+        completions = _AsyncCompletions(probs=[0.7] * 6)
+        tool = SemanticISRAuditorTool(client=None, async_client=_client(completions), num_permutations=6)
+
+        aprovado = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADA", decision_probability=0.98)))
+        vetado = json.loads(asyncio.run(tool.audit_async("contexto", "APROVADA", decision_probability=0.05)))
+
+        assert completions.calls == 0
+        assert aprovado["decision"] == "APROVADO" and aprovado["metrics"]["Estimated"] is True
+        assert vetado["decision"] == "BLOQUEADO" and vetado["metrics"]["B2T"] == 999.0
+        assert tool.call_stats["estimated"] == 2
+
+    def test_audit_many_audita_apenas_inconclusivos(self):
+        completions = _AsyncCompletions(probs=[0.7, 0.6, 0.65, 0.72, 0.68, 0.7])
+        tool = SemanticISRAuditorTool(client=None, async_client=_client(completions), num_permutations=6)
+        itens = [("a", "APROVADA"), ("b", "APROVADA"), ("c", "NEGADA")]
+
+        results = asyncio.run(tool.audit_many_async(itens, decision_probabilities=[0.99, 0.6, None]))
+
+        assert completions.calls == 12
+        assert results[0]["metrics"]["Estimated"] is True
+        assert "Estimated" not in results[1]["metrics"]
+        assert results[2]["metrics"]["ISR"] == tool._decide(np.array(completions.probs))["metrics"]["ISR"]
+        assert results[2]["metrics"]["Calls_Used"] == 6
+
+
+class TestPermutationStrategies:
+    """Tests for chunk-order permutations and cached-token accounting."""
+
+    CHUNKS = ["# Cliente\nscore 780", "# Caso\ncartão", "## 2.1 Score", "## 2.2 Renda", "## 3.1 Limites"]
+
+    def test_shared_prefix_permuta_apenas_o_final(self):
+        tool = SemanticISRAuditorTool(client=None, num_permutations=6, permutation_strategy="shared_prefix")
+
+        prompts = tool._build_permutation_prompts(self.CHUNKS, "APROVADA")
+
+        assert len(set(prompts)) == 6
+        assert prompts[0] == tool.construct_verification_prompt(tool.VERIFICATION_QUERY, self.CHUNKS, "APROVADA")
+        # 3! = 6 orders of the last three chunks: the first two are a shared prefix
+        prefixo = prompts[0][:prompts[0].index("## 2.1")]
+        assert all(p.startswith(prefixo) for p in prompts)
+
+    def test_random_deterministico_e_texto_dividido_em_blocos(self):
+        tool = SemanticISRAuditorTool(client=None, num_permutations=4, permutation_strategy="random")
+        texto = "\n\n".join(self.CHUNKS)
+
+        prompts = tool._build_permutation_prompts(texto, "NEGADA")
+
+        assert prompts == tool._build_permutation_prompts(self.CHUNKS, "NEGADA")
+        assert all(all(c in p for c in self.CHUNKS) for p in prompts)
+
+    @pytest.mark.parametrize("estrategia", ["shared_prefix", "random"])
+    def test_ordens_distintas_limitadas_ao_numero_de_permutacoes(self, estrategia):
+        tool = SemanticISRAuditorTool(client=None, num_permutations=6, permutation_strategy=estrategia)
+
+        dois = tool._build_permutation_prompts(self.CHUNKS[:2], "APROVADA")
+        tres = tool._build_permutation_prompts(self.CHUNKS[:3], "APROVADA")
+
+        # 2! = 2 and 3! = 6 distinct orders: none is repeated
+        assert len(dois) == len(set(dois)) == 2
+        assert len(tres) == len(set(tres)) == 6
+
+    def test_auditoria_com_menos_ordens_preenche_com_nan(self):
+        completions = _AsyncCompletions(probs=[0.97])
+        tool = SemanticISRAuditorTool(
+            client=None, async_client=_client(completions), num_permutations=6,
+            permutation_strategy="shared_prefix"
+        )
+        itens = [(self.CHUNKS[:2], "APROVADA"), (self.CHUNKS, "APROVADA")]
+
+        results = asyncio.run(tool.audit_many_async(itens))
+
+        assert completions.calls == 8
+        assert [r["metrics"]["Calls_Used"] for r in results] == [2, 6]
+        assert results[0]["metrics"]["Calls_Saved"] == 4
+        assert all(r["decision"] == "APROVADO" and r["metrics"]["API_Errors"] == 0 for r in results)
+
+    def test_contexto_de_um_bloco_usa_variacoes(self):
+        tool = SemanticISRAuditorTool(client=None, num_permutations=3, permutation_strategy="shared_prefix")
+
+        prompts = tool._build_permutation_prompts("contexto único", "APROVADA")
+
+        assert prompts[1].startswith("contexto único [Variation 1]")
+
+    def test_estrategia_invalida(self):
+        with pytest.raises(ValueError):
+            SemanticISRAuditorTool(client=None, permutation_strategy="sorted")
+
+    def test_contabiliza_tokens_em_cache_de_prefixo(self):
+        class _UsageCompletions(_AsyncCompletions):
+            async def create(self, **kwargs):
+                response = await super().create(**kwargs)
+                response.usage = SimpleNamespace(
+                    prompt_tokens=1200, prompt_tokens_details=SimpleNamespace(cached_tokens=1024 if self.calls > 1 else 0)
+                )
+                return response
+
+        completions = _UsageCompletions(probs=[0.99] * 6)
+        tool = SemanticISRAuditorTool(
+            client=None, async_client=_client(completions), num_permutations=6,
+            max_concurrency=1, permutation_strategy="shared_prefix"
+        )
+
+        asyncio.run(tool.audit_async(self.CHUNKS, "APROVADA"))
+
+        stats = tool.cached_token_stats()
+        assert stats["prompt_tokens"] == 7200
+        assert stats["cached_tokens"] == 5 * 1024
+        assert stats["cached_token_ratio"] == pytest.approx(5120 / 7200)
+
+
+class _ChatClient:
+    """AsyncOpenAI stand-in answering from a per-prompt probability table; records every request."""
+
+    def __init__(self, prob_for_prompt):
+        self.prob_for_prompt = prob_for_prompt
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+
+    async def _chat(self, **kwargs):
+        self.requests.append(kwargs)
+        return _logprob_response(self.prob_for_prompt(kwargs["messages"][1]["content"]))
+
+
+class TestPackedScoring:
+    """Tests for packed (batch-deduplicated) scoring."""
+
+    # Repeated (context, decision) pairs share all their verification prompts
+    ITENS = [
+        ("caso estável", "APROVADA"), ("caso instável", "APROVADA"),
+        ("caso estável", "APROVADA"), ("outro estável", "NEGADA"), ("caso instável", "APROVADA"),
+    ]
+
+    @staticmethod
+    def _prob(prompt: str) -> float:
+        variation = int(prompt.split("[Variation ")[1].split("]")[0]) if "[Variation " in prompt else 0
+        return (0.9 if "estável" in prompt else 0.5) - 0.02 * variation
+
+    def test_isr_identico_ao_single_com_menos_chamadas(self):
+        single_client, packed_client = _ChatClient(self._prob), _ChatClient(self._prob)
+        single = SemanticISRAuditorTool(client=None, async_client=single_client, num_permutations=6)
+        packed = SemanticISRAuditorTool(
+            client=None, async_client=packed_client, num_permutations=6, scoring_mode="packed"
+        )
+
+        esperado = asyncio.run(single.audit_many_async(self.ITENS))
+        resultado = asyncio.run(packed.audit_many_async(self.ITENS))
+
+        assert resultado == esperado
+        assert single.request_stats == {"api_requests": 30, "prompts_scored": 30}
+        assert packed.request_stats == {"api_requests": 18, "prompts_scored": 18}
+        # Same chat requests to the same model, each sent once
+        pedidos = [json.dumps(r, sort_keys=True) for r in packed_client.requests]
+        assert len(set(pedidos)) == len(pedidos)
+        assert set(pedidos) == {json.dumps(r, sort_keys=True) for r in single_client.requests}
+
+    def test_prompts_em_cache_nao_sao_reenviados(self, tmp_path):
+        client = _ChatClient(lambda p: 0.97)
+        tool = SemanticISRAuditorTool(
+            client=None, async_client=client, num_permutations=6, scoring_mode="packed",
+            logprob_cache=LogprobCache(tmp_path)
+        )
+        itens = [("caso estável", "APROVADA"), ("caso estável", "APROVADA")]
+
+        primeira = asyncio.run(tool.audit_many_async(itens))
+        segunda = asyncio.run(tool.audit_many_async(itens))
+
+        assert primeira == segunda
+        assert [r["decision"] for r in segunda] == ["APROVADO", "APROVADO"]
+        # Six distinct prompts, each sent once across both batches
+        assert tool.request_stats == {"api_requests": 6, "prompts_scored": 6}
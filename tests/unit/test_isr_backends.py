@@ -0,0 +1,78 @@
+"""
+Unit tests for the pluggable ISR probability backends.
+"""
+import asyncio
+import json
+import time
+import pytest
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.isr_backends import SyntheticBackend
+
+CONTEXTO = "# Cliente\nrenda 5000\n\n# Caso\nempréstimo pessoal\n\n# Política\nlimite de 30% da renda"
+
+
+def _tool(backend, **kwargs):
+    return SemanticISRAuditorTool(client=None, num_permutations=6, backend=backend, **kwargs)
+
+
+class TestSyntheticBackend:
+    """Tests for SyntheticBackend."""
+
+    def test_deterministico_por_semente_e_prompt(self):
+        a, b = SyntheticBackend("unstable", seed=7), SyntheticBackend("unstable", seed=7)
+        prompts = [f"prompt {i}" for i in range(20)]
+
+        assert [asyncio.run(a.score(p)) for p in prompts] == [asyncio.run(b.score(p)) for p in prompts]
+        assert asyncio.run(a.score("x")) != asyncio.run(SyntheticBackend("unstable", seed=8).score("x"))
+        assert a.calls == 21
+
+    def test_perfil_personalizado_e_invalido(self):
+        backend = SyntheticBackend({"low": 0.5, "high": 0.5})
+        assert asyncio.run(backend.score("qualquer")) == 0.5
+
+        with pytest.raises(ValueError):
+            SyntheticBackend("inexistente")
+
+
+class TestAuditorComBackend:
+    """Tests for SemanticISRAuditorTool with a synthetic backend (no OpenAI client)."""
+
+    def test_perfil_estavel_aprova_pelo_atalho(self):
+        resultado = json.loads(_tool(SyntheticBackend("stable")).audit(CONTEXTO, "APROVADA"))
+
+        assert resultado["decision"] == "APROVADO"
+        assert resultado["metrics"]["ISR"] == 999
+
+    def test_perfil_veto_bloqueia(self):
+        resultados = _tool(SyntheticBackend("veto")).audit_many(
+            [(f"{CONTEXTO} {i}", "APROVADA") for i in range(20)]
+        )
+
+        assert all(r["decision"] == "BLOQUEADO" for r in resultados)
+        assert any(r["metrics"]["B2T"] == 999 for r in resultados)
+
+    def test_perfil_instavel_decide_pelo_isr(self):
+        resultado = json.loads(_tool(SyntheticBackend("unstable")).audit(CONTEXTO, "APROVADA"))
+
+        assert 0 < resultado["metrics"]["ISR"] < 999
+        assert resultado["metrics"]["B2T"] != 999
+
+    def test_modo_packed_pontua_prompts_repetidos_uma_vez(self):
+        backend = SyntheticBackend("stable")
+        tool = _tool(backend, scoring_mode="packed")
+
+        tool.audit_many([(f"{CONTEXTO} {i % 2}", "APROVADA") for i in range(3)])
+
+        assert backend.calls == 12
+        assert tool.request_stats == {"api_requests": 12, "prompts_scored": 12}
+
+    def test_latencia_sobreposta_sob_concorrencia(self):
+        backend = SyntheticBackend("stable", latency=0.05)
+        tool = _tool(backend, max_concurrency=6)
+
+        inicio = time.perf_counter()
+        asyncio.run(tool.audit_many_async([(f"{CONTEXTO} {i}", "APROVADA") for i in range(4)]))
+        duracao = time.perf_counter() - inicio
+
+        assert backend.calls == 24
+        assert duracao < 24 * 0.05 / 2
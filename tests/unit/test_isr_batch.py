@@ -0,0 +1,86 @@
+"""
+Unit tests for the vectorized ISR engine and audit_many.
+"""
+import math
+import time
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.isr_batch import compute_isr_batch
+
+
+def _prob_matrix(seed: int = 7, n: int = 500, k: int = 6) -> np.ndarray:
+    """Random audits plus edge cases hitting every regime."""
+    rng = np.random.default_rng(seed)
+    probs = np.concatenate([
+        rng.uniform(0.0, 1.0, size=(n, k)),
+        rng.uniform(0.5, 1.0, size=(n, k)),
+        rng.uniform(0.9, 1.0, size=(n, k)),
+    ])
+    edges = np.array([
+        [1.0] * k,
+        [0.0] * k,
+        [0.96] * k,
+        [0.5] * k,
+        [0.9, 0.9, 0.9, 0.9, 0.9, 0.19][:k],
+        [0.99, 0.98, 0.97, 0.96, 0.95, 0.94][:k],
+    ])
+    return np.vstack([probs, edges])
+
+
+class TestComputeIsrBatch:
+    """Parity of the vectorized engine with the scalar auditor."""
+
+    @pytest.mark.parametrize("target,veto", [(0.95, 0.20), (0.80, 0.10), (0.99, 0.40)])
+    def test_paridade_com_caminho_escalar(self, target, veto):
+        tool = SemanticISRAuditorTool(
+            client=None, num_permutations=6, target_confidence=target, hard_veto_threshold=veto
+        )
+        probs = _prob_matrix()
+
+        batch = tool._results_from_batch(tool.compute_isr_batch(probs))
+
+        for row, result in zip(probs, batch):
+            assert result == tool._decide(row)
+
+    def test_linhas_com_nan_ignoram_permutacoes_ausentes(self):
+        probs = np.array([[0.9, 0.8, np.nan, np.nan], [0.9, 0.8, 0.85, 0.7]])
+
+        batch = compute_isr_batch(probs, prob_floor=1 / 8)
+        escalar = compute_isr_batch(probs[0, :2], prob_floor=1 / 8)
+
+        for chave in ("ISR", "B2T", "Delta", "JS_Bound"):
+            assert batch[chave][0] == pytest.approx(escalar[chave][0])
+
+    def test_dezenas_de_milhares_em_milissegundos(self):
+        probs = np.random.default_rng(0).uniform(size=(50_000, 6))
+
+        inicio = time.perf_counter()
+        batch = compute_isr_batch(probs)
+        duracao = time.perf_counter() - inicio
+
+        assert batch["ISR"].shape == (50_000,)
+        assert duracao < 0.5
+
+
+class TestAuditMany:
+    """Tests for audit_many over a fake logprob client."""
+
+    def test_audit_many_alinhado_com_itens(self):
+        def create(**kwargs):
+            prompt = kwargs["messages"][1]["content"]
+            prob = 0.99 if prompt.startswith("bom") else 0.05
+            top = [SimpleNamespace(token="Yes", logprob=math.log(prob))]
+            return SimpleNamespace(choices=[SimpleNamespace(
+                logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+            )])
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        tool = SemanticISRAuditorTool(client, num_permutations=3)
+
+        results = tool.audit_many([("bom contexto", "APROVADO"), ("ruim contexto", "APROVADO")])
+
+        assert [r["decision"] for r in results] == ["APROVADO", "BLOQUEADO"]
+        assert results[1]["metrics"]["B2T"] == 999.0
+        assert tool.audit_many([]) == []
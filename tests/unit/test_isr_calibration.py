@@ -0,0 +1,85 @@
+"""
+Unit tests for the offline ISR calibration sweep.
+"""
+import json
+import math
+import time
+from types import SimpleNamespace
+import numpy as np
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.isr_calibration import calibration_sweep, load_probability_log
+
+
+def _client(prob_for_prompt):
+    def create(**kwargs):
+        prob = prob_for_prompt(kwargs["messages"][1]["content"])
+        top = [SimpleNamespace(token="Yes", logprob=math.log(prob))]
+        return SimpleNamespace(choices=[SimpleNamespace(
+            logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+        )])
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+class TestProbabilityLog:
+    """Tests for the auditor's probability log and its loader."""
+
+    def test_auditoria_registra_probabilidades(self, tmp_path):
+        log = tmp_path / "probs.jsonl"
+        tool = SemanticISRAuditorTool(
+            _client(lambda p: 0.99 if "bom" in p else 0.3), num_permutations=3, probability_log=log
+        )
+
+        tool.audit("bom contexto", "APROVADO")
+        tool.audit_many([("ruim contexto", "APROVADO")])
+
+        registros = [json.loads(l) for l in log.read_text().splitlines()]
+        assert [r["decision"] for r in registros] == ["APROVADO", "APROVADO"]
+        assert registros[0]["probs"] == [0.99] * 3
+        assert registros[1]["id"] == tool.audit_id("ruim contexto", "APROVADO")
+
+        rotulos = {registros[0]["id"]: 1, registros[1]["id"]: 0}
+        probs, labels, ids = load_probability_log(log, rotulos)
+        assert probs.shape == (2, 3)
+        assert labels.tolist() == [1, 0]
+
+    def test_registros_sem_rotulo_e_permutacoes_ausentes(self, tmp_path):
+        log = tmp_path / "probs.jsonl"
+        log.write_text("\n".join(json.dumps(r) for r in [
+            {"id": "a", "probs": [0.9, 0.8, None], "label": 1},
+            {"id": "b", "probs": [0.2, 0.1, 0.3]},
+        ]))
+
+        probs, labels, ids = load_probability_log(log)
+
+        assert ids == ["a"]
+        assert np.isnan(probs[0, 2])
+
+
+class TestCalibrationSweep:
+    """Tests for calibration_sweep."""
+
+    def test_superficie_e_paridade_com_auditor(self):
+        rng = np.random.default_rng(3)
+        probs = np.vstack([rng.uniform(0.9, 1.0, (50, 6)), rng.uniform(0.0, 0.6, (50, 6))])
+        labels = np.array([1] * 50 + [0] * 50)
+
+        superficie = calibration_sweep(probs, labels, [0.9, 0.95], [0.1, 0.2], [12.0])
+
+        assert len(superficie) == 4
+        linha = superficie[(superficie.target_confidence == 0.95) & (superficie.hard_veto_threshold == 0.2)].iloc[0]
+        tool = SemanticISRAuditorTool(client=None, num_permutations=6)
+        bloqueados = np.array([tool._decide(row)["decision"] == "BLOQUEADO" for row in probs])
+        assert linha.blocked_rate == bloqueados.mean()
+        assert linha.recall == bloqueados[50:].mean()
+
+    def test_grade_grande_offline_em_segundos(self):
+        probs = np.random.default_rng(0).uniform(size=(10_000, 6))
+        labels = (probs.min(axis=1) > 0.3).astype(int)
+
+        inicio = time.perf_counter()
+        superficie = calibration_sweep(probs, labels)
+        duracao = time.perf_counter() - inicio
+
+        assert len(superficie) == 75
+        assert superficie[["precision", "recall", "blocked_rate"]].apply(lambda c: c.between(0, 1).all()).all()
+        assert duracao < 5.0
@@ -0,0 +1,68 @@
+"""
+Unit tests for LexicalMatcher.
+"""
+import time
+import pytest
+from src.utils.lexical_matcher import LexicalMatcher
+
+
+class TestLexicalMatcher:
+    """Tests for single-pass whole-word term matching."""
+
+    def test_categorias_em_uma_passada(self):
+        matcher = LexicalMatcher({
+            "jargao": ["KYC", "conforme política", "seção 2"],
+            "simples": ["você", "crédito", "seu"],
+        })
+
+        encontrados = matcher.encontrar("Você tem crédito. Conforme\nPolítica, Seção 2.1; seu kyc ok. Crédito!")
+
+        assert encontrados == {
+            "jargao": {"KYC", "conforme política", "seção 2"},
+            "simples": {"você", "crédito", "seu"},
+        }
+
+    def test_respeita_limites_de_palavra(self):
+        matcher = LexicalMatcher({"simples": ["seu", "sua"], "jargao": ["pep", "seção 2"]})
+
+        assert matcher.contar("museu, suave, pepino, seção 20") == {"simples": 0, "jargao": 0}
+
+    def test_plurais_regulares(self):
+        matcher = LexicalMatcher({
+            "jargao": ["critério", "sancionado", "conforme política", "reclassificação"],
+            "simples": ["dívida", "conta", "parcela"],
+        })
+
+        encontrados = matcher.encontrar(
+            "Critérios e clientes sancionados, conforme políticas e reclassificações: "
+            "suas dívidas, contas e parcelas."
+        )
+
+        assert encontrados == {
+            "jargao": {"critério", "sancionado", "conforme política", "reclassificação"},
+            "simples": {"dívida", "conta", "parcela"},
+        }
+        assert LexicalMatcher({"a": ["conta"]}, plurais=False).contar("contas") == {"a": 0}
+
+    def test_termo_em_mais_de_uma_categoria(self):
+        matcher = LexicalMatcher({"a": ["score"], "b": ["Score"]})
+
+        assert matcher.contar("seu score") == {"a": 1, "b": 1}
+
+    def test_termo_vazio_invalido(self):
+        with pytest.raises(ValueError):
+            LexicalMatcher({"a": ["--"]})
+
+    def test_custo_nao_cresce_com_numero_de_termos(self):
+        texto = "Seu crédito foi aprovado e a parcela cabe no seu orçamento mensal. " * 20
+        pequeno = LexicalMatcher({"a": ["crédito", "parcela"]})
+        grande = LexicalMatcher({"a": [f"termo{i}" for i in range(2000)] + ["crédito", "parcela"]})
+
+        def medir(matcher):
+            inicio = time.perf_counter()
+            for _ in range(200):
+                matcher.contar(texto)
+            return time.perf_counter() - inicio
+
+        assert grande.contar(texto) == pequeno.contar(texto) == {"a": 2}
+        assert medir(grande) < 3 * medir(pequeno) + 0.05
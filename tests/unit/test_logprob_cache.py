@@ -0,0 +1,95 @@
+"""
+Unit tests for the persistent ISR logprob cache.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from types import SimpleNamespace
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.tools.logprob_cache import LogprobCache
+
+
+class _CountingCompletions:
+    """Sync chat.completions stand-in that counts API calls."""
+
+    def __init__(self, prob_yes: float = 0.99, fail: bool = False):
+        self.prob_yes = prob_yes
+        self.fail = fail
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        top = [SimpleNamespace(token="Yes", logprob=math.log(self.prob_yes))]
+        return SimpleNamespace(choices=[SimpleNamespace(
+            logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+        )])
+
+
+def _tool(completions, cache, **kwargs):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return SemanticISRAuditorTool(client, num_permutations=3, logprob_cache=cache, **kwargs)
+
+
+class TestLogprobCache:
+    """Tests for LogprobCache and its use by the auditor."""
+
+    def test_auditoria_repetida_nao_chama_api(self, tmp_path):
+        completions = _CountingCompletions()
+        cache = LogprobCache(tmp_path)
+
+        primeira = json.loads(_tool(completions, cache).audit("Cliente com score 780", "APROVADO"))
+        chamadas = completions.calls
+        # New tool instance (e.g. a later run) sharing the same directory
+        segunda = json.loads(_tool(completions, LogprobCache(tmp_path)).audit("Cliente com score 780", "APROVADO"))
+
+        assert chamadas == 3
+        assert completions.calls == 3
+        assert segunda == primeira
+        assert cache.stats()["writes"] == 3
+
+    def test_caminho_async_usa_cache(self, tmp_path):
+        completions = _CountingCompletions()
+        cache = LogprobCache(tmp_path)
+        tool = _tool(completions, cache)
+
+        asyncio.run(tool.audit_async("contexto", "APROVADO"))
+        asyncio.run(tool.audit_async("contexto", "APROVADO"))
+
+        assert completions.calls == 3
+        assert cache.stats() == {"hits": 3, "misses": 3, "writes": 3, "hit_rate": 0.5}
+
+    def test_chave_depende_do_modelo(self, tmp_path):
+        completions = _CountingCompletions()
+        cache = LogprobCache(tmp_path)
+
+        _tool(completions, cache, model="gpt-4o-mini").audit("contexto", "APROVADO")
+        _tool(completions, cache, model="gpt-4o").audit("contexto", "APROVADO")
+
+        assert completions.calls == 6
+
+    def test_erro_de_api_nao_e_armazenado(self, tmp_path):
+        cache = LogprobCache(tmp_path)
+
+        _tool(_CountingCompletions(fail=True), cache).audit("contexto", "APROVADO")
+
+        assert len(cache) == 0
+
+    def test_limite_de_tamanho_descarta_menos_usadas(self, tmp_path):
+        cache = LogprobCache(tmp_path, max_entries=10)
+        chaves = [cache.key({"prompt": i}) for i in range(10)]
+        for i, chave in enumerate(chaves):
+            cache.put(chave, [{"token": "Yes", "logprob": -0.1}])
+            path = next(tmp_path.glob(f"*/{chave}.json"))
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+
+        # Reading the oldest entry refreshes it
+        assert cache.get(chaves[0]) is not None
+        cache.put(cache.key({"prompt": "novo"}), [])
+
+        assert len(cache) <= 10
+        assert cache.get(chaves[0]) is not None
+        assert cache.get(chaves[1]) is None
@@ -0,0 +1,92 @@
+"""
+Unit tests for MetricsCalculator and MetricsAccumulator aggregation.
+"""
+import pickle
+from src.models.domain import Decisao, RespostaModelo, ResultadoAvaliacao
+from src.services.metrics_accumulator import MetricsAccumulator
+from src.services.metrics_calculator import MetricsCalculator
+
+
+def _resultado(caso_id: str, status: str = "PASS", nivel_leitura=None, **kwargs) -> ResultadoAvaliacao:
+    return ResultadoAvaliacao(
+        caso_id=caso_id,
+        status=status,
+        pontos=4.0,
+        nivel_leitura=nivel_leitura,
+        resposta_modelo=RespostaModelo(
+            decisao=Decisao.APROVADA,
+            explicacao_acessivel="Seu crédito foi aprovado e a parcela cabe na sua renda."
+        ),
+        **kwargs
+    )
+
+
+class TestMetricsCalculator:
+    """Tests for MetricsCalculator."""
+
+    def test_flesch_kincaid_medio_usa_legibilidade_do_resultado(self, monkeypatch):
+        # Agregação pura: nenhuma explicação é reprocessada
+        monkeypatch.setattr(
+            "src.services.accessibility.AccessibilityService.avaliar_explicacao",
+            lambda *a, **k: (_ for _ in ()).throw(AssertionError("texto reprocessado"))
+        )
+        resultados = [_resultado("A_1", nivel_leitura=6.0), _resultado("A_2", nivel_leitura=9.0), _resultado("B_1")]
+
+        metricas = MetricsCalculator().calcular(resultados)
+
+        assert metricas.flesch_kincaid_medio == 7.5
+        assert metricas.total_casos == 3
+
+    def test_sem_legibilidade(self):
+        assert MetricsCalculator().calcular([_resultado("A_1")]).flesch_kincaid_medio is None
+
+
+class TestMetricsAccumulator:
+    """Tests for the single-pass, mergeable MetricsAccumulator."""
+
+    def _resultados(self):
+        return [
+            _resultado("ACESSIBILIDADE_1", "PASS", 6.0, eh_acessivel=True, vieses_detectados=["a"]),
+            _resultado("ACESSIBILIDADE_2", "FAIL", isr_semantico=0.4, vieses_detectados=["b", "a"]),
+            _resultado("NEEDLE_1", "PARTIAL", 9.0, isr_semantico=999.0),
+            _resultado("NEEDLE_2", "PASS", eh_acessivel=True),
+            _resultado("SEMCATEGORIA", "FAIL"),
+        ]
+
+    def test_snapshot_em_uma_passada(self):
+        metricas, por_categoria = MetricsAccumulator().add_many(self._resultados()).snapshot()
+
+        assert (metricas.casos_pass, metricas.casos_fail, metricas.casos_partial) == (2, 2, 1)
+        assert metricas.isr_medio == 4.0 / 5.0
+        assert metricas.isr_semantico_medio == (0.4 + 1.0) / 2
+        assert metricas.flesch_kincaid_medio == 7.5
+        assert metricas.taxa_por_tipo == {"ACESSIBILIDADE": 0.5, "NEEDLE": 0.5, "OUTRO": 0.0}
+        assert metricas.disparate_impact == 1.0
+        assert metricas.vieses_detectados == ["a", "b"]
+        assert [(c.categoria, c.total, c.pass_count) for c in por_categoria] == [
+            ("ACESSIBILIDADE", 2, 1), ("NEEDLE", 2, 1), ("OUTRO", 1, 0)
+        ]
+
+    def test_merge_de_shards_igual_a_passada_unica(self):
+        resultados = self._resultados()
+        unico = MetricsAccumulator().add_many(resultados)
+
+        shards = [MetricsAccumulator().add_many(resultados[i::2]) for i in range(2)]
+        # Estado só de dicts/números: atravessa processos com pickle
+        shards = [pickle.loads(pickle.dumps(s)) for s in shards]
+        mesclado = shards[0].merge(shards[1])
+
+        excluir = {"timestamp", "vieses_detectados"}
+        assert mesclado.metricas_globais().model_dump(exclude=excluir) == \
+            unico.metricas_globais().model_dump(exclude=excluir)
+        assert sorted(mesclado.metricas_globais().vieses_detectados) == ["a", "b"]
+        por_nome = lambda a: {c.categoria: c.model_dump() for c in a.metricas_por_categoria()}
+        assert por_nome(mesclado) == por_nome(unico)
+
+    def test_calculator_delega_ao_acumulador(self):
+        resultados = self._resultados()
+        esperado = MetricsAccumulator().add_many(resultados).metricas_globais()
+
+        assert MetricsCalculator().calcular(resultados).model_dump(exclude={"timestamp"}) == \
+            esperado.model_dump(exclude={"timestamp"})
+        assert MetricsAccumulator().metricas_globais().total_casos == 0
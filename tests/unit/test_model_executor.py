@@ -1,9 +1,14 @@
 """
 Unit tests for ModelExecutor mock functionality.
 """
+import asyncio
+import json
+import math
+from types import SimpleNamespace
 import pytest
 from src.services.model_executor import ModelExecutor
-from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente
+from src.models.domain import Cliente, CasoTeste, Decisao, TipoCaso, TipoCliente
+from src.utils.json_stream import IncrementalJSONScanner
 
 
 class TestModelExecutorMock:
@@ -117,3 +122,344 @@ class TestModelExecutorMock:
         assert "720" in explicacao
         # Should be long enough
         assert len(explicacao) >= 50
+
+
+class _FakeAsyncMessages:
+    """Minimal AsyncAnthropic.messages stand-in."""
+
+    def __init__(self, texto: str, atraso: float = 0.0):
+        self.texto = texto
+        self.atraso = atraso
+        self.chamadas = 0
+        self.canceladas = 0
+
+    async def create(self, **kwargs):
+        self.chamadas += 1
+        try:
+            await asyncio.sleep(self.atraso)
+        except asyncio.CancelledError:
+            self.canceladas += 1
+            raise
+        return SimpleNamespace(content=[SimpleNamespace(text=self.texto)])
+
+
+class TestModelExecutorAsync:
+    """Tests for the native async provider path."""
+
+    def _create_args(self):
+        cliente = Cliente(
+            cliente_id="PF_001",
+            tipo=TipoCliente.PF,
+            cpf="123.456.789-00",
+            score_atual=750,
+            renda_mensal=5000.0
+        )
+        caso = CasoTeste(
+            caso_id="TEST_001",
+            tipo_cenario=TipoCaso.INCONSISTENCIA,
+            subtipo="test",
+            descricao="Test case",
+            input={"tipo": "PF"},
+            output_esperado={"decisao": "APROVADA"}
+        )
+        return cliente, caso
+
+    def test_usa_cliente_async_sem_threads(self):
+        """Real path awaits the async client instead of asyncio.to_thread."""
+        messages = _FakeAsyncMessages('{"decisao": "APROVADA", "score": 750}')
+        executor = ModelExecutor(
+            client=None,
+            async_client=SimpleNamespace(messages=messages),
+            provider="anthropic",
+            use_mock=False
+        )
+        cliente, caso = self._create_args()
+
+        resultado = asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert messages.chamadas == 1
+        assert resultado["resposta_json"]["decisao"] == "APROVADA"
+
+    def test_timeout_cancela_chamada_em_voo(self):
+        """Timeout cancels the in-flight coroutine."""
+        messages = _FakeAsyncMessages("{}", atraso=5.0)
+        executor = ModelExecutor(
+            client=None,
+            async_client=SimpleNamespace(messages=messages),
+            provider="anthropic",
+            timeout=0.05,
+            use_mock=False
+        )
+        cliente, caso = self._create_args()
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert messages.canceladas == 1
+
+
+class TestModelExecutorPrefixCache:
+    """Tests for provider-side prompt prefix caching."""
+
+    def test_anthropic_marca_template_e_politicas_como_cacheaveis(self):
+        """The stable template has its own breakpoint ahead of the per-case policies."""
+        executor = ModelExecutor(prompt_template="SYSTEM", provider="anthropic")
+
+        params = executor._montar_requisicao("CLIENTE", "POLITICAS")
+
+        assert [b["text"] for b in params["system"]] == ["SYSTEM", "POLITICAS"]
+        assert all(b["cache_control"] == {"type": "ephemeral"} for b in params["system"])
+        assert params["messages"] == [{"role": "user", "content": "CLIENTE"}]
+
+    def test_openai_prefixo_estatico_primeiro(self):
+        """OpenAI prefix caching only needs the static text to come first."""
+        executor = ModelExecutor(prompt_template="SYSTEM", provider="openai")
+
+        params = executor._montar_requisicao("CLIENTE", "POLITICAS")
+
+        assert params["messages"][0] == {"role": "system", "content": "SYSTEM\n\nPOLITICAS"}
+        assert params["messages"][1]["content"] == "CLIENTE"
+
+    def test_prompt_do_caso_nao_repete_politicas(self):
+        """The per-case prompt carries only the client/case sections."""
+        executor = ModelExecutor()
+        cliente = Cliente(cliente_id="PF_001", tipo=TipoCliente.PF, score_atual=700, renda_mensal=1.0)
+        caso = CasoTeste(
+            caso_id="TEST_001",
+            tipo_cenario=TipoCaso.INCONSISTENCIA,
+            subtipo="test",
+            descricao="Test case",
+            input={"tipo": "PF"},
+            output_esperado={"decisao": "NEGADA"}
+        )
+
+        prompt = executor._preparar_prompt(cliente, caso)
+
+        assert "POLÍTICAS BANCÁRIAS" not in prompt
+        assert "PF_001" in prompt
+
+    def test_razao_tokens_em_cache(self):
+        """Cached-token ratio accounts for Anthropic and OpenAI usage shapes."""
+        anthropic = ModelExecutor(provider="anthropic")
+        anthropic._registrar_uso(SimpleNamespace(
+            input_tokens=100, cache_read_input_tokens=900,
+            cache_creation_input_tokens=0, output_tokens=50
+        ))
+        openai = ModelExecutor(provider="openai")
+        openai._registrar_uso(SimpleNamespace(
+            prompt_tokens=1000, completion_tokens=50,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=768)
+        ))
+
+        assert anthropic.stats_tokens()["cached_token_ratio"] == pytest.approx(0.9)
+        assert openai.stats_tokens()["cached_token_ratio"] == pytest.approx(0.768)
+
+
+class _FakeStream:
+    """Async iterator over provider stream events that records early close."""
+
+    def __init__(self, eventos):
+        self.eventos = list(eventos)
+        self.consumidos = 0
+        self.fechado = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumidos >= len(self.eventos):
+            raise StopAsyncIteration
+        self.consumidos += 1
+        return self.eventos[self.consumidos - 1]
+
+    async def close(self):
+        self.fechado = True
+
+
+class TestModelExecutorStreaming:
+    """Tests for streaming mode with early JSON completion."""
+
+    TRECHOS = ['Segue:\n```json\n{"decisao": "NEG', 'ADA", "justificativa": "score {baixo}"', '}\n```', ' Texto extra', ' ignorado.']
+
+    def test_scanner_fecha_objeto_com_chaves_em_string(self):
+        scanner = IncrementalJSONScanner()
+        saidas = [scanner.feed(t) for t in self.TRECHOS[:3]]
+
+        assert saidas[:2] == [None, None]
+        assert json.loads(saidas[2]) == {"decisao": "NEGADA", "justificativa": "score {baixo}"}
+
+    def test_scanner_ignora_candidato_invalido(self):
+        scanner = IncrementalJSONScanner()
+        assert scanner.feed("Considere {renda} e ") is None
+        assert scanner.feed('{"score": 500}') == '{"score": 500}'
+
+    def _create_executor(self, provider, stream):
+        async def create(**kwargs):
+            assert kwargs["stream"] is True
+            return stream
+
+        if provider == "anthropic":
+            async_client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        else:
+            async_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        return ModelExecutor(
+            async_client=async_client,
+            model_name="stream-model",
+            prompt_template="system",
+            provider=provider,
+            use_mock=False,
+            streaming=True
+        )
+
+    def test_anthropic_encerra_ao_fechar_json(self):
+        eventos = [SimpleNamespace(
+            type="message_start",
+            message=SimpleNamespace(usage=SimpleNamespace(input_tokens=40, output_tokens=1))
+        )] + [
+            SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text=t))
+            for t in self.TRECHOS
+        ]
+        stream = _FakeStream(eventos)
+        executor = self._create_executor("anthropic", stream)
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        resultado = asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert stream.fechado
+        assert stream.consumidos == 4
+        assert resultado["resposta_bruta"].endswith("}")
+        assert resultado["resposta_modelo"].decisao == Decisao.NEGADA
+        assert 0 <= resultado["ttft_s"] <= resultado["tempo_decisao_s"]
+        assert executor.stats_tokens()["input_tokens"] == 40
+
+    def test_openai_le_deltas_e_estima_uso(self):
+        eventos = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))], usage=None)
+            for t in self.TRECHOS
+        ]
+        stream = _FakeStream(eventos)
+        executor = self._create_executor("openai", stream)
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        resultado = asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert stream.fechado
+        assert resultado["resposta_json"]["decisao"] == "NEGADA"
+        # Stream closed before the final usage chunk: tokens are estimated
+        assert executor.stats_tokens()["output_tokens"] > 0
+
+
+    def test_stream_fechado_no_timeout(self):
+        class _StreamLento(_FakeStream):
+            async def __anext__(self):
+                if self.consumidos >= len(self.eventos):
+                    # Provider still generating when the case times out
+                    await asyncio.sleep(10)
+                return await super().__anext__()
+
+        eventos = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))], usage=None)
+            for t in self.TRECHOS[:1]
+        ]
+        stream = _StreamLento(eventos)
+        executor = self._create_executor("openai", stream)
+        executor.timeout = 0.05
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert stream.fechado
+
+    def test_stream_fechado_quando_termina_sem_objeto(self):
+        eventos = [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=t))], usage=None)
+            for t in self.TRECHOS[:1]
+        ]
+        stream = _FakeStream(eventos)
+        executor = self._create_executor("openai", stream)
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        # Truncated JSON: the stream ends without a complete object
+        with pytest.raises(ValueError):
+            asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert stream.fechado
+
+
+class TestModelExecutorLogprobsDecisao:
+    """Tests for the decision-token probability read from the primary call."""
+
+    TOKENS = [('{"', -0.01), ('decisao', 0.0), ('":', 0.0), (' "', 0.0), ('APR', -0.1), ('OV', 0.0),
+              ('ADA', -0.05), ('",', 0.0), (' "score', 0.0), ('":', 0.0), (' 750', -0.3), ('}', 0.0)]
+
+    def _create_executor(self, provider="openai"):
+        self.kwargs = {}
+
+        async def create(**kwargs):
+            self.kwargs = kwargs
+            content = [SimpleNamespace(token=t, logprob=lp) for t, lp in self.TOKENS]
+            return SimpleNamespace(
+                choices=[SimpleNamespace(
+                    message=SimpleNamespace(content="".join(t for t, _ in self.TOKENS)),
+                    logprobs=SimpleNamespace(content=content)
+                )],
+                usage=None
+            )
+
+        return ModelExecutor(
+            async_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+            provider=provider,
+            use_mock=False,
+            logprobs_decisao=True
+        )
+
+    def test_probabilidade_do_valor_de_decisao(self):
+        executor = self._create_executor()
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        resultado = asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert self.kwargs["logprobs"] is True
+        # Opening quote token + APR + OV + ADA + closing quote token
+        assert resultado["prob_decisao"] == pytest.approx(math.exp(-0.15))
+        assert resultado["resposta_modelo"].decisao == Decisao.APROVADA
+
+    def test_probabilidade_lida_dos_chunks_do_stream(self):
+        eventos = [
+            SimpleNamespace(
+                choices=[SimpleNamespace(
+                    delta=SimpleNamespace(content=t),
+                    logprobs=SimpleNamespace(content=[SimpleNamespace(token=t, logprob=lp)])
+                )],
+                usage=None
+            )
+            for t, lp in self.TOKENS
+        ]
+        stream = _FakeStream(eventos)
+        kwargs = {}
+
+        async def create(**params):
+            kwargs.update(params)
+            return stream
+
+        executor = ModelExecutor(
+            async_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+            provider="openai",
+            use_mock=False,
+            streaming=True,
+            logprobs_decisao=True
+        )
+        cliente, caso = TestModelExecutorAsync()._create_args()
+
+        resultado = asyncio.run(executor._executar_real(cliente, caso, ""))
+
+        assert kwargs["stream"] is True and kwargs["logprobs"] is True
+        assert resultado["prob_decisao"] == pytest.approx(math.exp(-0.15))
+        assert stream.fechado
+
+    def test_desligado_para_anthropic(self):
+        executor = ModelExecutor(provider="anthropic", use_mock=False, logprobs_decisao=True)
+
+        assert executor.logprobs_decisao is False
+        assert "logprobs" not in executor._montar_requisicao("prompt", "")
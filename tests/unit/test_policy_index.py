@@ -0,0 +1,101 @@
+"""
+Unit tests for the BM25 policy section index.
+"""
+from src.loaders.policy_index import PolicyIndex, tokenizar
+from src.services.model_executor import ModelExecutor
+from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente
+
+MANUAL = """# MANUAL DE POLÍTICAS
+
+## PARTE 1: FUNDAMENTOS
+
+### 1.1 Missão
+Atender clientes com ética e transparência.
+
+## PARTE 2: CRÉDITO
+
+### 2.2 Scoring de Crédito
+Score abaixo de 600 implica negativa automática de crédito.
+
+```
+# comentário dentro de bloco de código não é heading
+```
+
+### 2.4 Inadimplência Histórica
+Clientes com 2 ou mais defaults nos últimos 24 meses devem ser negados.
+
+## PARTE 4: COMPLIANCE
+
+### 4.2 Pessoa Politicamente Exposta (PEP)
+Todo cliente PEP exige análise reforçada de compliance antes da aprovação.
+"""
+
+
+class TestPolicyIndex:
+    """Tests for PolicyIndex."""
+
+    def test_divide_pela_arvore_de_headings(self):
+        indice = PolicyIndex(MANUAL)
+
+        titulos = [s.titulo for s in indice.secoes]
+        assert titulos == [
+            "PARTE 1: FUNDAMENTOS > 1.1 Missão",
+            "PARTE 2: CRÉDITO > 2.2 Scoring de Crédito",
+            "PARTE 2: CRÉDITO > 2.4 Inadimplência Histórica",
+            "PARTE 4: COMPLIANCE > 4.2 Pessoa Politicamente Exposta (PEP)",
+        ]
+        assert "bloco de código" in indice.secoes[1].texto
+
+    def test_tokenizar_remove_acentos_e_stopwords(self):
+        assert tokenizar("Inadimplência de PESSOA") == ["inadimplencia", "pessoa"]
+
+    def test_busca_encontra_regra_no_fim_do_documento(self):
+        indice = PolicyIndex(MANUAL)
+
+        secao, score = indice.buscar("cliente PEP politicamente exposto", top_k=1)[0]
+
+        assert secao.caminho[-1].startswith("4.2")
+        assert score > 0
+
+    def test_selecao_respeita_orcamento_e_ordem_do_documento(self):
+        indice = PolicyIndex(MANUAL)
+        orcamento = indice.secoes[2].tokens + indice.secoes[3].tokens
+
+        texto = indice.selecionar("defaults inadimplência PEP compliance", top_k=3, token_budget=orcamento)
+
+        assert texto.index("2.4 Inadimplência") < texto.index("4.2 Pessoa")
+        assert "Missão" not in texto
+        assert indice.stats()["tokens_medios_por_prompt"] <= orcamento
+
+    def test_secao_maior_que_orcamento_entra_truncada(self):
+        indice = PolicyIndex(MANUAL)
+        orcamento = indice.secoes[3].tokens // 2
+
+        secoes = indice.selecionar_secoes("PEP politicamente exposta", top_k=2, token_budget=orcamento)
+
+        assert [s.caminho[-1][:3] for s in secoes] == ["4.2"]
+        assert secoes[0].texto.endswith("[...]")
+        assert indice.secoes[3].texto.startswith(secoes[0].texto[:-len("\n[...]")])
+        assert secoes[0].tokens <= orcamento
+
+    def test_sem_termos_em_comum_usa_inicio_do_documento(self):
+        indice = PolicyIndex(MANUAL)
+        assert "1.1 Missão" in indice.selecionar("xyzzy", top_k=1)
+
+    def test_executor_usa_secoes_relevantes(self):
+        executor = ModelExecutor(use_mock=True, indice_politicas=PolicyIndex(MANUAL))
+        cliente = Cliente(cliente_id="PF_001", tipo=TipoCliente.PF, score_atual=780, renda_mensal=9000.0)
+        caso = CasoTeste(
+            caso_id="NEEDLE_050",
+            tipo_cenario=TipoCaso.NEEDLE,
+            subtipo="pep",
+            descricao="PEP mencionado em observações secundárias",
+            cliente_ref="PF_001",
+            input={"observacoes": "cliente é pessoa politicamente exposta"},
+            output_esperado={"decisao": "ANALISE_GERENCIAL"}
+        )
+
+        contexto = executor._preparar_contexto_politicas(MANUAL, cliente, caso)
+
+        assert contexto.startswith("# CONTEXTO: POLÍTICAS BANCÁRIAS")
+        assert "4.2 Pessoa Politicamente Exposta" in contexto
@@ -0,0 +1,107 @@
+"""
+Unit tests for the shared token-bucket rate limiter.
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from src.utils import rate_limiter as rl
+from src.utils.rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+from src.utils.config import settings
+from src.services.model_executor import ModelExecutor
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente
+
+
+@pytest.fixture
+def registro_limpo(monkeypatch):
+    """Isolates the process-wide limiter registry for each test."""
+    monkeypatch.setattr(rl, "_limitadores", {})
+    return rl._limitadores
+
+
+class TestTokenBucketRateLimiter:
+    """Tests for TokenBucketRateLimiter."""
+
+    def test_sem_limite_nao_espera(self):
+        limiter = TokenBucketRateLimiter()
+        assert not limiter.ativo
+        assert all(limiter._reservar(10_000) == 0.0 for _ in range(100))
+        assert limiter.stats()["esperas"] == 0
+
+    def test_balde_de_requisicoes(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=60)
+        esperas = [limiter._reservar(0) for _ in range(62)]
+
+        # Bucket starts full: 60 immediate requests, then 1 per second
+        assert all(e == 0.0 for e in esperas[:60])
+        assert esperas[60] == pytest.approx(1.0, abs=0.05)
+        assert esperas[61] == pytest.approx(2.0, abs=0.05)
+        assert limiter.stats()["esperas"] == 2
+
+    def test_balde_de_tokens_e_ajuste(self):
+        limiter = TokenBucketRateLimiter(tokens_per_minute=6000)
+        assert limiter._reservar(6000) == 0.0
+
+        # Actual usage was lower than reserved: the difference is returned
+        limiter.ajustar(-3000)
+        assert limiter._reservar(3000) == 0.0
+        assert limiter._reservar(100) == pytest.approx(1.0, abs=0.05)
+
+    def test_acquire_async_espera(self):
+        limiter = TokenBucketRateLimiter(requests_per_minute=600)
+        limiter._saldo_req = 0.0
+
+        espera = asyncio.run(limiter.acquire())
+        assert espera == pytest.approx(0.1, abs=0.02)
+        assert limiter.stats()["espera_max_s"] == pytest.approx(espera)
+
+
+class TestRegistroCompartilhado:
+    """Executor and ISR auditor must draw from the same limiter."""
+
+    def test_mesmo_limitador_por_provider_modelo(self, registro_limpo, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_REQUESTS_PER_MINUTE", 100)
+        monkeypatch.setattr(settings, "RATE_LIMIT_OVERRIDES", {"openai:gpt-4o-mini": {"rpm": 5, "tpm": 1000}})
+
+        executor = ModelExecutor(model_name="gpt-4o-mini", provider="openai", use_mock=True)
+        auditor = SemanticISRAuditorTool(client=None, model="gpt-4o-mini")
+
+        assert executor.rate_limiter is auditor.rate_limiter
+        assert executor.rate_limiter.rpm == 5
+        assert executor.rate_limiter.tpm == 1000
+        assert get_rate_limiter("openai", "gpt-4o").rpm == 100
+
+    def test_executor_adquire_e_ajusta(self, registro_limpo, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_TOKENS_PER_MINUTE", 100_000)
+
+        async def create(**kwargs):
+            return SimpleNamespace(
+                content=[SimpleNamespace(text='{"decisao": "NEGADA", "score": 500}')],
+                usage=SimpleNamespace(input_tokens=50, output_tokens=10)
+            )
+
+        executor = ModelExecutor(
+            async_client=SimpleNamespace(messages=SimpleNamespace(create=create)),
+            model_name="limited-model",
+            prompt_template="system",
+            provider="anthropic",
+            use_mock=False
+        )
+        cliente = Cliente(cliente_id="PF_001", tipo=TipoCliente.PF, score_atual=500, renda_mensal=3000.0)
+        caso = CasoTeste(
+            caso_id="NEEDLE_001",
+            tipo_cenario=TipoCaso.NEEDLE,
+            subtipo="test",
+            descricao="Test case",
+            cliente_ref="PF_001",
+            input={"tipo": "PF"},
+            output_esperado={"decisao": "NEGADA"}
+        )
+
+        asyncio.run(executor.executar_caso(cliente, caso, "POLITICAS"))
+
+        limiter = executor.rate_limiter
+        assert limiter.aquisicoes == 1
+        # Reservation (estimate + max_tokens) is corrected down to the 60 tokens actually used
+        assert limiter._saldo_tok == pytest.approx(100_000 - 60, abs=5)
+        assert executor.stats_tokens()["tempo_em_chamadas_s"] >= 0.0
@@ -0,0 +1,82 @@
+"""
+Unit tests for the native Portuguese readability engine and the
+AccessibilityService readability cache.
+"""
+import pytest
+from src.models.domain import Decisao, RespostaModelo
+from src.services import accessibility
+from src.services.accessibility import AccessibilityService
+from src.utils.readability import contar_silabas, legibilidade
+
+
+class TestLegibilidadeNativa:
+    """Tests for contar_silabas and legibilidade."""
+
+    @pytest.mark.parametrize("palavra,silabas", [
+        ("dia", 2), ("dinheiro", 3), ("saúde", 3), ("países", 3), ("mãe", 1),
+        ("ações", 2), ("qualquer", 2), ("guerra", 2), ("seguro", 3), ("Crédito", 3), ("750", 1),
+    ])
+    def test_contar_silabas_portugues(self, palavra, silabas):
+        assert contar_silabas(palavra) == silabas
+
+    def test_contagens_e_formulas(self):
+        texto = "Seu score de crédito é 750, que é muito bom. O banco aprova a partir de 700. Parabéns!"
+
+        r = legibilidade(texto)
+
+        # "Parabéns!" tem menos de 3 palavras e não conta como frase (regra do textstat)
+        assert (r["frases"], r["palavras"]) == (2, 18)
+        assert r["nivel_leitura"] == pytest.approx(0.39 * 9 + 11.8 * r["silabas"] / 18 - 15.59)
+        assert r["facilidade_leitura"] == pytest.approx(206.835 - 1.015 * 9 - 84.6 * r["silabas"] / 18)
+
+    def test_texto_sem_palavras(self):
+        assert legibilidade("...")["nivel_leitura"] == 0.0
+
+
+class TestAccessibilityServiceCache:
+    """Tests for AccessibilityService with the native engine and LRU."""
+
+    def test_motor_nativo_e_cache_por_texto_normalizado(self):
+        servico = AccessibilityService("nativo")
+        antes = AccessibilityService.estatisticas_cache()
+
+        a = servico.avaliar_explicacao("Você foi aprovado!  O banco liberou R$ 5000 na sua conta.")
+        b = servico.avaliar_explicacao("  Você foi aprovado! O banco liberou R$ 5000\nna sua conta. ")
+
+        depois = AccessibilityService.estatisticas_cache()
+        assert a["metodo"] == "flesch_kincaid_pt"
+        assert a["nivel_leitura"] == b["nivel_leitura"]
+        assert depois["hits"] - antes["hits"] == 1
+
+    def test_resultado_do_cache_nao_e_compartilhado(self):
+        servico = AccessibilityService("nativo")
+        resposta = RespostaModelo(
+            decisao=Decisao.APROVADA,
+            explicacao_acessivel="Seu crédito foi aprovado e a parcela cabe na sua renda."
+        )
+
+        servico.avaliar_resposta(resposta)
+        resultado = servico.avaliar_explicacao(resposta.explicacao_acessivel)
+
+        assert "decisao" not in resultado
+
+    def test_motor_invalido(self):
+        with pytest.raises(ValueError):
+            AccessibilityService("outro")
+
+    def test_dados_nltk_ausentes_afetam_so_a_instancia(self, monkeypatch):
+        def sem_cmudict(texto, motor):
+            raise LookupError("cmudict")
+
+        monkeypatch.setattr(accessibility, "_legibilidade", sem_cmudict)
+        disponivel = accessibility.TEXTSTAT_AVAILABLE
+        servico = AccessibilityService("textstat")
+        servico.textstat_available = True
+
+        resultado = servico.avaliar_explicacao("Seu crédito foi aprovado e a parcela cabe na sua renda.")
+
+        assert resultado["metodo"] == "heuristica"
+        assert servico.textstat_available is False
+        # Other services in the process keep their engine
+        assert accessibility.TEXTSTAT_AVAILABLE == disponivel
+        assert AccessibilityService("textstat").textstat_available == disponivel
@@ -0,0 +1,110 @@
+"""
+Unit tests for the on-disk response cache.
+"""
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+import pytest
+from src.services.response_cache import ResponseCache
+from src.services.model_executor import ModelExecutor
+from src.utils.disk_cache import DiskCache
+from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente
+
+
+class _FakeAsyncMessages:
+    """Counts calls to an AsyncAnthropic.messages stand-in."""
+
+    def __init__(self):
+        self.chamadas = 0
+
+    async def create(self, **kwargs):
+        self.chamadas += 1
+        return SimpleNamespace(content=[SimpleNamespace(text='{"decisao": "NEGADA", "score": 500}')])
+
+
+class TestResponseCache:
+    """Tests for ResponseCache and DiskCache."""
+
+    def _create_executor(self, cache, messages):
+        return ModelExecutor(
+            client=None,
+            async_client=SimpleNamespace(messages=messages),
+            model_name="test-model",
+            prompt_template="system",
+            provider="anthropic",
+            use_mock=False,
+            cache=cache
+        )
+
+    def _create_args(self):
+        cliente = Cliente(cliente_id="PF_001", tipo=TipoCliente.PF, score_atual=500, renda_mensal=1000.0)
+        caso = CasoTeste(
+            caso_id="TEST_001",
+            tipo_cenario=TipoCaso.INCONSISTENCIA,
+            subtipo="test",
+            descricao="Test case",
+            input={"tipo": "PF"},
+            output_esperado={"decisao": "NEGADA"}
+        )
+        return cliente, caso
+
+    def test_segunda_execucao_usa_cache(self, tmp_path):
+        """A repeated identical request is served from disk."""
+        cache = ResponseCache(tmp_path, mode="readwrite")
+        messages = _FakeAsyncMessages()
+        executor = self._create_executor(cache, messages)
+        cliente, caso = self._create_args()
+
+        primeira = asyncio.run(executor._executar_real(cliente, caso, "politicas"))
+        segunda = asyncio.run(executor._executar_real(cliente, caso, "politicas"))
+
+        assert messages.chamadas == 1
+        assert primeira["modo"] == "real"
+        assert segunda["modo"] == "cache"
+        assert segunda["resposta_json"] == primeira["resposta_json"]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_chave_muda_com_prompt(self, tmp_path):
+        """Changing what is sent to the model changes the key."""
+        a = ResponseCache.chave("anthropic", "m", "sys", "prompt", 2048)
+        b = ResponseCache.chave("anthropic", "m", "sys", "prompt 2", 2048)
+        c = ResponseCache.chave("anthropic", "m", "sys", "prompt", 1024)
+
+        assert len({a, b, c}) == 3
+
+    def test_modo_read_nao_grava(self, tmp_path):
+        """Read-only mode never writes new entries."""
+        cache = ResponseCache(tmp_path, mode="read")
+        cache.salvar("abc", "texto")
+
+        assert cache.obter("abc") is None
+        assert cache.writes == 0
+
+    def test_modo_invalido(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResponseCache(tmp_path, mode="sometimes")
+
+    def test_ttl_expira_entrada(self, tmp_path):
+        """Entries older than the TTL are treated as misses."""
+        disk = DiskCache(tmp_path, ttl_seconds=0.01)
+        disk.set("k1", {"v": 1})
+        time.sleep(0.03)
+
+        assert disk.get("k1") is None
+
+    def test_limite_remove_menos_usados(self, tmp_path):
+        """Size eviction drops the least recently used entries."""
+        disk = DiskCache(tmp_path, max_entries=3)
+        for i in range(3):
+            disk.set(f"k{i}", {"v": i})
+            os.utime(disk._path(f"k{i}"), (1000 + i, 1000 + i))
+
+        disk.get("k0")  # torna k0 o mais recente
+        disk.set("k3", {"v": 3})
+
+        assert len(disk) <= 3
+        assert disk.get("k0") == {"v": 0}
+        assert disk.get("k3") == {"v": 3}
+        assert disk.get("k1") is None
@@ -0,0 +1,94 @@
+"""
+Unit tests for the append-only JSONL results sink.
+"""
+import asyncio
+import json
+from src.core.fsm import SextantFSM  # noqa: F401 - carrega a cadeia de estados na ordem do FSM
+from src.models.domain import Decisao, RespostaModelo, ResultadoAvaliacao
+from src.services.result_sink import ResultSink
+from src.states.generate_report import GenerateReportState
+
+
+def _resultado(caso_id: str, status: str = "PASS", pontos: float = 4.5) -> ResultadoAvaliacao:
+    return ResultadoAvaliacao(
+        caso_id=caso_id,
+        cliente_id="PF_001",
+        status=status,
+        pontos=pontos,
+        eh_acessivel=True,
+        vieses_detectados=["vies_idade"],
+        resposta_modelo=RespostaModelo(decisao=Decisao.APROVADA, explicacao_acessivel="Aprovado."),
+        nivel_leitura=5.2
+    )
+
+
+class TestResultSink:
+    """Tests for ResultSink."""
+
+    def test_grava_e_carrega_resultado_completo(self, tmp_path):
+        sink = ResultSink(tmp_path, "run_1")
+        original = _resultado("ALUCINACAO_001")
+
+        sink.gravar(original, resposta_bruta='{"decisao": "APROVADA"}')
+
+        carregado = ResultSink.abrir(tmp_path / "run_1.jsonl").carregar()
+        assert carregado == [original]
+        assert sink.registros()["ALUCINACAO_001"]["resposta_bruta"] == '{"decisao": "APROVADA"}'
+
+    def test_ultima_linha_vale_e_erros_nao_concluem(self, tmp_path):
+        sink = ResultSink(tmp_path, "run_1", fsync=False)
+        sink.gravar(_resultado("A_001"))
+        sink.gravar(_resultado("A_002", status="FAIL", pontos=0.0), erro=True)
+        sink.gravar(_resultado("A_001", status="PARTIAL", pontos=3.0))
+
+        assert [(r.caso_id, r.status) for r in sink.carregar()] == [("A_001", "PARTIAL"), ("A_002", "FAIL")]
+        assert [r.caso_id for r in sink.carregar(incluir_erros=False)] == ["A_001"]
+        assert sink.casos_concluidos() == {"A_001"}
+
+    def test_atualizar_preserva_resposta_bruta(self, tmp_path):
+        sink = ResultSink(tmp_path, "run_1", fsync=False)
+        resultado = _resultado("A_001")
+        sink.gravar(resultado, resposta_bruta="bruta")
+
+        resultado.isr_semantico, resultado.isr_bloqueado = 1.5, False
+        sink.atualizar([resultado])
+
+        registro = sink.registros()["A_001"]
+        assert registro["resposta_bruta"] == "bruta" and registro["erro"] is False
+        assert sink.carregar()[0].isr_semantico == 1.5
+
+    def test_linha_truncada_por_crash(self, tmp_path):
+        sink = ResultSink(tmp_path, "run_1", fsync=False)
+        sink.gravar(_resultado("A_001"))
+        linha = json.dumps({"caso_id": "A_002", "resultado": _resultado("A_002").model_dump(mode="json")})
+        with open(sink.path, "a", encoding="utf-8") as f:
+            f.write(linha[:len(linha) // 2])
+
+        # Processo retomado: a próxima gravação começa em uma linha nova
+        retomado = ResultSink(tmp_path, "run_1", fsync=False)
+        assert retomado.casos_concluidos() == {"A_001"}
+        assert retomado.linhas_invalidas == 1
+        retomado.gravar(_resultado("A_003"))
+
+        assert retomado.casos_concluidos() == {"A_001", "A_003"}
+        assert retomado.linhas_invalidas == 1
+
+    def test_sink_inexistente(self, tmp_path):
+        sink = ResultSink(tmp_path / "runs", "run_1")
+
+        assert not sink.existe
+        assert sink.carregar() == []
+
+    def test_relatorio_a_partir_do_sink(self, tmp_path):
+        """GenerateReportState loads results and metrics from the sink when none are in context."""
+        sink = ResultSink(tmp_path / "runs", "run_1", fsync=False)
+        sink.gravar(_resultado("ALUCINACAO_001"))
+        sink.gravar(_resultado("ALUCINACAO_002", status="FAIL", pontos=1.0))
+        context = {"output_dir": tmp_path, "results_sink": sink.path}
+
+        asyncio.run(GenerateReportState().execute(context))
+
+        assert context["metricas"].total_casos == 2
+        assert context["metricas"].casos_fail == 1
+        assert "**Execução**: run_1" in context["report_path"].read_text(encoding="utf-8")
+        assert json.loads(context["json_path"].read_text(encoding="utf-8"))["run_id"] == "run_1"
@@ -0,0 +1,173 @@
+"""
+Unit tests for RunCasesState concurrent execution.
+"""
+import asyncio
+import random
+import pytest
+from src.core.fsm import SextantFSM  # noqa: F401 - carrega a cadeia de estados na ordem do FSM
+from src.states.run_cases import RunCasesState
+from src.services.model_executor import ModelExecutor
+from src.services.result_sink import ResultSink
+from src.models.domain import Cliente, CasoTeste, TipoCaso, TipoCliente
+
+
+class TestRunCasesState:
+    """Tests for bounded-concurrency case execution."""
+
+    @pytest.fixture(autouse=True)
+    def _output_dir(self, tmp_path):
+        """Keep the per-run results sink inside a temporary directory."""
+        self.output_dir = tmp_path
+
+    def _create_cliente(self, cliente_id: str, score: int) -> Cliente:
+        """Create a test cliente."""
+        return Cliente(
+            cliente_id=cliente_id,
+            tipo=TipoCliente.PF,
+            nome="Test Client",
+            cpf="123.456.789-00",
+            score_atual=score,
+            renda_mensal=5000.0
+        )
+
+    def _create_context(self, num_casos: int = 12, concurrency: int = 4) -> dict:
+        """Create a minimal FSM context."""
+        clientes = [
+            self._create_cliente(f"PF_{i:03d}", 450 + i * 30)
+            for i in range(num_casos)
+        ]
+        casos = [
+            CasoTeste(
+                caso_id=f"INCONSISTENCIA_{i:03d}",
+                tipo_cenario=TipoCaso.INCONSISTENCIA,
+                subtipo="test",
+                descricao="Test case",
+                cliente_ref=f"PF_{i:03d}",
+                input={"tipo": "PF"},
+                output_esperado={"decisao": "APROVADA"}
+            )
+            for i in range(num_casos)
+        ]
+        return {
+            "model_client": None,
+            "model_name": "mock-model",
+            "model_provider": "anthropic",
+            "prompt_template": "",
+            "matriz_validacao": {"matriz": []},
+            "casos": casos,
+            "clientes": clientes,
+            "politicas": {"markdown": ""},
+            "concurrency": concurrency,
+            "output_dir": self.output_dir,
+        }
+
+    def test_resultados_preservam_ordem_dos_casos(self, monkeypatch):
+        """Results keep case order even when cases finish out of order."""
+        original = ModelExecutor.executar_caso
+        random.seed(7)
+
+        async def executar_com_atraso(self, cliente, caso, politicas="", usar_mock=None):
+            await asyncio.sleep(random.uniform(0, 0.02))
+            return await original(self, cliente, caso, politicas, usar_mock)
+
+        monkeypatch.setattr(ModelExecutor, "executar_caso", executar_com_atraso)
+        context = self._create_context()
+
+        asyncio.run(RunCasesState().execute(context))
+
+        assert [r.caso_id for r in context["resultados"]] == [c.caso_id for c in context["casos"]]
+
+    def test_concorrencia_limitada(self, monkeypatch):
+        """No more than `concurrency` cases are in flight at once."""
+        em_voo = 0
+        pico = 0
+        original = ModelExecutor.executar_caso
+
+        async def executar_contando(self, cliente, caso, politicas="", usar_mock=None):
+            nonlocal em_voo, pico
+            em_voo += 1
+            pico = max(pico, em_voo)
+            await asyncio.sleep(0.01)
+            em_voo -= 1
+            return await original(self, cliente, caso, politicas, usar_mock)
+
+        monkeypatch.setattr(ModelExecutor, "executar_caso", executar_contando)
+        context = self._create_context(num_casos=10, concurrency=3)
+
+        asyncio.run(RunCasesState().execute(context))
+
+        assert len(context["resultados"]) == 10
+        assert pico == 3
+
+    def test_erro_isolado_por_caso(self, monkeypatch):
+        """A failing case becomes FAIL without affecting its neighbours."""
+        original = ModelExecutor.executar_caso
+
+        async def executar_falhando(self, cliente, caso, politicas="", usar_mock=None):
+            if caso.caso_id == "INCONSISTENCIA_002":
+                raise RuntimeError("provider down")
+            return await original(self, cliente, caso, politicas, usar_mock)
+
+        monkeypatch.setattr(ModelExecutor, "executar_caso", executar_falhando)
+        context = self._create_context(num_casos=5, concurrency=5)
+
+        asyncio.run(RunCasesState().execute(context))
+
+        resultados = context["resultados"]
+        assert len(resultados) == 5
+        assert resultados[2].status == "FAIL"
+        assert "provider down" in resultados[2].feedback
+        assert all(r.resposta_modelo is not None for i, r in enumerate(resultados) if i != 2)
+
+    def test_resultados_gravados_no_sink(self):
+        """Every evaluated case is appended to the run's JSONL sink."""
+        context = self._create_context(num_casos=4)
+
+        asyncio.run(RunCasesState().execute(context))
+
+        sink = ResultSink.abrir(context["results_sink"])
+        assert sink.path.parent == self.output_dir / "runs"
+        assert [r.caso_id for r in sink.carregar()] == [c.caso_id for c in context["casos"]]
+        assert all(registro["resposta_bruta"] for registro in sink.registros().values())
+        assert context["telemetria"]["sink_resultados"]["gravados"] == 4
+
+    def test_resume_pula_casos_concluidos(self, monkeypatch):
+        """--resume only runs cases missing from the sink (or that errored)."""
+        original = ModelExecutor.executar_caso
+        executados = []
+        falhar = {"INCONSISTENCIA_003"}
+
+        async def executar_registrando(self, cliente, caso, politicas="", usar_mock=None):
+            executados.append(caso.caso_id)
+            if caso.caso_id in falhar:
+                raise RuntimeError("provider down")
+            return await original(self, cliente, caso, politicas, usar_mock)
+
+        monkeypatch.setattr(ModelExecutor, "executar_caso", executar_registrando)
+
+        # Primeira execução "cai" depois de 3 casos e com um erro de provider
+        context = self._create_context(num_casos=6)
+        context["casos"] = context["casos"][:4]
+        asyncio.run(RunCasesState().execute(context))
+        run_id = context["run_id"]
+
+        executados.clear()
+        falhar.clear()
+        retomado = self._create_context(num_casos=6)
+        retomado["resume_run_id"] = run_id
+        asyncio.run(RunCasesState().execute(retomado))
+
+        assert sorted(executados) == ["INCONSISTENCIA_003", "INCONSISTENCIA_004", "INCONSISTENCIA_005"]
+        assert [r.caso_id for r in retomado["resultados"]] == [c.caso_id for c in retomado["casos"]]
+        assert all(r.resposta_modelo is not None for r in retomado["resultados"])
+        assert retomado["run_id"] == run_id
+        assert retomado["telemetria"]["sink_resultados"]["retomados"] == 3
+        assert len(ResultSink.abrir(retomado["results_sink"]).carregar()) == 6
+
+    def test_resume_execucao_inexistente(self):
+        """Resuming an unknown run_id fails instead of silently starting over."""
+        context = self._create_context(num_casos=2)
+        context["resume_run_id"] = "nao_existe"
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(RunCasesState().execute(context))
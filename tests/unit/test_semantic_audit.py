@@ -0,0 +1,169 @@
+"""
+Unit tests for SemanticAuditState.
+"""
+import asyncio
+import math
+from types import SimpleNamespace
+from src.core.fsm import SextantFSM  # noqa: F401 - carrega a cadeia de estados na ordem do FSM
+from src.services.result_sink import ResultSink
+from src.states.semantic_audit import SemanticAuditState
+from src.states.calculate_metrics import CalculateMetricsState
+from src.services.metrics_calculator import MetricsCalculator
+from src.tools.isr_auditor import SemanticISRAuditorTool
+from src.models.domain import (
+    CasoTeste, Cliente, Decisao, RespostaModelo, ResultadoAvaliacao, TipoCaso, TipoCliente
+)
+
+
+class _AsyncCompletions:
+    """AsyncOpenAI stand-in: confident for approvals, unstable otherwise."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        prompt = kwargs["messages"][1]["content"]
+        prob = 0.99 if "'APROVADA'" in prompt else 0.05
+        top = [SimpleNamespace(token="Yes", logprob=math.log(prob))]
+        return SimpleNamespace(choices=[SimpleNamespace(
+            logprobs=SimpleNamespace(content=[SimpleNamespace(top_logprobs=top)])
+        )])
+
+
+class _FailingCompletions(_AsyncCompletions):
+    """Same answers, but every call for a rejected decision fails."""
+
+    async def create(self, **kwargs):
+        if "'NEGADA'" in kwargs["messages"][1]["content"]:
+            self.calls += 1
+            raise RuntimeError("503 Service Unavailable")
+        return await super().create(**kwargs)
+
+
+class TestSemanticAuditState:
+    """Tests for the optional semantic ISR stage."""
+
+    def _context(self, auditor):
+        decisoes = [Decisao.APROVADA, Decisao.NEGADA, Decisao.APROVADA]
+        casos = [
+            CasoTeste(
+                caso_id=f"INCONSISTENCIA_{i:03d}",
+                tipo_cenario=TipoCaso.INCONSISTENCIA,
+                subtipo="test",
+                descricao="Test case",
+                cliente_ref=f"PF_{i:03d}",
+                input={"tipo": "PF"},
+                output_esperado={"decisao": "APROVADA"}
+            )
+            for i in range(3)
+        ]
+        clientes = [
+            Cliente(cliente_id=f"PF_{i:03d}", tipo=TipoCliente.PF, score_atual=700, renda_mensal=5000.0)
+            for i in range(3)
+        ]
+        resultados = [
+            ResultadoAvaliacao(
+                caso_id=caso.caso_id,
+                cliente_id=caso.cliente_ref,
+                status="PASS",
+                pontos=4.0,
+                resposta_modelo=RespostaModelo(decisao=decisao, confianca=0.9)
+            )
+            for caso, decisao in zip(casos, decisoes)
+        ]
+        # Failed case without a model response is not audited
+        resultados.append(ResultadoAvaliacao(caso_id="INCONSISTENCIA_999", status="FAIL"))
+        return {
+            "casos": casos,
+            "clientes": clientes,
+            "resultados": resultados,
+            "isr_auditor": auditor,
+        }
+
+    def test_preenche_isr_por_caso_e_telemetria(self):
+        completions = _AsyncCompletions()
+        auditor = SemanticISRAuditorTool(
+            client=None, async_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+            num_permutations=3
+        )
+        context = self._context(auditor)
+
+        proximo = asyncio.run(SemanticAuditState().execute(context))
+
+        resultados = context["resultados"]
+        assert isinstance(proximo, CalculateMetricsState)
+        assert completions.calls == 9
+        assert [r.isr_bloqueado for r in resultados] == [False, True, False, None]
+        assert resultados[0].isr_semantico == 999.0
+        assert resultados[3].isr_semantico is None
+
+        telemetria = context["telemetria"]["isr_semantico"]
+        assert telemetria["casos"] == 3
+        assert telemetria["bloqueados"] == 1
+        assert telemetria["requisicoes_por_auditoria"] == 3.0
+        assert telemetria["tempo_total_s"] >= 0
+
+        metricas = MetricsCalculator().calcular(resultados)
+        assert metricas.isr_semantico_medio == 2 / 3
+
+    def test_erros_de_api_deixam_caso_sem_isr(self):
+        completions = _FailingCompletions()
+        auditor = SemanticISRAuditorTool(
+            client=None, async_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+            num_permutations=3
+        )
+        context = self._context(auditor)
+
+        asyncio.run(SemanticAuditState().execute(context))
+
+        resultados = context["resultados"]
+        # The failed audit is neither blocked nor approved
+        assert [r.isr_bloqueado for r in resultados] == [False, None, False, None]
+        assert resultados[1].isr_semantico is None
+
+        telemetria = context["telemetria"]["isr_semantico"]
+        assert telemetria["casos"] == 2
+        assert telemetria["bloqueados"] == 0
+        assert telemetria["casos_com_erro_api"] == 1
+        assert telemetria["erros_api"] == 3
+
+    def test_grava_isr_no_sink_e_nao_reaudita_na_retomada(self, tmp_path):
+        sink = ResultSink(tmp_path, "run_1", fsync=False)
+        completions = _AsyncCompletions()
+        auditor = SemanticISRAuditorTool(
+            client=None, async_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+            num_permutations=3
+        )
+        context = self._context(auditor)
+        for resultado in context["resultados"]:
+            sink.gravar(resultado, resposta_bruta=f"bruta {resultado.caso_id}")
+        context["results_sink"] = sink.path
+
+        asyncio.run(SemanticAuditState().execute(context))
+
+        # Report / --resume input: the sink now carries the ISR, raw responses intact
+        gravados = {r.caso_id: r for r in sink.carregar()}
+        assert [gravados[r.caso_id].isr_bloqueado for r in context["resultados"]] == [False, True, False, None]
+        assert sink.registros()["INCONSISTENCIA_000"]["resposta_bruta"] == "bruta INCONSISTENCIA_000"
+
+        # Resumed run: results loaded from the sink already have ISR
+        retomado = self._context(auditor)
+        retomado["resultados"] = sink.carregar()
+        chamadas = completions.calls
+
+        asyncio.run(SemanticAuditState().execute(retomado))
+
+        assert completions.calls == chamadas
+        assert retomado["telemetria"]["isr_semantico"]["ja_auditados"] == 3
+        assert MetricsCalculator().calcular(retomado["resultados"]).isr_semantico_medio == 2 / 3
+
+    def test_sem_auditor_em_modo_mock(self):
+        context = self._context(None)
+        context["use_mock"] = True
+
+        proximo = asyncio.run(SemanticAuditState().execute(context))
+
+        assert isinstance(proximo, CalculateMetricsState)
+        assert "telemetria" not in context
+        assert MetricsCalculator().calcular(context["resultados"]).isr_semantico_medio is None